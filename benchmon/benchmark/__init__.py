@@ -55,5 +55,6 @@ from .base import BaseBenchmark
 from .base_builder import BaseBuilder
 from .launchable import LaunchableBenchmark
 from .ssh_remote import SSHBenchmark
+from .start_barrier import StartBarrier, StartReport
 
 BaseBenchmark.register_nickname(LaunchableBenchmark)
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 from abc import ABCMeta, abstractmethod
 from asyncio import Future
 from typing import (
-    ClassVar, Coroutine, Generic, Iterable, MutableMapping, Optional, Set, TYPE_CHECKING, Tuple, Type, TypeVar, Union
+    Callable, ClassVar, Coroutine, Generic, Iterable, MutableMapping,
+    Optional, Set, TYPE_CHECKING, Tuple, Type, TypeVar, Union
 )
 
 from coloredlogs import ColoredFormatter
@@ -25,6 +27,7 @@ if TYPE_CHECKING:
     from .constraints import BaseConstraint
     from ..monitors import BaseMonitor
     from ..monitors.pipelines import BasePipeline
+    from ..utils.tid_tracker import TidTracker
 
     _BLD_T = TypeVar('_BLD_T', bound=BaseBuilder)
     _CST_T = TypeVar('_CST_T', bound=BaseConstraint)
@@ -85,11 +88,12 @@ class BaseBenchmark(Generic[_CFG_T], ContextReadable, metaclass=ABCMeta):
     @classmethod
     def of(cls, context: Context) -> BaseBenchmark:
         # noinspection PyProtectedMember
-        for c, v in context._variable_dict.items():
-            if issubclass(c, cls):
-                return v
+        benchmark = context._find(cls)
 
-        raise BenchNotFoundError('Context variable should have exactly one Benchmark')
+        if benchmark is None:
+            raise BenchNotFoundError('Context variable should have exactly one Benchmark')
+
+        return benchmark
 
     @classmethod
     def register_nickname(cls, bench: Type[BaseBenchmark]) -> None:
@@ -198,6 +202,7 @@ class BaseBenchmark(Generic[_CFG_T], ContextReadable, metaclass=ABCMeta):
 
             logger.debug('Pausing benchmark...')
             self.pause()
+            await self._wait_paused()
 
         except asyncio.CancelledError:
             logger.debug(f'The task cancelled')
@@ -328,6 +333,13 @@ class BaseBenchmark(Generic[_CFG_T], ContextReadable, metaclass=ABCMeta):
         """
         logging.getLogger(self._identifier).info('pausing...')
 
+    async def _wait_paused(self) -> None:
+        """
+        :meth:`pause` 로 요청된 일시 정지가 실제로 완료될 때 까지 기다린다.
+        :meth:`pause` 가 반환될 때 이미 정지가 완료되는 벤치마크라면 override 하지 않아도 된다.
+        """
+        pass
+
     @abstractmethod
     def resume(self) -> None:
         """
@@ -336,6 +348,20 @@ class BaseBenchmark(Generic[_CFG_T], ContextReadable, metaclass=ABCMeta):
         """
         logging.getLogger(self._identifier).info('resuming...')
 
+    def prepare_resume(self, stack: contextlib.ExitStack) -> Callable[[], None]:
+        """
+        :meth:`resume` 에 필요한 작업들을 미리 해두고, 호출하면 최소한의 작업으로 벤치마크를 재시작하는 함수를 반환한다.
+        여러 벤치마크를 최대한 동시에 재시작할 때 (:class:`~benchmon.benchmark.start_barrier.StartBarrier`) 사용된다.
+
+        미리 준비할 것이 없는 벤치마크라면 override 하지 않아도 되며, 기본적으로 :meth:`resume` 을 반환한다.
+
+        :param stack: 준비하며 얻은 자원 (e.g. 열어둔 파일) 들의 수명을 관리하는 객체
+        :type stack: contextlib.ExitStack
+        :return: 벤치마크를 재시작하는 함수
+        :rtype: typing.Callable[[], None]
+        """
+        return self.resume
+
     @abstractmethod
     async def join(self) -> None:
         """ 벤치마크가 실행이 종료될 때 까지 이 메소드의 호출자의 실행을 멈춘다. """
@@ -409,3 +435,13 @@ class BaseBenchmark(Generic[_CFG_T], ContextReadable, metaclass=ABCMeta):
     @abstractmethod
     def all_child_tid(self) -> Tuple[int, ...]:
         pass
+
+    def tid_tracker(self) -> Optional[TidTracker]:
+        """
+        이 벤치마크에 속한 스레드들을 추적하는 새 tracker를 만든다.
+        :meth:`all_child_tid` 와 달리 tracker를 통해 이전에 읽은 이후로 생기거나 사라진 TID만 얻을 수 있다.
+
+        :return: 추적할 수 없다면 ``None``
+        :rtype: typing.Optional[benchmon.utils.tid_tracker.TidTracker]
+        """
+        return None
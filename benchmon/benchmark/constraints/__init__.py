@@ -22,7 +22,8 @@
 .. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
 """
 
+from .affinity import AffinityConstraint
 from .base import BaseConstraint
 from .cgroup import CGroupConstraint
 from .dvfs import DVFSConstraint
-from .resctrl import ResCtrlConstraint
+from .resctrl import ResCtrlConstraint, TaskAssignmentStats
@@ -0,0 +1,60 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+from typing import Iterable, Optional, TYPE_CHECKING, Tuple
+
+from .base import BaseConstraint
+from ...utils.affinity import MemPolicy
+
+if TYPE_CHECKING:
+    from ... import Context
+
+
+class AffinityConstraint(BaseConstraint):
+    """
+    :class:`~benchmon.benchmark.drivers.engines.affinity.AffinityEngine` 이 벤치마크를 실행할 때 적용할
+    CPU affinity와 NUMA memory policy를 담는다.
+
+    설정은 실행 시점에 엔진이 벤치마크 프로세스에 직접 적용하며, 종료 후 되돌릴 것이 없으므로
+    :meth:`on_start` 와 :meth:`on_destroy` 는 아무 일도 하지 않는다.
+    """
+    __slots__ = ('_cpus', '_mem_policy', '_nodes')
+
+    _cpus: Optional[Tuple[int, ...]]
+    _mem_policy: Optional[MemPolicy]
+    _nodes: Tuple[int, ...]
+
+    def __init__(self,
+                 cpus: Optional[Iterable[int]],
+                 mem_policy: Optional[MemPolicy],
+                 nodes: Iterable[int] = ()) -> None:
+        """
+        :param cpus: 벤치마크가 사용할 CPU들. ``None`` 일 경우 affinity를 바꾸지 않는다.
+        :type cpus: typing.Optional[typing.Iterable[int]]
+        :param mem_policy: 벤치마크의 memory policy. ``None`` 일 경우 policy를 바꾸지 않는다.
+        :type mem_policy: typing.Optional[benchmon.utils.affinity.MemPolicy]
+        :param nodes: `mem_policy` 가 사용할 NUMA 노드들
+        :type nodes: typing.Iterable[int]
+        """
+        self._cpus = None if cpus is None else tuple(cpus)
+        self._mem_policy = mem_policy
+        self._nodes = tuple(nodes)
+
+    async def on_start(self, context: Context) -> None:
+        pass
+
+    async def on_destroy(self, context: Context) -> None:
+        pass
+
+    @property
+    def cpus(self) -> Optional[Tuple[int, ...]]:
+        return self._cpus
+
+    @property
+    def mem_policy(self) -> Optional[MemPolicy]:
+        return self._mem_policy
+
+    @property
+    def nodes(self) -> Tuple[int, ...]:
+        return self._nodes
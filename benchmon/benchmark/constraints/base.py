@@ -34,14 +34,12 @@ class BaseConstraint(ContextReadable, metaclass=ABCMeta):
 
     @classmethod
     def of(cls: Type[_CT], context: Context) -> Optional[_CT]:
-        benchmark = BaseBenchmark.of(context)
-
         # noinspection PyProtectedMember
-        for constraint in benchmark._constraints:
-            if isinstance(constraint, cls):
-                return constraint
-
-        return None
+        return context._lookup((BaseConstraint, cls), lambda: next(
+                # noinspection PyProtectedMember
+                (constraint for constraint in BaseBenchmark.of(context)._constraints if isinstance(constraint, cls)),
+                None
+        ))
 
     async def on_init(self, context: Context) -> None:
         """
@@ -12,6 +12,10 @@ from libcgroup_bind.groups import DeleteFlag
 from .base import BaseConstraint
 from .. import BaseBenchmark
 from ...configs.containers import PrivilegeConfig
+from ...exceptions import InitRequiredError
+from ...utils.freezer import CGroupFreezer, is_unified
+from ...utils.sysfs import sys_path
+from ...utils.tid_tracker import CGroupTidTracker
 
 if TYPE_CHECKING:
     from ... import Context
@@ -63,6 +67,51 @@ class CGroupConstraint(BaseConstraint):
     def cgroup(self) -> Optional[CGroup]:
         return self._cgroup
 
+    def add_process(self, pid: int) -> None:
+        """
+        `pid` 프로세스를 이 constraint가 사용하는 cgroup으로 옮긴다.
+        cgroup v1의 경우 모든 서브 시스템의 그룹으로 옮긴다.
+
+        :param pid: 옮길 프로세스의 pid
+        :type pid: int
+        """
+        if self._cgroup is None:
+            raise InitRequiredError(f'Initialize the {type(self).__name__} before adding a process.')
+
+        group_name = self.identifier.strip('/')
+
+        if is_unified():
+            sys_path('fs/cgroup', group_name, 'cgroup.procs').write_text(str(pid))
+        else:
+            for controller in self._controllers:
+                sys_path('fs/cgroup', controller, group_name, 'cgroup.procs').write_text(str(pid))
+
+    @property
+    def freezer(self) -> Optional[CGroupFreezer]:
+        """
+        이 constraint가 사용하는 cgroup의 freezer.
+        cgroup v1의 경우 `freezer` 서브 시스템이 포함되어 있어야 사용할 수 있다.
+
+        :return: 초기화 되지 않았거나 freezer를 사용할 수 없다면 ``None``
+        :rtype: typing.Optional[benchmon.utils.freezer.CGroupFreezer]
+        """
+        if self._cgroup is None:
+            return None
+
+        return CGroupFreezer.of_group(self.identifier, self._controllers)
+
+    def tid_tracker(self) -> Optional[CGroupTidTracker]:
+        """
+        이 constraint가 사용하는 cgroup에 속한 스레드들을 추적하는 새 tracker를 만든다.
+
+        :return: 초기화 되지 않았거나 그룹을 찾을 수 없다면 ``None``
+        :rtype: typing.Optional[benchmon.utils.tid_tracker.CGroupTidTracker]
+        """
+        if self._cgroup is None:
+            return None
+
+        return CGroupTidTracker.of_group(self.identifier, self._controllers)
+
     @property
     def identifier(self) -> str:
         """
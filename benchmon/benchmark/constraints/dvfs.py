@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, TYPE_CHECKING, Tuple
+from typing import Iterable, Optional, TYPE_CHECKING, Tuple
 
 from .base import BaseConstraint
-from ...utils.dvfs import read_max_freqs, set_max_freq, set_max_freqs
+from ...exceptions import InitRequiredError
+from ...utils.dvfs import CpuFreqController
 
 if TYPE_CHECKING:
     from ... import Context
@@ -14,13 +15,17 @@ if TYPE_CHECKING:
 class DVFSConstraint(BaseConstraint):
     """
     :class:`벤치마크 <benchmon.benchmark.base.BaseBenchmark>` 의 실행전에 특정 코어들의 CPU frequency를
-    입력받은 값으로 설정하며, 벤치마크의 실행이 종료될 경우 그 코어들의 CPU frequency를 원래대로 복구시킨다.
+    입력받은 값으로 설정하며, 벤치마크의 실행이 종료될 경우 그 코어들의 cpufreq 설정 (최소, 최대 주파수와 governor) 을
+    원래대로 복구시킨다.
+
+    실행 도중에도 :meth:`set_freq` 로 주파수를 바꿀 수 있으며, 코어들의 파일을 열어둔 채로 바뀐 값만 쓰므로
+    짧은 주기로 주파수를 바꾸는 실험에도 사용할 수 있다.
     """
-    __slots__ = ('_target_freq', '_core_ids', '_orig_freq')
+    __slots__ = ('_target_freq', '_core_ids', '_controller')
 
     _target_freq: int
     _core_ids: Tuple[int, ...]
-    _orig_freq: Dict[int, int]
+    _controller: Optional[CpuFreqController]
 
     def __init__(self, core_ids: Iterable[int], freq: int) -> None:
         """
@@ -31,15 +36,42 @@ class DVFSConstraint(BaseConstraint):
         """
         self._core_ids = tuple(core_ids)
         self._target_freq = freq
-        self._orig_freq = dict()
+        self._controller = None
 
     async def on_init(self, context: Context) -> None:
-        orig_freq = read_max_freqs(self._core_ids)
-        self._orig_freq = dict(zip(self._core_ids, orig_freq))
+        self._controller = CpuFreqController(self._core_ids)
 
     async def on_start(self, context: Context) -> None:
-        await set_max_freqs(self._core_ids, self._target_freq)
+        await self._controller.set_max_freq(self._core_ids, self._target_freq)
+
+    async def set_freq(self, freq: int) -> None:
+        """
+        실행 중에 코어들의 최대 주파수를 `freq` 로 바꾼다.
+
+        :raises InitRequiredError: :meth:`on_init` 이 호출되기 전이거나 :meth:`on_destroy` 이후에 호출되었을 때
+
+        :param freq: 변경할 frequency 값
+        :type freq: int
+        """
+        if self._controller is None:
+            raise InitRequiredError(f'Initialize the {type(self).__name__} before changing the frequency.')
+
+        await self._controller.set_max_freq(self._core_ids, freq)
+
+    @property
+    def core_ids(self) -> Tuple[int, ...]:
+        return self._core_ids
+
+    @property
+    def target_freq(self) -> int:
+        return self._target_freq
 
     async def on_destroy(self, context: Context) -> None:
-        for core_id, freq in self._orig_freq.items():
-            set_max_freq(core_id, freq)
+        if self._controller is None:
+            return
+
+        try:
+            await self._controller.restore()
+        finally:
+            self._controller.close()
+            self._controller = None
@@ -2,46 +2,209 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from dataclasses import dataclass
 from typing import Iterable, Optional, TYPE_CHECKING, Tuple
 
 from .base import BaseConstraint
 from .. import BaseBenchmark
 from ...utils import ResCtrl
+from ...utils.tid_tracker import TidTracker
 
 if TYPE_CHECKING:
     from ... import Context
 
+_DEFAULT_TRACK_INTERVAL = 0.05
+
+
+@dataclass(frozen=True)
+class TaskAssignmentStats:
+    """ :class:`ResCtrlConstraint` 가 벤치마크의 스레드들을 resctrl 그룹에 추가한 결과 """
+    __slots__ = ('assigned', 'escaped', 'vanished', 'batches', 'mean_latency', 'max_latency')
+
+    assigned: int
+    """ 그룹에 추가된 스레드 수 """
+    escaped: int
+    """
+    벤치마크 시작 이후에 생겨 추가되기 전 까지 그룹 밖에서 실행된 스레드 수 (`vanished` 포함).
+    그룹에 속한 스레드가 만든 스레드는 생길 때 부터 그 그룹에 속하므로 포함되지 않는다.
+    """
+    vanished: int
+    """ 발견되었지만 추가되기 전에 종료된 스레드 수 """
+    batches: int
+    """ 추가 작업의 횟수 """
+    mean_latency: float
+    """ 스레드들을 발견한 뒤 그룹에 추가하기 까지 걸린 시간의 평균 (초) """
+    max_latency: float
+    """ 스레드들을 발견한 뒤 그룹에 추가하기 까지 걸린 시간의 최대값 (초) """
+
 
 class ResCtrlConstraint(BaseConstraint):
     """
     :class:`벤치마크 <benchmon.benchmark.base.BaseBenchmark>` 의 실행 직후에 해당 벤치마크가 사용할 수 있는 최대 LLC를
     resctrl를 통해 입력받은 값으로 제한하며, 벤치마크의 실행이 종료될 경우 그 resctrl 그룹을 삭제한다.
+
+    벤치마크가 :meth:`~benchmon.benchmark.base.BaseBenchmark.tid_tracker` 를 제공한다면, 실행 이후에 생기는 스레드들도
+    `track_interval` 마다 찾아 그룹에 추가한다. 그 결과는 :attr:`stats` 로 얻을 수 있다.
     """
-    __slots__ = ('_masks', '_group')
+    __slots__ = ('_masks', '_track_interval', '_group', '_tracker', '_tracking', '_assigned', '_escaped', '_vanished',
+                 '_batches', '_total_latency', '_max_latency')
 
     _masks: Tuple[str, ...]
+    _track_interval: float
     _group: Optional[ResCtrl]
+    _tracker: Optional[TidTracker]
+    _tracking: Optional[asyncio.Task]
+    _assigned: int
+    _escaped: int
+    _vanished: int
+    _batches: int
+    _total_latency: float
+    _max_latency: float
 
-    def __init__(self, masks: Iterable[str]) -> None:
+    def __init__(self, masks: Iterable[str], track_interval: float = _DEFAULT_TRACK_INTERVAL) -> None:
         """
         :param masks: CPU 소켓별로 할당할 LLC mask
         :type masks: typing.Iterable[str]
+        :param track_interval: 새로 생긴 스레드들을 찾는 주기 (초)
+        :type track_interval: float
         """
         self._masks = tuple(masks)
+        self._track_interval = track_interval
         self._group = None
+        self._tracker = None
+        self._tracking = None
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._assigned = 0
+        self._escaped = 0
+        self._vanished = 0
+        self._batches = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
 
     async def on_start(self, context: Context) -> None:
         benchmark = BaseBenchmark.of(context)
 
+        self._reset_stats()
         self._group = ResCtrl(benchmark.group_name)
         self._group.create_group()
 
         if len(self._masks) is not 0:
             await self._group.assign_llc(*self._masks)
 
-        children = benchmark.all_child_tid()
-        await self._group.add_tasks(children)
+        self._tracker = benchmark.tid_tracker()
+
+        if self._tracker is None:
+            children = benchmark.all_child_tid()
+            if len(children) != 0:
+                await self._group.add_tasks(children)
+        else:
+            await self.sync_tasks()
+            self._tracking = asyncio.create_task(self._track(context))
+
+    async def _track(self, context: Context) -> None:
+        while True:
+            await asyncio.sleep(self._track_interval)
+
+            try:
+                await self._sync(escaped=True)
+            except OSError as e:
+                context.logger.warning(f'Stop tracking threads of the resctrl group due to {e}')
+                return
+            except Exception as e:
+                # the group still has to be deleted on destroy, so the failure is not left to the task
+                context.logger.exception(f'Stop tracking threads of the resctrl group due to {e}')
+                return
+
+    async def sync_tasks(self) -> None:
+        """
+        마지막 호출 이후로 벤치마크에 새로 생긴 스레드들만 resctrl 그룹에 추가한다.
+        사라진 스레드들은 커널이 그룹에서 제거하므로 따로 처리하지 않는다.
+        """
+        await self._sync(escaped=False)
+
+    async def _sync(self, escaped: bool) -> None:
+        if self._group is None or self._tracker is None:
+            return
+
+        # scanning /proc and the group are blocking, so do the whole round in the executor at once
+        result = await asyncio.get_running_loop().run_in_executor(None, self._assign_new_tasks)
+        if result is None:
+            return
+
+        added, outsiders, vanished, latency = result
+
+        self._assigned += added - vanished
+        self._vanished += vanished
+        if escaped:
+            self._escaped += outsiders
+        self._batches += 1
+        self._total_latency += latency
+        self._max_latency = max(self._max_latency, latency)
+
+    def _assign_new_tasks(self) -> Optional[Tuple[int, int, int, float]]:
+        """
+        :return: 새로 발견된 스레드 수, 그 중 그룹 밖에 있던 스레드 수, 추가되기 전에 종료된 스레드 수, 걸린 시간.
+                 새로 발견된 스레드가 없다면 ``None``
+        :rtype: typing.Optional[typing.Tuple[int, int, int, float]]
+        """
+        found_at = time.monotonic()
+        added = self._tracker.update().added
+        if len(added) == 0:
+            return None
+
+        # threads cloned by a thread of the group inherit its CLOS/RMID, so only the others have to be written
+        # noinspection PyProtectedMember
+        members = self._group._read_tasks()
+        outsiders = tuple(tid for tid in added if tid not in members)
+
+        if len(outsiders) == 0:
+            vanished = 0
+        else:
+            # noinspection PyProtectedMember
+            vanished = len(self._group._write_tasks(outsiders))
+
+        return len(added), len(outsiders), vanished, time.monotonic() - found_at
+
+    @property
+    def masks(self) -> Tuple[str, ...]:
+        """
+        :return: CPU 소켓별로 할당할 LLC mask
+        :rtype: typing.Tuple[str, ...]
+        """
+        return self._masks
+
+    @property
+    def stats(self) -> TaskAssignmentStats:
+        """
+        :return: 마지막 :meth:`on_start` 이후로 스레드들을 그룹에 추가한 결과
+        :rtype: benchmon.benchmark.constraints.resctrl.TaskAssignmentStats
+        """
+        return TaskAssignmentStats(
+                self._assigned, self._escaped, self._vanished, self._batches,
+                self._total_latency / self._batches if self._batches != 0 else 0.0,
+                self._max_latency
+        )
 
     async def on_destroy(self, context: Context) -> None:
+        if self._tracking is not None:
+            self._tracking.cancel()
+            try:
+                await self._tracking
+            except asyncio.CancelledError:
+                pass
+            self._tracking = None
+
+            stats = self.stats
+            context.logger.debug(f'{stats.assigned} threads are assigned to the resctrl group in {stats.batches} '
+                                 f'batches ({stats.escaped} escaped, {stats.vanished} vanished before assigned, '
+                                 f'mean latency {stats.mean_latency * 1000:.3f} ms, '
+                                 f'max latency {stats.max_latency * 1000:.3f} ms)')
+
+        self._tracker = None
+
         if self._group is not None:
             await self._group.delete()
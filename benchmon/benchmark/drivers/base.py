@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import os
+import signal
 from abc import ABCMeta, abstractmethod
-from itertools import chain
 from signal import SIGCONT, SIGSTOP
-from typing import ClassVar, FrozenSet, Mapping, Optional, Set, TYPE_CHECKING, Tuple, Type
+from typing import Callable, ClassVar, FrozenSet, List, Mapping, Optional, Set, TYPE_CHECKING, Tuple, Type
 
 import psutil
 
 from ...configs import get_full_path, validate_and_load
 from ...exceptions import AlreadyInitedError, InitRequiredError
+from ...utils.proc_watcher import ProcessWatcher
+from ...utils.tid_tracker import ProcessTreeTidTracker
 
 if TYPE_CHECKING:
     from ... import Context
@@ -210,7 +214,8 @@ class BenchDriver(metaclass=ABCMeta):
         """
         Try to find actual benchmark process (not a wrapper or a launcher of the benchmark set).
 
-        This method will be periodically invoked until return value is not ``None``
+        This method will be invoked whenever a process in the tree of the launched process execs,
+        until return value is not ``None``
 
         :return: ``None`` if the process not exists, :class:`psutil.Process` object if exists.
         :rtype: typing.Optional[psutil.Process]
@@ -221,22 +226,35 @@ class BenchDriver(metaclass=ABCMeta):
         """
         벤치마크를 실행한다.
         실행 명령을 내린 후 :meth:`_find_bench_proc` 를 통해 실제 벤치마크 프로세스의 시작이 될 때 까지 기다린다.
+
+        :meth:`_find_bench_proc` 는 실행한 프로세스의 Process Tree 안에서 exec가 일어날 때 마다 호출된다.
+        (:class:`~benchmon.utils.proc_watcher.ProcessWatcher` 참고)
+
+        :raises psutil.NoSuchProcess: 실제 벤치마크 프로세스를 찾기 전에 실행한 프로세스가 종료되었을 때
         """
         if self.has_invoked:
             raise AlreadyInitedError('Benchmark is already running.')
 
-        self._wrapper_proc = await self._launch_bench(context)
-        self._wrapper_proc_info = psutil.Process(self._wrapper_proc.pid)
-        self._logger = context.logger
+        # subscribe before launching, so that no exec of the launched process is missed
+        async with ProcessWatcher.shared().subscribe() as subscription:
+            self._wrapper_proc = await self._launch_bench(context)
+            self._wrapper_proc_info = psutil.Process(self._wrapper_proc.pid)
+            self._logger = context.logger
+
+            subscription.watch(self._wrapper_proc.pid)
 
-        while True:
-            self._bench_proc_info = self._find_bench_proc()
+            while True:
+                self._bench_proc_info = self._find_bench_proc()
 
-            if self._bench_proc_info is not None:
-                self._last_launched_time = self._bench_proc_info.create_time()
-                return
+                if self._bench_proc_info is not None:
+                    self._last_launched_time = self._bench_proc_info.create_time()
+                    return
 
-            await asyncio.sleep(0.1)
+                if subscription.root_exited:
+                    raise psutil.NoSuchProcess(self._wrapper_proc.pid,
+                                               msg=f'{self._name} exited before the benchmark process is found')
+
+                await subscription.wait()
 
     async def join(self) -> None:
         """ 이 드라이버가 실행한 벤치마크가 종료될 때 까지 기다린다. """
@@ -275,6 +293,39 @@ class BenchDriver(metaclass=ABCMeta):
         self._wrapper_proc.send_signal(SIGCONT)
         self._bench_proc_info.resume()
 
+    def prepare_resume(self, stack: contextlib.ExitStack) -> Callable[[], None]:
+        """
+        :meth:`resume` 과 같은 시그널을 보낼 대상들을 미리 준비해두고, 호출하면 바로 시그널만 보내는 함수를 반환한다.
+
+        커널이 지원한다면 pidfd를 미리 열어두므로, 그 사이에 프로세스가 종료되어 PID가 재사용되더라도 다른 프로세스에게
+        시그널을 보내지 않는다. 열어둔 pidfd는 `stack` 이 닫힐 때 닫힌다.
+
+        :param stack: 열어둔 pidfd의 수명을 관리하는 객체
+        :type stack: contextlib.ExitStack
+        :return: 벤치마크를 다시 실행시키는 함수
+        :rtype: typing.Callable[[], None]
+        """
+        if self._wrapper_proc is None or self._bench_proc_info is None:
+            raise InitRequiredError('Run the benchmark first by calling run().')
+
+        senders: List[Callable[[], None]] = list()
+
+        for pid in dict.fromkeys((self._wrapper_proc.pid, self._bench_proc_info.pid)):
+            try:
+                pidfd = os.pidfd_open(pid)
+            except (AttributeError, OSError):
+                # Python < 3.9 or Linux < 5.3
+                senders.append(lambda p=pid: os.kill(p, SIGCONT))
+            else:
+                stack.callback(os.close, pidfd)
+                senders.append(lambda fd=pidfd: signal.pidfd_send_signal(fd, SIGCONT))
+
+        def resume() -> None:
+            for sender in senders:
+                sender()
+
+        return resume
+
     def all_child_tid(self) -> Tuple[int, ...]:
         """
         이 드라이버로 실행된 벤치마크의 Process Tree안에 있는 모든 TID (Thread ID)를 반환한다.
@@ -287,10 +338,4 @@ class BenchDriver(metaclass=ABCMeta):
         if self._bench_proc_info is None:
             return tuple()
 
-        try:
-            return tuple(chain(
-                    (t.id for t in self._bench_proc_info.threads()),
-                    *((t.id for t in proc.threads()) for proc in self._bench_proc_info.children(recursive=True))
-            ))
-        except psutil.NoSuchProcess:
-            return tuple()
+        return tuple(ProcessTreeTidTracker(self._bench_proc_info.pid).scan())
@@ -28,6 +28,7 @@
 .. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
 """
 
+from .affinity import AffinityEngine
 from .base import BaseEngine
 from .cgroup import CGroupEngine
 from .numactl import NumaCtlEngine
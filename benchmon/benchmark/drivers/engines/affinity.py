@@ -0,0 +1,67 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from .cgroup import CGroupEngine
+from ...constraints import AffinityConstraint
+from ....utils.affinity import set_mempolicy
+from ....utils.asyncio_subprocess import PopenProcess
+
+if TYPE_CHECKING:
+    from .... import Context
+
+
+class AffinityEngine(CGroupEngine):
+    """
+    :class:`~benchmon.benchmark.constraints.affinity.AffinityConstraint` 의 CPU affinity와 NUMA memory policy를
+    `numactl` 같은 외부 프로그램 없이 benchmon 프로세스 안에서 적용하여 벤치마크를 실행한다.
+
+    * memory policy: 프로세스 생성에만 쓰이고 바로 종료되는 스레드의 policy를 바꾼 뒤 그 스레드에서 프로세스를 생성하여,
+      생성된 프로세스가 상속받게 한다. 따라서 event loop의 스레드나 이후에 생기는 스레드들의 policy는 바뀌지 않는다.
+    * CPU affinity: 생성된 프로세스가 벤치마크를 exec 하기 전에 멈춰있는 동안 `sched_setaffinity` 로 설정한다.
+
+    두 설정 모두 exec와 fork 이후에도 유지되므로, 벤치마크와 그 자손 프로세스들에게 그대로 적용된다.
+    cgroup 설정은 :class:`~benchmon.benchmark.drivers.engines.cgroup.CGroupEngine` 과 같이 처리된다.
+
+    .. seealso::
+
+        엔진의 목적과 사용
+            :mod:`benchmon.benchmark.drivers.engines` 모듈
+    """
+
+    @classmethod
+    def _hold_before_exec(cls, context: Context) -> bool:
+        constraint = AffinityConstraint.of(context)
+        return super()._hold_before_exec(context) or (constraint is not None and constraint.cpus is not None)
+
+    @classmethod
+    async def _spawn(cls, context: Context, *cmd: str, **kwargs) -> asyncio.subprocess.Process:
+        constraint = AffinityConstraint.of(context)
+
+        if constraint is None or constraint.mem_policy is None:
+            return await super()._spawn(context, *cmd, **kwargs)
+
+        def spawn() -> subprocess.Popen:
+            # the policy disappears with this thread, so no other thread inherits it
+            set_mempolicy(constraint.mem_policy, constraint.nodes)
+            return subprocess.Popen(cmd, **kwargs)
+
+        with ThreadPoolExecutor(1, thread_name_prefix='benchmon-spawn') as spawner:
+            popen = await asyncio.get_running_loop().run_in_executor(spawner, spawn)
+
+        # noinspection PyTypeChecker
+        return PopenProcess(popen)
+
+    @classmethod
+    def _on_stopped(cls, context: Context, pid: int) -> None:
+        super()._on_stopped(context, pid)
+
+        constraint = AffinityConstraint.of(context)
+        if constraint is not None and constraint.cpus is not None:
+            os.sched_setaffinity(pid, constraint.cpus)
@@ -27,11 +27,7 @@ class BaseEngine(ContextReadable, metaclass=ABCMeta):
     @classmethod
     def of(cls: Type[_ET], context: Context) -> Optional[Type[_ET]]:
         # noinspection PyProtectedMember
-        for c, v in context._variable_dict.items():
-            if issubclass(c, cls):
-                return v
-
-        return None
+        return context._find(cls)
 
     @classmethod
     @abstractmethod
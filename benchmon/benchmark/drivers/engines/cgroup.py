@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING
+import os
+import shutil
+import signal
+from typing import Any, Mapping, Sequence, TYPE_CHECKING
 
 from .base import BaseEngine
 from ...constraints import CGroupConstraint
@@ -14,12 +17,19 @@ from ....utils.privilege import drop_privilege
 if TYPE_CHECKING:
     from .... import Context
 
+# stops itself before exec, so that the parent can move it into the cgroup before the benchmark starts.
+# `exec` keeps the pid, so the returned process is the benchmark itself.
+_STOP_SHIM = ('/bin/sh', '-c', 'kill -STOP $$ && exec "$@"', 'benchmon-shim')
+
 
 class CGroupEngine(BaseEngine):
     """
     :meth:`~asyncio.create_subprocess_exec` 를 사용하여 벤치마크를 실행한다.
 
-    벤치마크에 `cgroup` 이 설정되어 있을 경우, `preexec_fn` 를 사용하여 실행전에 벤치마크 프로세스를 해당 그룹에 추가한다.
+    벤치마크에 `cgroup` 이 설정되어 있을 경우, 벤치마크를 스스로 멈추는 작은 shell shim을 통해 실행하고,
+    멈춘 프로세스를 해당 그룹에 추가한 뒤 다시 실행시켜 shim이 벤치마크를 exec하게 한다.
+    자식 클래스는 :meth:`_hold_before_exec`, :meth:`_spawn`, :meth:`_on_stopped` 로 이 과정에 설정을 추가할 수 있다.
+    자식 프로세스에서 Python 코드 (`preexec_fn`) 를 실행하지 않으므로, 프로세스 생성에 `vfork` 를 사용할 수 있다.
 
     .. seealso::
 
@@ -30,15 +40,94 @@ class CGroupEngine(BaseEngine):
     @classmethod
     async def launch(cls, context: Context, *cmd: str, **kwargs) -> asyncio.subprocess.Process:
         constraint = CGroupConstraint.of(context)
-        if constraint is not None:
-            if constraint.cgroup is None:
-                raise InitRequiredError(
-                        f'Initialize the {type(constraint).__name__} before running the benchmark.'
-                )
-
-            kwargs['preexec_fn'] = constraint.cgroup.add_current_process
+        if constraint is not None and constraint.cgroup is None:
+            raise InitRequiredError(
+                    f'Initialize the {type(constraint).__name__} before running the benchmark.'
+            )
 
         privilege_config = PrivilegeConfig.of(context).execute
 
+        if not cls._hold_before_exec(context):
+            with drop_privilege(privilege_config.user, privilege_config.group):
+                return await cls._spawn(context, *cmd, **kwargs)
+
+        _check_executable(cmd, kwargs)
+
         with drop_privilege(privilege_config.user, privilege_config.group):
-            return await asyncio.create_subprocess_exec(*cmd, **kwargs)
+            proc = await cls._spawn(context, *_STOP_SHIM, *cmd, **kwargs)
+
+        try:
+            await _wait_stopped(proc.pid)
+            cls._on_stopped(context, proc.pid)
+        except BaseException:
+            proc.kill()
+            raise
+
+        os.kill(proc.pid, signal.SIGCONT)
+        return proc
+
+    @classmethod
+    def _hold_before_exec(cls, context: Context) -> bool:
+        """
+        :return: 벤치마크를 exec 하기 전에 멈춰서 :meth:`_on_stopped` 를 호출해야 한다면 ``True``
+        :rtype: bool
+        """
+        return CGroupConstraint.of(context) is not None
+
+    @classmethod
+    async def _spawn(cls, context: Context, *cmd: str, **kwargs) -> asyncio.subprocess.Process:
+        """
+        `cmd` 를 실행하는 프로세스를 생성한다. 생성된 프로세스에게 상속될 설정을 적용할 때 override 한다.
+
+        :param context: 파이프라인과 모니터링, 벤치마크 실행 조건 등의 정보를 담고있는 객체
+        :type context: benchmon.context.Context
+        :param cmd: 실행할 커맨드
+        :type cmd: typing.Tuple[str, ...]
+        :return: 생성된 프로세스
+        :rtype: asyncio.subprocess.Process
+        """
+        return await asyncio.create_subprocess_exec(*cmd, **kwargs)
+
+    @classmethod
+    def _on_stopped(cls, context: Context, pid: int) -> None:
+        """
+        :meth:`_hold_before_exec` 가 ``True`` 일 때, 생성된 프로세스가 벤치마크를 exec 하기 전에 멈춰있는 동안 호출된다.
+
+        :param context: 파이프라인과 모니터링, 벤치마크 실행 조건 등의 정보를 담고있는 객체
+        :type context: benchmon.context.Context
+        :param pid: 멈춰있는 프로세스의 pid. exec 이후 벤치마크의 pid가 된다.
+        :type pid: int
+        """
+        constraint = CGroupConstraint.of(context)
+        if constraint is not None:
+            constraint.add_process(pid)
+
+
+def _check_executable(cmd: Sequence[str], kwargs: Mapping[str, Any]) -> None:
+    """
+    shim을 통해 실행하면 실행 파일이 없다는 것을 종료 코드로만 알 수 있으므로, exec처럼 미리 실행 파일을 찾아본다.
+
+    :raises FileNotFoundError: `cmd` 의 실행 파일을 찾을 수 없을 때
+    """
+    env = kwargs.get('env')
+    executable = cmd[0]
+    if 'cwd' in kwargs and not os.path.isabs(executable) and os.sep in executable:
+        executable = os.path.join(kwargs['cwd'], executable)
+
+    if shutil.which(executable, path=None if env is None else env.get('PATH', os.defpath)) is None:
+        raise FileNotFoundError(f'No such executable: {cmd[0]!r}')
+
+
+async def _wait_stopped(pid: int) -> None:
+    """
+    자식 프로세스 `pid` 가 멈출 때 까지 기다린다.
+
+    ``WNOWAIT`` 로 상태를 소비하지 않으므로, asyncio의 child watcher가 프로세스의 종료를 받는 것을 방해하지 않는다.
+
+    :raises ChildProcessError: 프로세스가 멈추기 전에 종료되었을 때
+    """
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(None, os.waitid, os.P_PID, pid, os.WSTOPPED | os.WEXITED | os.WNOWAIT)
+
+    if result is None or result.si_code != os.CLD_STOPPED:
+        raise ChildProcessError(f'The process {pid} terminated before it is moved into the cgroup.')
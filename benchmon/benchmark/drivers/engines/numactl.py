@@ -33,20 +33,20 @@ class NumaCtlEngine(BaseEngine):
         if constraint is not None:
             initial_values = constraint.initial_values()
 
-            if 'cpuset.mems' is initial_values:
+            if 'cpuset.mems' not in initial_values:
                 mem_flag = '--localalloc'
             else:
                 mem_flag = '--membind={}'.format(initial_values['cpuset.mems'])
 
-            if 'cpuset.cpus' is initial_values:
-                cpu_flag = ''
+            if 'cpuset.cpus' not in initial_values:
+                cpu_flags = tuple()
             else:
-                cpu_flag = '--physcpubind={}'.format(initial_values['cpuset.cpus'])
+                cpu_flags = ('--physcpubind={}'.format(initial_values['cpuset.cpus']),)
 
             with drop_privilege(privilege_config.user, privilege_config.group):
                 return await asyncio.create_subprocess_exec(
                         'numactl',
-                        cpu_flag,
+                        *cpu_flags,
                         mem_flag,
                         *cmd, **kwargs)
 
@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
-from typing import Optional, TYPE_CHECKING, Tuple, TypeVar
+from typing import Callable, Optional, TYPE_CHECKING, Tuple, TypeVar
 
 import psutil
 
 from .base import BaseBenchmark
 from .base_builder import BaseBuilder
+from .constraints import AffinityConstraint, CGroupConstraint
 from .drivers import gen_driver
-from .drivers.engines import BaseEngine, CGroupEngine
+from .drivers.engines import AffinityEngine, BaseEngine, CGroupEngine
 from ..configs.containers import LaunchableConfig
 from ..monitors.pipelines import DefaultPipeline
+from ..utils.tid_tracker import ProcessTreeTidTracker
 
 if TYPE_CHECKING:
     from .constraints import BaseConstraint
@@ -21,6 +24,8 @@ if TYPE_CHECKING:
     from ..configs.containers import PrivilegeConfig
     from ..monitors import BaseMonitor
     from ..monitors.pipelines import BasePipeline
+    from ..utils.freezer import CGroupFreezer
+    from ..utils.tid_tracker import TidTracker
 
     _CST_T = TypeVar('_CST_T', bound=BaseConstraint)
     _MON_T = TypeVar('_MON_T', bound=BaseMonitor)
@@ -55,15 +60,52 @@ class LaunchableBenchmark(BaseBenchmark[_CFG_T]):
 
         self._bench_driver = bench_driver
 
+    def _freezer(self) -> Optional[CGroupFreezer]:
+        constraint = CGroupConstraint.of(self._context_variable)
+
+        if constraint is None:
+            return None
+
+        return constraint.freezer
+
     def pause(self) -> None:
+        """
+        :class:`~benchmon.benchmark.constraints.cgroup.CGroupConstraint` 의 freezer를 사용할 수 있다면
+        벤치마크의 cgroup 전체를 한번에 멈추고, 그렇지 않다면 드라이버를 통해 프로세스들에게 시그널을 보낸다.
+        """
         super().pause()
 
-        self._bench_driver.pause()
+        freezer = self._freezer()
+        if freezer is None:
+            self._bench_driver.pause()
+        else:
+            freezer.freeze()
+
+    async def _wait_paused(self) -> None:
+        freezer = self._freezer()
+        if freezer is not None:
+            await freezer.wait(frozen=True)
 
     def resume(self) -> None:
         super().resume()
 
-        self._bench_driver.resume()
+        freezer = self._freezer()
+        if freezer is None:
+            self._bench_driver.resume()
+        else:
+            freezer.thaw()
+
+    def prepare_resume(self, stack: contextlib.ExitStack) -> Callable[[], None]:
+        """
+        :meth:`resume` 과 같은 방법으로 재시작하되, freezer의 파일이나 시그널을 보낼 프로세스들의 pidfd를 미리 열어둔다.
+        """
+        logging.getLogger(self._identifier).info('resuming...')
+
+        freezer = self._freezer()
+        if freezer is None:
+            return self._bench_driver.prepare_resume(stack)
+        else:
+            return freezer.prepare_thaw(stack)
 
     async def _start(self, context: Context) -> None:
         await self._bench_driver.run(context)
@@ -73,6 +115,14 @@ class LaunchableBenchmark(BaseBenchmark[_CFG_T]):
 
         logger = logging.getLogger(self._identifier)
 
+        freezer = self._freezer()
+        if freezer is not None:
+            # frozen tasks of cgroup v1 do not handle even SIGKILL until they are thawed
+            try:
+                freezer.thaw()
+            except OSError as e:
+                logger.debug(f'Failed to thaw the cgroup before killing : {e}')
+
         try:
             self._bench_driver.stop()
         except (psutil.NoSuchProcess, ProcessLookupError) as e:
@@ -100,6 +150,24 @@ class LaunchableBenchmark(BaseBenchmark[_CFG_T]):
     def all_child_tid(self) -> Tuple[int, ...]:
         return self._bench_driver.all_child_tid()
 
+    def tid_tracker(self) -> Optional[TidTracker]:
+        """
+        벤치마크의 cgroup이 :attr:`group_name` 으로 옮겨진 뒤라면 그 cgroup 전체를 한번에 읽는 tracker를,
+        그렇지 않다면 실제 벤치마크 프로세스의 Process Tree를 읽는 tracker를 만든다.
+        """
+        constraint = CGroupConstraint.of(self._context_variable)
+
+        if constraint is not None and constraint.identifier.strip('/') == self.group_name:
+            tracker = constraint.tid_tracker()
+            if tracker is not None:
+                return tracker
+
+        pid = self.pid
+        if pid is None:
+            return None
+
+        return ProcessTreeTidTracker(pid)
+
     async def join(self) -> None:
         await super().join()
 
@@ -123,8 +191,9 @@ class LaunchableBenchmark(BaseBenchmark[_CFG_T]):
         def _init_context_var(self, benchmark: LaunchableBenchmark, logger_level: int) -> None:
             super()._init_context_var(benchmark, logger_level)
 
+            engine = AffinityEngine if AffinityConstraint in self._constraints else CGroupEngine
             # noinspection PyProtectedMember
-            benchmark._context_variable._assign(CGroupEngine, BaseEngine)
+            benchmark._context_variable._assign(engine, BaseEngine)
 
         async def _finalize(self) -> LaunchableBenchmark:
             return LaunchableBenchmark(
@@ -34,11 +34,7 @@ class SSHBenchmark(BaseBenchmark[_CFG_T], ABC):
     @classmethod
     def of(cls, context: Context) -> Optional[SSHBenchmark]:
         # noinspection PyProtectedMember
-        for c, v in context._variable_dict.items():
-            if issubclass(c, cls):
-                return v
-
-        return None
+        return context._find(cls)
 
     def __init__(self,
                  ssh_config: _CFG_T,
@@ -0,0 +1,130 @@
+# coding: UTF-8
+
+"""
+:mod:`start_barrier` -- 함께 실행되는 벤치마크들의 동시 재시작
+============================================================
+
+:meth:`~benchmon.benchmark.base.BaseBenchmark.resume` 을 벤치마크마다 차례로 호출하면 각 호출이 파일을 열거나
+프로세스를 찾는 시간만큼 재시작 시점이 벌어지고, 그 차이는 벤치마크의 수에 비례해 커진다.
+:class:`StartBarrier` 는 모든 벤치마크의 재시작을 미리 준비해 둔 뒤
+(:meth:`~benchmon.benchmark.base.BaseBenchmark.prepare_resume`), 준비된 함수들만 한번에 연달아 호출하고,
+첫번째와 마지막 벤치마크의 재시작 시점 차이를 :class:`StartReport` 로 알려준다.
+
+.. module:: benchmon.benchmark.start_barrier
+    :synopsis: 함께 실행되는 벤치마크들의 동시 재시작
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from .base import BaseBenchmark
+
+
+@dataclass(frozen=True)
+class StartReport:
+    """ :meth:`StartBarrier.fire` 로 벤치마크들을 재시작한 결과 """
+    __slots__ = ('offsets', 'skew')
+
+    offsets: Tuple[Tuple[str, float], ...]
+    """ (벤치마크 identifier, 첫번째 벤치마크의 재시작 이후 그 벤치마크가 재시작 될 때 까지 걸린 시간 (초)) 쌍들 """
+    skew: float
+    """ 첫번째 벤치마크와 마지막 벤치마크의 재시작 시점 차이 (초) """
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        :return: 실행 결과와 함께 저장할 수 있는 형태
+        :rtype: typing.Dict[str, object]
+        """
+        return {'skew': self.skew, 'offsets': dict(self.offsets)}
+
+
+class StartBarrier:
+    """
+    여러 벤치마크를 최대한 같은 시점에 재시작한다.
+
+    .. code-block:: python
+
+        with StartBarrier(benches) as barrier:
+            report = barrier.fire()
+
+    .. note::
+
+        * 준비하며 열어둔 파일 등은 `with` 블록을 나갈 때 닫힌다.
+        * 재시작하는 동안 garbage collector가 끼어들지 않도록, :meth:`fire` 동안에는 garbage collector를 끈다.
+    """
+    __slots__ = ('_benches', '_stack', '_triggers')
+
+    _benches: Tuple[BaseBenchmark, ...]
+    _stack: contextlib.ExitStack
+    _triggers: List[Callable[[], None]]
+
+    def __init__(self, benches: Iterable[BaseBenchmark]) -> None:
+        """
+        :param benches: 함께 재시작할 벤치마크들. 이미 :meth:`~benchmon.benchmark.base.BaseBenchmark.pause` 되어 있어야 한다.
+        :type benches: typing.Iterable[benchmon.benchmark.base.BaseBenchmark]
+        """
+        self._benches = tuple(benches)
+        self._stack = contextlib.ExitStack()
+        self._triggers = list()
+
+    def __enter__(self) -> StartBarrier:
+        with contextlib.ExitStack() as stack:
+            self._triggers = [bench.prepare_resume(stack) for bench in self._benches]
+            # keep the prepared resources only if all benchmarks are prepared
+            self._stack = stack.pop_all()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._triggers = list()
+        self._stack.close()
+
+    def fire(self) -> StartReport:
+        """
+        준비된 모든 벤치마크를 연달아 재시작한다.
+        재시작하지 못한 벤치마크가 있더라도 나머지 벤치마크들은 재시작한 뒤, 처음 발생한 예외를 다시 발생시킨다.
+
+        :return: 각 벤치마크의 재시작 시점
+        :rtype: benchmon.benchmark.start_barrier.StartReport
+        """
+        if len(self._triggers) != len(self._benches):
+            raise RuntimeError('Prepare the barrier first by entering the `with` block.')
+
+        timestamps: List[int] = [0] * len(self._triggers)
+        error: Optional[BaseException] = None
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            for idx, trigger in enumerate(self._triggers):
+                try:
+                    trigger()
+                except Exception as e:
+                    if error is None:
+                        error = e
+                timestamps[idx] = time.perf_counter_ns()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        self._triggers = list()
+
+        if error is not None:
+            raise error
+
+        if len(timestamps) == 0:
+            return StartReport(tuple(), 0.0)
+
+        first = timestamps[0]
+        return StartReport(
+                tuple((bench.identifier, (ts - first) / 1e9) for bench, ts in zip(self._benches, timestamps)),
+                (timestamps[-1] - first) / 1e9
+        )
@@ -23,10 +23,16 @@ class PerfConfig(MonitorConfig):
     :class:`~benchmon.monitors.perf.PerfMonitor` 객체를 생성할 때 쓰이는 정보.
     어떤 이벤트를 얼만큼의 주기로 모니터링 해야할지가 적혀있다.
     """
-    __slots__ = ('interval', 'events')
+    __slots__ = ('interval', 'events', 'backend')
 
     interval: int
     events: Tuple[PerfEvent, ...]
+    backend: str
+    """
+    카운터를 읽는 방법.
+    `perf` 일 경우 `perf stat` 프로세스의 출력을 파싱하며,
+    `perf_event` 일 경우 :mod:`benchmon.utils.perf_event` 를 통해 프로세스 내부에서 직접 카운터를 읽는다.
+    """
 
     @property
     def event_names(self) -> Generator[str, None, None]:
@@ -15,9 +15,12 @@ from libcgroup import CGroup
 
 from ...containers import BenchConfig
 from ....benchmark import BaseBenchmark
-from ....benchmark.constraints import CGroupConstraint, DVFSConstraint, ResCtrlConstraint
+from ....benchmark.constraints import AffinityConstraint, CGroupConstraint, DVFSConstraint, ResCtrlConstraint
 from ....utils import Ranges, ResCtrl
+from ....utils.affinity import MemPolicy
+from ....utils.freezer import is_unified
 from ....utils.numa_topology import core_to_socket, possible_sockets, socket_to_core
+from ....utils.sysfs import sys_path
 
 if TYPE_CHECKING:
     from ....benchmark.constraints import BaseConstraint
@@ -188,8 +191,8 @@ class BaseBenchParser(Generic[_CT], metaclass=ABCMeta):
 
         if 'bound_cores' not in config:
             if 'mem_bound_sockets' not in config:
-                config['bound_cores'] = Path('/sys/devices/system/cpu/online').read_text().strip()
-                config['mem_bound_sockets'] = Path('/sys/devices/system/node/online').read_text().strip()
+                config['bound_cores'] = sys_path('devices/system/cpu/online').read_text().strip()
+                config['mem_bound_sockets'] = sys_path('devices/system/node/online').read_text().strip()
             else:
                 bound_mems = Ranges.from_str(config['mem_bound_sockets'])
                 config['bound_cores'] = \
@@ -267,11 +270,26 @@ class BaseBenchParser(Generic[_CT], metaclass=ABCMeta):
             'cpu.cfs_quota_us': int(config['cycle_limit'])
         }
 
-        constrains.append(CGroupConstraint(config['identifier'], 'cpuset', 'cpu', **cgroup_values))
+        # cgroup v1 provides the freezer as a separate subsystem, which is used to pause the benchmark
+        controllers = ('cpuset', 'cpu') if is_unified() else ('cpuset', 'cpu', 'freezer')
+        constrains.append(CGroupConstraint(config['identifier'], *controllers, **cgroup_values))
 
         if 'cpu_freq' in config:
             cpu_freq: int = int(config['cpu_freq'] * 1_000_000)
             bound_cores = Ranges.from_str(config['bound_cores'])
             constrains.append(DVFSConstraint(bound_cores.to_tuple(), cpu_freq))
 
+        if 'mem_policy' in config:
+            mem_policy = MemPolicy.from_str(config['mem_policy'])
+            if mem_policy in (MemPolicy.DEFAULT, MemPolicy.LOCAL):
+                nodes = tuple()
+            else:
+                nodes = Ranges.from_str(config['mem_bound_sockets']).to_tuple()
+            if mem_policy is MemPolicy.PREFERRED and len(nodes) != 1:
+                # `set_mempolicy(2)` fails with EINVAL for the preferred policy with multiple nodes
+                raise ValueError(f'`mem_policy` "preferred" of {config["identifier"]} needs exactly one node, '
+                                 f'but `mem_bound_sockets` is {config["mem_bound_sockets"]!r}.')
+            bound_cores = Ranges.from_str(config['bound_cores'])
+            constrains.append(AffinityConstraint(bound_cores.to_tuple(), mem_policy, nodes))
+
         return tuple(constrains)
@@ -17,6 +17,8 @@ class PerfParser(LocalReadParser[PerfConfig]):
 
     `perf.json` 의 내용이 기본이며, `config.json` 에서 추가된 event를 추가하거나
     동일한 event 이름의 경우 `perf.json` 의 내용을 덮어 쓴다.
+
+    `backend` 는 :attr:`benchmon.configs.containers.perf.PerfConfig.backend` 참조. 생략할 경우 `perf` 를 사용한다.
     """
 
     def _parse(self) -> PerfConfig:
@@ -30,4 +32,8 @@ class PerfParser(LocalReadParser[PerfConfig]):
                 for elem in chain(config['events'], local_config.get('events', tuple()))
         )
 
-        return PerfConfig(local_config.get('interval', config['interval']), events)
+        return PerfConfig(
+                local_config.get('interval', config['interval']),
+                events,
+                local_config.get('backend', config.get('backend', 'perf'))
+        )
@@ -1,7 +1,8 @@
 # coding: UTF-8
 
 import logging
-from typing import Any, Dict, Type
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Type, TypeVar
 
 from abc import ABCMeta, abstractmethod
 from aiofile_linux import AIOContext
@@ -14,18 +15,77 @@ def aio_context() -> AIOContext:
     return _aio_context
 
 
+_T = TypeVar('_T')
+
+
 class Context:
-    __slots__ = ('_variable_dict',)
+    """
+    벤치마크, 파이프라인, 로거, 설정 등 모니터링에 필요한 객체들을 타입을 키로 담고있는 객체.
+
+    :meth:`ContextReadable.of` 처럼 타입으로 객체를 찾는 결과는 :meth:`_lookup` 을 통해 캐시되며,
+    :meth:`_assign` 으로 담고있는 객체가 바뀔 때 모두 무효화된다.
+    따라서 매 모니터링 주기나 메시지마다 호출되는 검색도 처음 한번 이후로는 dict 조회 한번의 비용만 든다.
+
+    :class:`~benchmon.monitors.pipelines.threaded.ThreadedPipeline` 의 핸들러처럼 다른 스레드에서도 사용될 수 있으므로,
+    캐시를 채우거나 무효화하는 작업은 lock으로 보호된다. 캐시된 값을 읽을 때는 lock을 잡지 않는다.
+    """
+    __slots__ = ('_variable_dict', '_lookup_cache', '_lock')
 
     _variable_dict: Dict[Type, Any]
+    _lookup_cache: Dict[Hashable, Any]
+    _lock: threading.RLock
 
     def __init__(self) -> None:
         self._variable_dict = dict()
+        self._lookup_cache = dict()
+        # resolvers may look up other types (e.g. `BaseConstraint.of()` looks up the benchmark)
+        self._lock = threading.RLock()
 
     def _assign(self, val: Any, cls: Type = None) -> None:
         if cls is None:
             cls = type(val)
-        self._variable_dict[cls] = val
+
+        with self._lock:
+            self._variable_dict[cls] = val
+            self._lookup_cache.clear()
+
+    def _lookup(self, key: Hashable, resolver: Callable[[], _T]) -> _T:
+        """
+        `key` 에 해당하는 캐시된 값을 반환한다. 캐시된 값이 없다면 `resolver` 를 호출하여 그 결과를 캐시한다.
+        ``None`` 인 결과도 캐시된다.
+
+        :param key: 캐시의 키. 보통 찾으려는 타입
+        :type key: typing.Hashable
+        :param resolver: 캐시된 값이 없을 때 값을 찾는 함수
+        :type resolver: typing.Callable[[], typing.Any]
+        :return: 찾은 값
+        :rtype: typing.Any
+        """
+        try:
+            return self._lookup_cache[key]
+        except KeyError:
+            pass
+
+        # a value resolved by another thread before `_assign()` must not be cached after the invalidation
+        with self._lock:
+            try:
+                return self._lookup_cache[key]
+            except KeyError:
+                ret = self._lookup_cache[key] = resolver()
+                return ret
+
+    def _find(self, cls: Type[_T]) -> Optional[_T]:
+        """
+        `cls` 혹은 그 자식 타입으로 등록된 객체를 찾는다.
+
+        :param cls: 찾으려는 타입
+        :type cls: typing.Type
+        :return: 찾은 객체. 없다면 ``None``
+        :rtype: typing.Optional[typing.Any]
+        """
+        return self._lookup(cls, lambda: next(
+                (v for c, v in self._variable_dict.items() if issubclass(c, cls)), None
+        ))
 
     @property
     def logger(self) -> logging.Logger:
@@ -6,11 +6,12 @@ from .accumulative import AccumulativeMonitor
 from .base import BaseMonitor
 from .combined import CombinedOneShotMonitor
 from .idle import IdleMonitor
-from .interval import IntervalMonitor
+from .interval import IntervalMonitor, OverrunPolicy
 from .perf import PerfMonitor
 from .power import PowerMonitor
 from .rdtsc import RDTSCMonitor
 from .resctrl import ResCtrlMonitor
 from .runtime import RuntimeMonitor
+from .sampler import SystemSampler
 
 MonitorData = TypeVar('MonitorData', int, float, Tuple, Mapping)
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import ClassVar, Dict, List, TYPE_CHECKING, Tuple, Union
+from typing import Dict, List, TYPE_CHECKING, Tuple, Union
 
 from ... import BaseMonitor
 from ...messages import SystemMessage
 from ...pipelines import BasePipeline
+from ....utils.sysfs import sys_path
+from ....utils.topology import hardware_topology
 
 if TYPE_CHECKING:
     from .... import Context
@@ -21,8 +23,6 @@ DAT_TYPE = Tuple[Dict[str, Union[str, int, Dict[str, int]]], ...]
 class PowerMonitor(BaseMonitor[SystemMessage, DAT_TYPE]):
     __slots__ = ('_monitors',)
 
-    _base_dir: ClassVar[Path] = Path('/sys/class/powercap/intel-rapl')
-
     _monitors: Dict[Path, Tuple[int, Dict[Path, int]]]
 
     def __init__(self) -> None:
@@ -33,29 +33,20 @@ class PowerMonitor(BaseMonitor[SystemMessage, DAT_TYPE]):
     async def on_init(self, context: Context) -> None:
         await super().on_init(context)
 
-        while True:
-            socket_id: int = len(self._monitors)
-            socket_monitor: Path = PowerMonitor._base_dir / f'intel-rapl:{socket_id}'
+        for package in hardware_topology().rapl_domains:
+            socket_monitor = sys_path(package.path)
 
-            if socket_monitor.exists():
-                with (socket_monitor / _ENERGY_FILE_NAME).open() as afp:
-                    socket_power = int(afp.readline())
+            with (socket_monitor / _ENERGY_FILE_NAME).open() as afp:
+                socket_power = int(afp.readline())
 
-                socket_dict: Dict[Path, int] = dict()
-                self._monitors[socket_monitor] = (socket_power, socket_dict)
+            socket_dict: Dict[Path, int] = dict()
+            self._monitors[socket_monitor] = (socket_power, socket_dict)
 
-                while True:
-                    sub_id: int = len(socket_dict)
-                    sub_monitor: Path = socket_monitor / f'intel-rapl:{socket_id}:{sub_id}'
+            for domain in package.sub_domains:
+                sub_monitor = sys_path(domain.path)
 
-                    if sub_monitor.exists():
-                        with (sub_monitor / _ENERGY_FILE_NAME).open() as afp:
-                            before = int(afp.readline())
-                            socket_dict[sub_monitor] = before
-                    else:
-                        break
-            else:
-                break
+                with (sub_monitor / _ENERGY_FILE_NAME).open() as afp:
+                    socket_dict[sub_monitor] = int(afp.readline())
 
     async def _monitor(self, context: Context) -> None:
         pass
@@ -64,7 +55,7 @@ class PowerMonitor(BaseMonitor[SystemMessage, DAT_TYPE]):
         pass
 
     async def create_message(self, context: Context, data: DAT_TYPE) -> SystemMessage[DAT_TYPE]:
-        return SystemMessage(data, self)
+        return SystemMessage(data, self, None, None)
 
     async def on_end(self, context: Context) -> None:
         ret: List[Dict[str, Union[str, int, Dict[str, int]]]] = list()
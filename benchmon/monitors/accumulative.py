@@ -2,15 +2,15 @@
 
 from __future__ import annotations
 
-import asyncio
 from abc import abstractmethod
 from typing import Generic, Optional, TYPE_CHECKING, TypeVar
 
-from .interval import IntervalMonitor
+from .interval import IntervalMonitor, OverrunPolicy
 from .messages import BaseMessage
 from .pipelines.base import BasePipeline
 
 if TYPE_CHECKING:
+    from .sampler import SystemSampler
     from .. import Context
 
 _DAT_T = TypeVar('_DAT_T')
@@ -22,23 +22,20 @@ class AccumulativeMonitor(IntervalMonitor[_MSG_T, _DAT_T], Generic[_MSG_T, _DAT_
 
     _prev_data: Optional[_DAT_T]
 
-    def __init__(self, interval: int) -> None:
-        super().__init__(interval)
+    def __init__(self, interval: int, overrun_policy: OverrunPolicy = OverrunPolicy.COALESCE,
+                 sampler: SystemSampler = None) -> None:
+        super().__init__(interval, overrun_policy, sampler)
 
         self._prev_data = None
 
-    async def _monitor(self, context: Context) -> None:
-        while not self.stopped:
-            data = await self.monitor_once(context)
-            diff = self.accumulate(self._prev_data, data)
-            self._prev_data = data
+    async def _on_sample(self, context: Context, data: _DAT_T) -> None:
+        diff = self.accumulate(self._prev_data, data)
+        self._prev_data = data
 
-            transformed = self._transform_data(diff)
+        transformed = self._transform_data(diff)
 
-            message = await self.create_message(context, transformed)
-            await BasePipeline.of(context).on_message(context, message)
-
-            await asyncio.sleep(self._interval)
+        message = await self.create_message(context, transformed)
+        await BasePipeline.of(context).on_message(context, message)
 
     @abstractmethod
     def accumulate(self, before: _DAT_T, after: _DAT_T) -> _DAT_T:
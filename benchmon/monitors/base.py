@@ -27,14 +27,11 @@ class BaseMonitor(ContextReadable, Generic[_MSG_T, _DAT_T], metaclass=ABCMeta):
 
     @classmethod
     def of(cls: Type[_MT], context: Context) -> Optional[_MT]:
-        benchmark = BaseBenchmark.of(context)
-
         # noinspection PyProtectedMember
-        for monitor in benchmark._monitors:
-            if isinstance(monitor, cls):
-                return monitor
-
-        return None
+        return context._lookup((BaseMonitor, cls), lambda: next(
+                # noinspection PyProtectedMember
+                (monitor for monitor in BaseBenchmark.of(context)._monitors if isinstance(monitor, cls)), None
+        ))
 
     def __init__(self) -> None:
         self._initialized = False
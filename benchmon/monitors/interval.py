@@ -3,39 +3,118 @@
 from __future__ import annotations
 
 import asyncio
+import enum
 from abc import abstractmethod
-from typing import Generic, TYPE_CHECKING, TypeVar
+from typing import Generic, Hashable, Optional, TYPE_CHECKING, TypeVar
 
 from .base import BaseMonitor
 from .messages import BaseMessage
 from .pipelines import BasePipeline
 
 if TYPE_CHECKING:
+    from .sampler import SystemSampler
     from .. import Context
 
 _DAT_T = TypeVar('_DAT_T')
 _MSG_T = TypeVar('_MSG_T', bound=BaseMessage)
 
 
+class OverrunPolicy(enum.Enum):
+    """
+    :class:`IntervalMonitor` 의 한 주기의 처리 (모니터링과 파이프라인 처리) 가 다음 deadline을 넘겼을 때의 처리 방법.
+    """
+    SKIP = 'skip'
+    """ 지나간 deadline들은 모두 건너뛰고, 아직 지나지 않은 다음 deadline을 기다린다. """
+    CATCH_UP = 'catch_up'
+    """ 지나간 deadline들을 하나도 빠짐없이 쉬지않고 연달아 처리하여 따라잡는다. """
+    COALESCE = 'coalesce'
+    """ 지나간 deadline들을 마지막 deadline 하나로 합쳐 즉시 처리한다. """
+
+
 class IntervalMonitor(BaseMonitor[_MSG_T, _DAT_T], Generic[_MSG_T, _DAT_T]):
-    __slots__ = ('_interval',)
+    """
+    `interval` 마다 :meth:`monitor_once` 를 호출하여 모니터링 하는 모니터.
 
-    _interval: float
+    모니터링 주기는 이벤트 루프의 시간 (:meth:`asyncio.AbstractEventLoop.time`) 을 기준으로 한 절대 deadline으로 정해지기 때문에,
+    모니터링이나 파이프라인 처리에 걸린 시간만큼 주기가 밀리지 않는다.
+    또한 deadline은 `interval` 의 배수로 정렬되기 때문에, 같은 `interval` 을 가지는 다른 모니터들과 같은 시점에 모니터링 한다.
+
+    처리가 늦어져 deadline을 지났을 경우 :class:`OverrunPolicy` 에 따라 처리한다.
 
-    def __init__(self, interval: int) -> None:
+    `sampler` 가 주어질 경우 자신의 타이머를 사용하지 않고,
+    :class:`~benchmon.monitors.sampler.SystemSampler` 의 tick에 맞춰 모니터링 된다.
+    이 경우 `interval` 과 `overrun_policy` 는 `sampler` 의 것을 따른다.
+    """
+    __slots__ = ('_interval', '_overrun_policy', '_sampler',
+                 '_scheduled_time', '_actual_time', '_overrun_count', '_dropped_count')
+
+    _interval: float
+    _overrun_policy: OverrunPolicy
+    _sampler: Optional[SystemSampler]
+    _scheduled_time: Optional[float]
+    _actual_time: Optional[float]
+    _overrun_count: int
+    _dropped_count: int
+
+    def __init__(self, interval: int, overrun_policy: OverrunPolicy = OverrunPolicy.COALESCE,
+                 sampler: SystemSampler = None) -> None:
         super().__init__()
 
         self._interval = interval / 1000
+        self._overrun_policy = overrun_policy
+        self._sampler = sampler
+        self._scheduled_time = None
+        self._actual_time = None
+        self._overrun_count = 0
+        self._dropped_count = 0
 
     async def _monitor(self, context: Context) -> None:
+        if self._sampler is not None:
+            await self._sampler.join(self, context)
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = -(-loop.time() // self._interval) * self._interval
+
         while not self.stopped:
-            data = await self.monitor_once(context)
-            transformed = self._transform_data(data)
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            self._scheduled_time = deadline
+            self._actual_time = loop.time()
+
+            await self._on_tick(context)
+
+            deadline = self._next_deadline(deadline, loop.time())
+
+    def _next_deadline(self, deadline: float, now: float) -> float:
+        deadline += self._interval
+
+        if deadline >= now:
+            return deadline
+
+        self._overrun_count += 1
+        missed = int((now - deadline) // self._interval) + 1
 
-            message = await self.create_message(context, transformed)
-            await BasePipeline.of(context).on_message(context, message)
+        if self._overrun_policy is OverrunPolicy.SKIP:
+            self._dropped_count += missed
+            return deadline + missed * self._interval
+        elif self._overrun_policy is OverrunPolicy.COALESCE:
+            self._dropped_count += missed - 1
+            return deadline + (missed - 1) * self._interval
+        else:
+            return deadline
 
-            await asyncio.sleep(self._interval)
+    async def _on_tick(self, context: Context) -> None:
+        data = await self.monitor_once(context)
+        await self._on_sample(context, data)
+
+    async def _on_sample(self, context: Context, data: _DAT_T) -> None:
+        transformed = self._transform_data(data)
+
+        message = await self.create_message(context, transformed)
+        await BasePipeline.of(context).on_message(context, message)
 
     @abstractmethod
     async def monitor_once(self, context: Context) -> _DAT_T:
@@ -46,6 +125,59 @@ class IntervalMonitor(BaseMonitor[_MSG_T, _DAT_T], Generic[_MSG_T, _DAT_T]):
     def stopped(self) -> bool:
         pass
 
+    # noinspection PyMethodMayBeStatic
+    def _sample_key(self, context: Context) -> Hashable:
+        """
+        :class:`~benchmon.monitors.sampler.SystemSampler` 는 한 tick에 같은 키를 가지는 모니터들 중
+        하나의 :meth:`monitor_once` 만 호출하고, 그 결과를 모든 모니터에게 나눠준다.
+
+        :param context: 모니터링 정보를 담고있는 객체
+        :type context: benchmon.context.Context
+        :return: 같은 값을 모니터링하는 모니터끼리 공유하는 키. 기본적으로는 모니터 자신.
+        :rtype: typing.Hashable
+        """
+        return self
+
     # noinspection PyMethodMayBeStatic
     def _transform_data(self, data: _DAT_T) -> _DAT_T:
         return data
+
+    @property
+    def sampler(self) -> Optional[SystemSampler]:
+        """
+        :return: 이 모니터를 구동하는 시스템 샘플러. 스스로의 타이머로 모니터링 한다면 ``None``.
+        :rtype: typing.Optional[benchmon.monitors.sampler.SystemSampler]
+        """
+        return self._sampler
+
+    @property
+    def scheduled_time(self) -> Optional[float]:
+        """
+        :return: 현재 처리중인 (혹은 마지막으로 처리한) 모니터링의 deadline. 이벤트 루프의 시간 기준.
+        :rtype: typing.Optional[float]
+        """
+        return self._scheduled_time
+
+    @property
+    def actual_time(self) -> Optional[float]:
+        """
+        :return: 현재 처리중인 (혹은 마지막으로 처리한) 모니터링이 실제로 시작된 시간. 이벤트 루프의 시간 기준.
+        :rtype: typing.Optional[float]
+        """
+        return self._actual_time
+
+    @property
+    def overrun_count(self) -> int:
+        """
+        :return: 처리가 늦어져 다음 deadline을 넘긴 횟수
+        :rtype: int
+        """
+        return self._overrun_count
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        :return: :class:`OverrunPolicy` 에 따라 건너뛰거나 합쳐져서 모니터링 되지 않은 deadline의 수
+        :rtype: int
+        """
+        return self._dropped_count
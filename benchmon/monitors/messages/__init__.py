@@ -26,4 +26,5 @@
 from .base import BaseMessage, GeneratedMessage, MergedMessage, MonitoredMessage
 from .per_bench import PerBenchMessage
 from .rabbit_mq import RabbitMQMessage
+from .sample import Sample, SampleSchema
 from .system import SystemMessage
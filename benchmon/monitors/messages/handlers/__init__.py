@@ -26,4 +26,5 @@
 
 from .base import BaseHandler
 from .printing import PrintHandler
+from .process_pool import ProcessPoolHandler
 from .rabbit_mq import RabbitMQHandler
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import Optional, TYPE_CHECKING, TypeVar
+from typing import ClassVar, List, Optional, Sequence, TYPE_CHECKING, Tuple, Type, TypeVar
+
+from ..base import BaseMessage
 
 if TYPE_CHECKING:
-    from .. import BaseMessage
     from .... import Context
 
 _MT = TypeVar('_MT')
@@ -33,8 +34,36 @@ class BaseHandler(metaclass=ABCMeta):
 
         * :class:`~benchmon.monitors.pipelines.base.BasePipeline` 를 상속받아 구현하는 클래스의 내부가 아니라면,
           :meth:`on_init`, :meth:`on_end`, :meth:`on_destroy` 를 임의로 호출해선 안된다.
+
+    핸들러는 :attr:`accepted_messages` 와 :attr:`accepted_sources` 로 자신이 처리할 메시지의 종류를 선언할 수 있으며,
+    파이프라인은 이를 통해 메시지를 처리하지 않을 핸들러를 호출하지 않고 건너뛴다.
+    """
+    accepted_messages: ClassVar[Tuple[Type[BaseMessage], ...]] = (BaseMessage,)
+    """ 이 핸들러가 처리하는 메시지 타입들. 이 타입들의 자식 타입도 포함한다. """
+    accepted_sources: ClassVar[Optional[Tuple[Type, ...]]] = None
+    """
+    이 핸들러가 처리하는 메시지를 만든 모니터 (혹은 핸들러) 의 타입들. 이 타입들의 자식 타입도 포함한다.
+    ``None`` 일 경우 만든 객체의 타입과 상관없이 처리한다.
     """
 
+    def accepts(self, message_type: Type[BaseMessage], source_type: Optional[Type]) -> bool:
+        """
+        `source_type` 의 객체가 만든 `message_type` 의 메시지를 이 핸들러가 처리하는지 여부.
+        파이프라인은 이 결과를 타입 쌍마다 캐시하기 때문에, 같은 인자에 대해서는 항상 같은 값을 반환해야 한다.
+
+        :param message_type: 메시지의 타입
+        :type message_type: typing.Type[benchmon.monitors.messages.base.BaseMessage]
+        :param source_type: 메시지를 만든 모니터 혹은 핸들러의 타입. 알 수 없다면 ``None``.
+        :type source_type: typing.Optional[typing.Type]
+        :return: 이 핸들러의 처리 여부
+        :rtype: bool
+        """
+        if not issubclass(message_type, self.accepted_messages):
+            return False
+
+        return self.accepted_sources is None or \
+               (source_type is not None and issubclass(source_type, self.accepted_sources))
+
     async def on_init(self, context: Context) -> None:
         """
         파이프라인이 시작될 때, 이 핸들러를 초기화 하는 메소드.
@@ -66,6 +95,45 @@ class BaseHandler(metaclass=ABCMeta):
         """
         pass
 
+    async def on_batch(self, context: Context, messages: Sequence[BaseMessage[_MT]]) -> Tuple[BaseMessage[_MT], ...]:
+        """
+        여러 메시지를 한번에 전달받아 처리하는 메소드.
+        :class:`~benchmon.monitors.pipelines.batching.BatchingPipeline` 처럼 메시지를 모아서 전달하는 파이프라인이 호출한다.
+
+        기본 구현은 `messages` 의 각 메시지에 대해 차례대로 :meth:`on_message` 를 호출한다.
+        파일 쓰기나 네트워크 전송 처럼 한번에 처리하는 것이 유리한 핸들러는 이 메소드를 override 하여
+        시스템 콜이나 왕복 횟수를 줄일 수 있다.
+
+        :param context: 파이프라인과 모니터링 등의 정보를 담고있는 객체
+        :type context: benchmon.context.Context
+        :param messages: 파이프라인으로부터 전달받은 메시지 객체들. 전달된 순서대로 정렬되어 있다.
+        :type messages: typing.Sequence[BaseMessage]
+        :return: 같은 파이프라인의 다음 핸들러에게 전달할 메시지 객체들.
+                 :meth:`on_message` 의 ``None`` 반환처럼, 반환값에서 빠진 메시지는 파이프라인에서 삭제된다.
+        :rtype: typing.Tuple[BaseMessage, ...]
+        """
+        ret: List[BaseMessage[_MT]] = list()
+
+        for message in messages:
+            message = await self.on_message(context, message)
+
+            if message is not None:
+                ret.append(message)
+
+        return tuple(ret)
+
+    async def on_flush(self, context: Context) -> None:
+        """
+        파이프라인이 사용 중지되기 직전에, 아직 내보내지 않은 결과를 파이프라인으로 내보내는 메소드.
+
+        파이프라인은 어떤 핸들러의 :meth:`on_end` 도 호출하기 전에 이 메소드를 핸들러가 등록된 순서대로 하나씩 호출하므로,
+        이 메소드에서 파이프라인으로 전달한 메시지는 아직 사용 중지되지 않은 다음 핸들러들이 처리한다.
+
+        :param context: 파이프라인과 모니터링 등의 정보를 담고있는 객체
+        :type context: benchmon.context.Context
+        """
+        pass
+
     async def on_end(self, context: Context) -> None:
         """
         핸들러의 사용 중지될 때를 처리하는 메소드.
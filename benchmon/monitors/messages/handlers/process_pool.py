@@ -0,0 +1,143 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Set, TYPE_CHECKING, Tuple, Type, TypeVar
+
+from .base import BaseHandler
+from .. import GeneratedMessage, MonitoredMessage
+from ...pipelines import BasePipeline
+
+if TYPE_CHECKING:
+    from .. import BaseMessage
+    from .... import Context
+
+_MT = TypeVar('_MT')
+
+BATCH_FUNC_TYPE = Callable[[Tuple[Any, ...]], Optional[Sequence[Any]]]
+
+
+class ProcessPoolHandler(BaseHandler):
+    """
+    메시지의 데이터를 모아 :class:`~concurrent.futures.ProcessPoolExecutor` 의 worker 프로세스에서 `func` 로 처리하는 핸들러.
+
+    GIL 때문에 스레드로는 나눠지지 않는 연산량이 많은 작업 (포맷팅, 머지, 직렬화 등) 을 다른 프로세스로 넘기기 위해 사용한다.
+
+    `message_type` 의 메시지가 들어오면 메시지 객체 대신 그 데이터 (:attr:`~benchmon.monitors.messages.base.BaseMessage.data`)
+    만 `batch_size` 개 만큼 모은 뒤, 튜플로 묶어 `func` 에 전달한다.
+    모니터나 벤치마크 객체를 참조하는 메시지 객체 대신 데이터만 전달하기 때문에 pickling 비용이 작다.
+    `func` 가 ``None`` 이 아닌 값을 반환하면, 그 결과는
+    :class:`~benchmon.monitors.messages.base.GeneratedMessage` 로 감싸져 같은 파이프라인으로 다시 전달된다.
+    이 핸들러가 만든 :class:`~benchmon.monitors.messages.base.GeneratedMessage` 는 다시 모으지 않는다.
+    결과를 직접 저장소에 쓰는 `func` 라면 ``None`` 을 반환하면 된다.
+
+    받은 메시지는 다음 핸들러에게 그대로 전달되며, 동시에 처리중인 batch가 `max_pending` 개를 넘으면
+    그 중 하나가 끝날 때 까지 파이프라인을 기다리게 한다.
+
+    .. note::
+
+        * `func` 와 메시지의 데이터는 pickle 가능해야한다. 즉, `func` 는 모듈 레벨 함수이거나 그에 대한
+          :func:`functools.partial` 이어야 한다.
+        * :meth:`on_flush` 에서 아직 `batch_size` 만큼 모이지 않은 데이터도 처리하고, 처리중인 모든 batch를 기다린다.
+          따라서 그 결과는 파이프라인의 다른 핸들러들이 사용 중지되기 전에 전달된다.
+    """
+    __slots__ = ('_func', '_batch_size', '_max_pending', '_message_type', '_max_workers', '_pool', '_owns_pool',
+                 '_batch', '_pending')
+
+    _func: BATCH_FUNC_TYPE
+    _batch_size: int
+    _max_pending: int
+    _message_type: Type[BaseMessage]
+    _max_workers: Optional[int]
+    _pool: Optional[Executor]
+    _owns_pool: bool
+    _batch: List[Any]
+    _pending: Set[asyncio.Task]
+
+    def __init__(self, func: BATCH_FUNC_TYPE, batch_size: int = 32, max_pending: int = 4,
+                 message_type: Type[BaseMessage] = MonitoredMessage, max_workers: int = None,
+                 pool: Executor = None) -> None:
+        if batch_size <= 0:
+            raise ValueError(f'batch_size must be positive, but {batch_size} is given')
+        if max_pending <= 0:
+            raise ValueError(f'max_pending must be positive, but {max_pending} is given')
+
+        self._func = func
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+        self._message_type = message_type
+        self._max_workers = max_workers
+        self._pool = pool
+        self._owns_pool = pool is None
+        self._batch = list()
+        self._pending = set()
+
+    def accepts(self, message_type: Type[BaseMessage], source_type: Optional[Type]) -> bool:
+        return issubclass(message_type, self._message_type)
+
+    async def on_init(self, context: Context) -> None:
+        if self._owns_pool:
+            self._pool = ProcessPoolExecutor(self._max_workers)
+
+    async def on_message(self, context: Context, message: BaseMessage[_MT]) -> Optional[BaseMessage[_MT]]:
+        if not isinstance(message, self._message_type) or \
+                (isinstance(message, GeneratedMessage) and message.generator is self):
+            return message
+
+        self._batch.append(message.data)
+
+        if len(self._batch) >= self._batch_size:
+            await self._submit(context)
+
+        return message
+
+    async def _submit(self, context: Context) -> None:
+        batch = tuple(self._batch)
+        self._batch.clear()
+
+        self._pending.add(asyncio.create_task(self._process(context, batch)))
+
+        if len(self._pending) >= self._max_pending:
+            _, self._pending = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _process(self, context: Context, batch: Tuple[Any, ...]) -> None:
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._pool, self._func, batch)
+        except Exception as e:
+            context.logger.exception(f'{self._func} failed to process a batch of {len(batch)} payloads: {e}')
+            return
+
+        if results is None:
+            return
+
+        try:
+            await BasePipeline.of(context).on_message(context, GeneratedMessage(tuple(results), self))
+        except Exception as e:
+            context.logger.exception(f'Failed to deliver the results of {self._func} to the pipeline: {e}')
+
+    async def on_flush(self, context: Context) -> None:
+        if len(self._batch) != 0:
+            await self._submit(context)
+
+        if len(self._pending) != 0:
+            await asyncio.wait(self._pending)
+            self._pending = set()
+
+    async def on_end(self, context: Context) -> None:
+        if len(self._batch) != 0:
+            context.logger.warning(f'{self} is ended without flushing {len(self._batch)} payloads.')
+            self._batch.clear()
+
+        # the pipeline did not call `on_flush`, so the remaining results can not be delivered anymore
+        for task in self._pending:
+            task.cancel()
+        if len(self._pending) != 0:
+            await asyncio.wait(self._pending)
+            self._pending = set()
+
+    async def on_destroy(self, context: Context) -> None:
+        if self._owns_pool and self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
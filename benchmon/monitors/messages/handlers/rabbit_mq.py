@@ -2,19 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Optional, Sequence, TYPE_CHECKING, Tuple
 
 import aio_pika
 
 from .base import BaseHandler
-from .. import RabbitMQMessage
+from .. import RabbitMQMessage, Sample
 
 if TYPE_CHECKING:
+    from .. import BaseMessage
     from .... import Context
     from ....configs.containers import RabbitMQConfig
 
 
+def _encode(data: Any) -> bytes:
+    return json.dumps(data, default=_to_json).encode()
+
+
+def _to_json(obj: Any) -> Any:
+    if isinstance(obj, Sample):
+        return dict(zip(obj.schema.names, obj.row()))
+
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
 class RabbitMQHandler(BaseHandler):
     """
     파이프라인으로 전달되는 메시지 중 :class:`~benchmon.monitors.messages.rabbit_mq.RabbitMQMessage` 객체 혹은 자식 객체
@@ -28,6 +41,8 @@ class RabbitMQHandler(BaseHandler):
     """
     __slots__ = ('_creation_q_name', '_host', '_connection', '_channel', '_message_queue')
 
+    accepted_messages = (RabbitMQMessage,)
+
     _creation_q_name: str
     _host: str
     _connection: Optional[aio_pika.Connection]
@@ -60,11 +75,34 @@ class RabbitMQHandler(BaseHandler):
 
         await self._channel.default_exchange.publish(
                 aio_pika.Message(
-                        body=json.dumps(message.data).encode()
+                        body=_encode(message.data)
                 ),
                 routing_key=message.routing_key
         )
 
+    async def on_batch(self, context: Context, messages: Sequence[BaseMessage]) -> Tuple[BaseMessage, ...]:
+        """
+        batch 안의 :class:`~benchmon.monitors.messages.rabbit_mq.RabbitMQMessage` 메시지들을 응답을 기다리지 않고 연달아 전송한 뒤,
+        한번에 모든 전송의 완료를 기다린다.
+        """
+        targets = tuple(message for message in messages if isinstance(message, RabbitMQMessage))
+
+        if len(targets) != 0:
+            if self._message_queue is None:
+                self._message_queue = await self._channel.declare_queue(targets[0].routing_key, exclusive=True)
+
+            await asyncio.gather(*(
+                self._channel.default_exchange.publish(
+                        aio_pika.Message(
+                                body=_encode(message.data)
+                        ),
+                        routing_key=message.routing_key
+                )
+                for message in targets
+            ))
+
+        return tuple(message for message in messages if not isinstance(message, RabbitMQMessage))
+
     async def on_end(self, context: Context) -> None:
         if self._message_queue is not None:
             await self._message_queue.delete(if_empty=False)
@@ -3,20 +3,34 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Generic, TYPE_CHECKING, TypeVar
+from typing import Generic, Optional, TYPE_CHECKING, TypeVar
 
 from .base import MonitoredMessage
 
 if TYPE_CHECKING:
+    from .. import BaseMonitor
     from ...benchmark import BaseBenchmark
 
 _MT = TypeVar('_MT')
 
 
-@dataclass(frozen=True)
+# `__init__` is written by hand to give default values to the slotted fields
+@dataclass(frozen=True, init=False)
 class PerBenchMessage(MonitoredMessage[_MT], Generic[_MT]):
     """ :class:`벤치마크 <benchmon.benchmark.base.BaseBenchmark>` 를 모니터링한 결과로 생성된 메시지 """
-    __slots__ = ('bench',)
+    __slots__ = ('bench', 'scheduled_time', 'actual_time')
 
     bench: BaseBenchmark
     """ 대상 벤치마크 """
+    scheduled_time: Optional[float]
+    """ 주기적으로 모니터링 된 메시지일 경우, 모니터링이 예정되어있던 시간 (이벤트 루프의 시간 기준). 아닐 경우 `None`. """
+    actual_time: Optional[float]
+    """ 주기적으로 모니터링 된 메시지일 경우, 실제로 모니터링 된 시간 (이벤트 루프의 시간 기준). 아닐 경우 `None`. """
+
+    def __init__(self, data: _MT, source: BaseMonitor[_MT], bench: BaseBenchmark,
+                 scheduled_time: Optional[float] = None, actual_time: Optional[float] = None) -> None:
+        object.__setattr__(self, 'data', data)
+        object.__setattr__(self, 'source', source)
+        object.__setattr__(self, 'bench', bench)
+        object.__setattr__(self, 'scheduled_time', scheduled_time)
+        object.__setattr__(self, 'actual_time', actual_time)
@@ -0,0 +1,198 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+_VAL_T = Union[int, float]
+
+
+class SampleSchema:
+    """
+    :class:`Sample` 들이 공유하는 필드의 이름과 순서, 타입.
+
+    모니터는 보통 :meth:`~benchmon.monitors.base.BaseMonitor.on_init` 이나 모니터링 시작 시점에 한번 스키마를 만들고,
+    매 모니터링마다 그 스키마로 :class:`Sample` 을 생성한다.
+    이름으로 값을 찾을 때 필요한 인덱스는 스키마가 가지고 있기 때문에, 샘플마다 dict를 만들 필요가 없다.
+
+    모든 필드가 정수라면 값은 ``array('q')`` 에, 하나라도 실수라면 ``array('d')`` 에 저장되며,
+    후자의 경우 정수 필드는 읽을 때 다시 :class:`int` 로 변환된다.
+    """
+    __slots__ = ('_names', '_index', '_integral', '_typecode', '_mixed')
+
+    _names: Tuple[str, ...]
+    _index: Dict[str, int]
+    _integral: Tuple[bool, ...]
+    _typecode: str
+    _mixed: bool
+
+    def __init__(self, names: Iterable[str], integral: Iterable[bool] = None) -> None:
+        """
+        :param names: 필드의 이름들. 순서대로 저장된다.
+        :type names: typing.Iterable[str]
+        :param integral: 각 필드가 정수인지 여부. 주어지지 않을 경우 모든 필드를 정수로 취급한다.
+        :type integral: typing.Optional[typing.Iterable[bool]]
+        """
+        self._names = tuple(names)
+        self._index = {name: idx for idx, name in enumerate(self._names)}
+
+        if integral is None:
+            self._integral = (True,) * len(self._names)
+        else:
+            self._integral = tuple(integral)
+
+        if len(self._index) != len(self._names):
+            raise ValueError(f'Field names must be unique: {self._names}')
+        if len(self._integral) != len(self._names):
+            raise ValueError(f'{len(self._names)} fields are given but only {len(self._integral)} types are given')
+
+        self._typecode = 'q' if all(self._integral) else 'd'
+        self._mixed = self._typecode == 'd' and any(self._integral)
+
+    def new(self, values: Iterable[_VAL_T]) -> Sample:
+        """
+        `values` 를 값으로 가지는 샘플을 생성한다.
+
+        :param values: 필드 순서대로 정렬된 값들
+        :type values: typing.Iterable[typing.Union[int, float]]
+        :return: 생성된 샘플
+        :rtype: benchmon.monitors.messages.sample.Sample
+        """
+        values = array(self._typecode, values)
+
+        if len(values) != len(self._names):
+            raise ValueError(f'{len(self._names)} values are expected but {len(values)} values are given')
+
+        return Sample(self, values)
+
+    def extend(self, names: Iterable[str], integral: Iterable[bool] = None) -> SampleSchema:
+        """
+        이 스키마의 필드들 뒤에 `names` 필드들을 추가한 새 스키마를 만든다.
+
+        :param names: 추가할 필드의 이름들
+        :type names: typing.Iterable[str]
+        :param integral: 추가할 각 필드가 정수인지 여부. 주어지지 않을 경우 모든 필드를 정수로 취급한다.
+        :type integral: typing.Optional[typing.Iterable[bool]]
+        :return: 새로 만들어진 스키마
+        :rtype: benchmon.monitors.messages.sample.SampleSchema
+        """
+        names = tuple(names)
+        integral = (True,) * len(names) if integral is None else tuple(integral)
+
+        return SampleSchema(self._names + names, self._integral + integral)
+
+    def index(self, name: str) -> int:
+        """
+        :param name: 필드의 이름
+        :type name: str
+        :return: 필드의 인덱스
+        :rtype: int
+        """
+        return self._index[name]
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """
+        :return: 순서대로 정렬된 필드의 이름들
+        :rtype: typing.Tuple[str, ...]
+        """
+        return self._names
+
+    @property
+    def integral(self) -> Tuple[bool, ...]:
+        """
+        :return: 순서대로 정렬된 각 필드의 정수 여부
+        :rtype: typing.Tuple[bool, ...]
+        """
+        return self._integral
+
+    @property
+    def typecode(self) -> str:
+        """
+        :return: 값을 저장하는 :class:`array.array` 의 typecode
+        :rtype: str
+        """
+        return self._typecode
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f'SampleSchema({self._names!r}, typecode={self._typecode!r})'
+
+
+class Sample(Mapping[str, _VAL_T]):
+    """
+    :class:`SampleSchema` 를 공유하며, 값들을 :class:`array.array` 에 저장하는 읽기 전용 모니터링 결과.
+
+    :class:`typing.Mapping` 이기 때문에 기존처럼 ``sample['name']`` 이나 :meth:`items` 로 사용할 수 있고,
+    필드 순서대로 모든 값이 필요하다면 :meth:`row` 를 사용하는 것이 빠르다.
+    """
+    __slots__ = ('_schema', '_values')
+
+    _schema: SampleSchema
+    _values: array
+
+    def __init__(self, schema: SampleSchema, values: array) -> None:
+        self._schema = schema
+        self._values = values
+
+    def __getitem__(self, name: str) -> _VAL_T:
+        # noinspection PyProtectedMember
+        idx = self._schema._index[name]
+        value = self._values[idx]
+
+        # noinspection PyProtectedMember
+        if self._schema._mixed and self._schema._integral[idx]:
+            return int(value)
+
+        return value
+
+    def get(self, name: str, default: Optional[_VAL_T] = None) -> Optional[_VAL_T]:
+        # noinspection PyProtectedMember
+        if name in self._schema._index:
+            return self[name]
+
+        return default
+
+    def __contains__(self, name: object) -> bool:
+        # noinspection PyProtectedMember
+        return name in self._schema._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema.names)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def row(self) -> Sequence[_VAL_T]:
+        """
+        :return: 필드 순서대로 정렬된 값들
+        :rtype: typing.Sequence[typing.Union[int, float]]
+        """
+        # noinspection PyProtectedMember
+        if self._schema._mixed:
+            # noinspection PyProtectedMember
+            return tuple(int(v) if i else v for v, i in zip(self._values, self._schema._integral))
+
+        return self._values
+
+    @property
+    def schema(self) -> SampleSchema:
+        """
+        :return: 이 샘플의 스키마
+        :rtype: benchmon.monitors.messages.sample.SampleSchema
+        """
+        return self._schema
+
+    @property
+    def array(self) -> array:
+        """
+        :return: 값들이 저장된 배열. 정수 필드도 스키마에 따라 실수로 저장되어 있을 수 있다.
+        :rtype: array.array
+        """
+        return self._values
+
+    def __repr__(self) -> str:
+        return f'Sample({dict(self)!r})'
@@ -1,14 +1,20 @@
 # coding: UTF-8
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TYPE_CHECKING, TypeVar
 
 from .base import MonitoredMessage
 
+if TYPE_CHECKING:
+    from .. import BaseMonitor
+
 _MT = TypeVar('_MT')
 
 
-@dataclass(frozen=True)
+# `__init__` is written by hand to give default values to the slotted fields
+@dataclass(frozen=True, init=False)
 class SystemMessage(MonitoredMessage[_MT], Generic[_MT]):
     """
     벤치마크 대신 시스템 레벨로 모니터링한 결과로 생성된 메시지
@@ -17,4 +23,16 @@ class SystemMessage(MonitoredMessage[_MT], Generic[_MT]):
         :class:`benchmon.monitors.messages.per_bench.PerBenchMessage` 클래스
             벤치마크를 모니터링한 결과로 생성된 메시지
     """
-    pass
+    __slots__ = ('scheduled_time', 'actual_time')
+
+    scheduled_time: Optional[float]
+    """ 주기적으로 모니터링 된 메시지일 경우, 모니터링이 예정되어있던 시간 (이벤트 루프의 시간 기준). 아닐 경우 `None`. """
+    actual_time: Optional[float]
+    """ 주기적으로 모니터링 된 메시지일 경우, 실제로 모니터링 된 시간 (이벤트 루프의 시간 기준). 아닐 경우 `None`. """
+
+    def __init__(self, data: _MT, source: BaseMonitor[_MT],
+                 scheduled_time: Optional[float] = None, actual_time: Optional[float] = None) -> None:
+        object.__setattr__(self, 'data', data)
+        object.__setattr__(self, 'source', source)
+        object.__setattr__(self, 'scheduled_time', scheduled_time)
+        object.__setattr__(self, 'actual_time', actual_time)
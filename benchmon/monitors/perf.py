@@ -3,34 +3,52 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Mapping, TYPE_CHECKING, Union
+import os
+from typing import List, Optional, TYPE_CHECKING, Tuple, Union
 
 from .base import BaseMonitor
 from .messages import PerBenchMessage
+from .messages.sample import Sample, SampleSchema
 from .pipelines import BasePipeline
 from ..benchmark import BaseBenchmark
 from ..utils.asyncio_subprocess import check_output
+from ..utils.perf_event import CLOCK_EVENTS, PerfEventGroup, scale_delta
+from ..utils.sysfs import proc_path
 
 if TYPE_CHECKING:
     from .. import Context
     from ..configs.containers import PerfConfig
 
-DAT_TYPE = Mapping[str, Union[int, float]]
+DAT_TYPE = Sample
 
 
 class PerfMonitor(BaseMonitor[PerBenchMessage, DAT_TYPE]):
-    __slots__ = ('_perf_config', '_is_stopped')
+    __slots__ = ('_perf_config', '_is_stopped', '_schema')
 
     _perf_config: PerfConfig
     _is_stopped: bool
+    _schema: SampleSchema
 
     def __init__(self, perf_config: PerfConfig) -> None:
         super().__init__()
 
         self._perf_config = perf_config
         self._is_stopped = False
+        # clock events (e.g. `task-clock`) are reported in milliseconds, others are counts
+        self._schema = SampleSchema(
+                (event.alias for event in perf_config.events),
+                (event.event not in CLOCK_EVENTS for event in perf_config.events)
+        )
 
     async def _monitor(self, context: Context) -> None:
+        if self._perf_config.backend == 'perf':
+            await self._monitor_perf_stat(context)
+        elif self._perf_config.backend == 'perf_event':
+            await self._monitor_perf_event(context)
+        else:
+            raise ValueError(f'{self._perf_config.backend} is not a supported perf backend')
+
+    async def _monitor_perf_stat(self, context: Context) -> None:
         benchmark = BaseBenchmark.of(context)
 
         perf_proc = await asyncio.create_subprocess_exec(
@@ -46,12 +64,13 @@ class PerfMonitor(BaseMonitor[PerBenchMessage, DAT_TYPE]):
                 # remove warning message of perf from buffer
                 await perf_proc.stderr.readline()
 
-        record = dict.fromkeys(event.alias for event in self._perf_config.events)
+        integral = self._schema.integral
+        record: List[Union[int, float]] = [0] * len(integral)
 
         while not self._is_stopped and perf_proc.returncode is None:
             ignored = False
 
-            for event in self._perf_config.events:
+            for idx in range(len(integral)):
                 raw_line = await perf_proc.stderr.readline()
 
                 line: str = raw_line.decode().strip()
@@ -59,14 +78,16 @@ class PerfMonitor(BaseMonitor[PerBenchMessage, DAT_TYPE]):
 
                 try:
                     if line_split[1].isdigit():
-                        record[event.alias] = int(line_split[1])
+                        record[idx] = int(line_split[1])
+                    elif integral[idx]:
+                        record[idx] = int(float(line_split[1]))
                     else:
-                        record[event.alias] = float(line_split[1])
+                        record[idx] = float(line_split[1])
                 except (IndexError, ValueError):
                     ignored = True
 
             if not self._is_stopped and not ignored:
-                msg = await self.create_message(context, record.copy())
+                msg = await self.create_message(context, self._schema.new(record))
                 await BasePipeline.of(context).on_message(context, msg)
 
         if perf_proc.returncode is None:
@@ -75,6 +96,67 @@ class PerfMonitor(BaseMonitor[PerBenchMessage, DAT_TYPE]):
             except ProcessLookupError as e:
                 context.logger.debug(f'The perf kill was unsuccessful for the following reasons: {e}', e)
 
+    async def _monitor_perf_event(self, context: Context) -> None:
+        benchmark = BaseBenchmark.of(context)
+        events = tuple(event.event for event in self._perf_config.events)
+        integral = self._schema.integral
+        interval = self._perf_config.interval / 1000
+
+        # threads that are created later are counted by `inherit`
+        groups: List[PerfEventGroup] = list()
+        try:
+            for tid in os.listdir(proc_path(str(benchmark.pid), 'task')):
+                try:
+                    groups.append(PerfEventGroup(events, int(tid)))
+                except ProcessLookupError:
+                    # the thread has exited after it was listed
+                    context.logger.debug(f'Skipping the thread {tid}, which has already exited.')
+        except Exception:
+            for group in groups:
+                group.close()
+            raise
+
+        for group in groups:
+            group.enable()
+
+        prev: List[Optional[Tuple[int, ...]]] = [None] * len(groups)
+        unscheduled_warned = False
+
+        try:
+            while not self._is_stopped:
+                await asyncio.sleep(interval)
+
+                if self._is_stopped:
+                    break
+
+                record: List[Union[int, float]] = [0] * len(integral)
+
+                for idx, group in enumerate(groups):
+                    curr = group.read()
+                    values = scale_delta(prev[idx], curr)
+                    prev[idx] = curr
+
+                    if curr[1] == 0 and curr[0] != 0 and not unscheduled_warned:
+                        unscheduled_warned = True
+                        context.logger.warning('The perf event group can not be scheduled. '
+                                               'Try reducing the number of events.')
+
+                    for event_idx, value in enumerate(values):
+                        record[event_idx] += value
+
+                for event_idx, is_integral in enumerate(integral):
+                    if is_integral:
+                        record[event_idx] = int(record[event_idx])
+                    else:
+                        record[event_idx] = record[event_idx] / 1_000_000
+
+                msg = await self.create_message(context, self._schema.new(record))
+                await BasePipeline.of(context).on_message(context, msg)
+
+        finally:
+            for group in groups:
+                group.close()
+
     async def stop(self) -> None:
         self._is_stopped = True
 
@@ -86,5 +168,14 @@ class PerfMonitor(BaseMonitor[PerBenchMessage, DAT_TYPE]):
     def config(self) -> PerfConfig:
         return self._perf_config
 
+    @property
+    def schema(self) -> SampleSchema:
+        """
+        :return: 이 모니터가 만드는 :class:`~benchmon.monitors.messages.sample.Sample` 의 스키마.
+                 필드는 :attr:`config` 의 이벤트 alias 순서와 같다.
+        :rtype: benchmon.monitors.messages.sample.SampleSchema
+        """
+        return self._schema
+
     async def create_message(self, context: Context, data: DAT_TYPE) -> PerBenchMessage[DAT_TYPE]:
-        return PerBenchMessage(data, self, BaseBenchmark.of(context))
+        return PerBenchMessage(data, self, BaseBenchmark.of(context), None, None)
@@ -18,23 +18,26 @@
 
 파이프라인은 기본적으로 :class:`벤치마크 <benchmon.benchmark.base.BaseBenchmark>` 마다 하나씩 가지며,
 시스템 레벨로 단 하나 존재한다.
+시스템 레벨 파이프라인은 :class:`~benchmon.monitors.sampler.SystemSampler` 가 가지며,
+샘플러는 매 tick마다 공유되는 값들을 한번씩만 읽어 각 벤치마크의 파이프라인으로 나눠준다.
 
 파이프라인의 의미상, 각 파이프라인끼리의 메시지 교환은 불가능하다.
 
 .. note::
 
-    * 현재 구현상 시스템 레벨 파이프라인은 존재지 않다
     * 현재 구현은 파이프라인과 모니터가 같은 이벤트 루프를 공유한다. 즉, 같은 스레드에서 실행된다.
       모니터나 파이프라인에 연산량이 많아 시간이 오래 걸릴경우, 둘 중 하나가 이벤트 루프를 차지하여 상대방의 수행이 늦어질 수 있다.
         * 현재 파이프라인의 메시지 처리 부분(:meth:`~benchmon.monitors.pipelines.base.BasePipeline.on_message`)을
           바꾸지 않을채로 상위 문제를 해결할 시, 같은 파이프라인에 메시지가 전달되는 순서대로 처리되지 않을 수 있다.
-    * 현재 구현상 모든 파이프라인은 같은 이벤트 루프를 공유한다.
+        * :class:`~benchmon.monitors.pipelines.queued.QueuedPipeline` 은 핸들러마다 큐와 worker를 두어
+          모니터가 메시지를 큐에 넣는 비용만 지불하도록 하며, 메시지의 순서를 유지한다.
+    * :class:`~benchmon.monitors.pipelines.threaded.ThreadedPipeline` 을 제외한 모든 파이프라인은 같은 이벤트 루프를 공유한다.
+      :class:`~benchmon.monitors.pipelines.threaded.ThreadedPipeline` 은 별도의 스레드에서 전용 이벤트 루프를 가진다.
 
 .. todo::
 
-    * 시스템 파이프라인 구현
-        * **[제안]** 필요하다면, 시스템 파이프라인과 벤치마크의 파이프라인의 결과를 머지하는 부분 구현 (머지를 꼭 해야하는 경우가 있을까?)
-    * **[제안]** 로드에따라 파이프라인이 개별적으로 이벤트 루프를 가지도록 구현
+    * **[제안]** 필요하다면, 시스템 파이프라인과 벤치마크의 파이프라인의 결과를 머지하는 부분 구현 (머지를 꼭 해야하는 경우가 있을까?)
+    * **[제안]** 로드에따라 :class:`~benchmon.monitors.pipelines.threaded.ThreadedPipeline` 을 자동으로 선택하도록 구현
 
 .. module:: benchmon.monitors.pipelines
     :synopsis: 모니터로부터 생성된 메시지를 처리
@@ -42,4 +45,7 @@
 """
 
 from .base import BasePipeline
+from .batching import BatchingPipeline
 from .default import DefaultPipeline
+from .queued import QueueFullPolicy, QueuedPipeline, StageMetrics
+from .threaded import ThreadedPipeline
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import List, Optional, TYPE_CHECKING, Tuple, Type, TypeVar
+from bisect import bisect_right
+from typing import Dict, List, Optional, TYPE_CHECKING, Tuple, Type, TypeVar
 
 from ... import ContextReadable
 
@@ -13,6 +14,15 @@ if TYPE_CHECKING:
     from ... import Context
 
 _PT = TypeVar('_PT', bound='BasePipeline')
+_ROUTE_KEY = Tuple[type, Optional[type]]
+
+
+def _route_key(message: BaseMessage) -> _ROUTE_KEY:
+    source = getattr(message, 'source', None)
+    if source is None:
+        source = getattr(message, 'generator', None)
+
+    return type(message), None if source is None else type(source)
 
 
 class BasePipeline(ContextReadable, metaclass=ABCMeta):
@@ -35,14 +45,11 @@ class BasePipeline(ContextReadable, metaclass=ABCMeta):
     @classmethod
     def of(cls: Type[_PT], context: Context) -> Optional[_PT]:
         # noinspection PyProtectedMember
-        for c, v in context._variable_dict.items():
-            if issubclass(c, cls):
-                return v
-
-        return None
+        return context._find(cls)
 
     def __init__(self) -> None:
         self._handlers: List[BaseHandler] = list()
+        self._routes: Dict[_ROUTE_KEY, Tuple[int, ...]] = dict()
 
     def add_handler(self: _PT, handler: BaseHandler) -> _PT:
         """
@@ -61,15 +68,53 @@ class BasePipeline(ContextReadable, metaclass=ABCMeta):
             * 현재 파이프라인 구현상 이미 initialized된 파이프라인에 핸들러를 추가할 경우
               :meth:`~benchmon.monitors.messages.handlers.base.BaseHandler.on_init` 이 호출되지 않는다.
 
+            * 파이프라인은 핸들러의
+              :meth:`~benchmon.monitors.messages.handlers.base.BaseHandler.accepts` 를 통해
+              메시지 타입과 메시지를 만든 객체의 타입 쌍마다 처리할 핸들러들을 미리 계산해두고,
+              처리하지 않을 핸들러는 호출하지 않는다.
+
         :param handler: 파이프라인에 추가할 새로운 핸들러
         :type handler: benchmon.monitors.messages.handlers.base.BaseHandler
         :return: Method chaining을 위한 파이프라인 객체 그대로 반환
         :rtype: benchmon.monitors.pipelines.base.BasePipeline
         """
         self._handlers.append(handler)
+        self._routes.clear()
 
         return self
 
+    def _route(self, message: BaseMessage) -> Tuple[int, ...]:
+        """
+        `message` 와 같은 (메시지 타입, 만든 객체의 타입) 쌍의 메시지를 처리하는 핸들러들의 인덱스.
+        타입 쌍마다 한번만 계산되며, :meth:`add_handler` 로 핸들러가 추가되면 다시 계산된다.
+        """
+        key = _route_key(message)
+        route = self._routes.get(key)
+
+        if route is None:
+            route = self._routes[key] = tuple(
+                    idx for idx, handler in enumerate(self._handlers) if handler.accepts(*key)
+            )
+
+        return route
+
+    def _next_handler(self, message: BaseMessage, after: int = -1) -> Optional[int]:
+        """
+        `after` 번째 핸들러 이후에 `message` 를 처리할 첫 핸들러의 인덱스. 없다면 ``None``.
+        """
+        route = self._route(message)
+        pos = bisect_right(route, after)
+
+        return route[pos] if pos < len(route) else None
+
+    async def _flush_handlers(self, context: Context) -> None:
+        """
+        :meth:`on_end` 에서 핸들러들의 :meth:`~benchmon.monitors.messages.handlers.base.BaseHandler.on_end` 를 호출하기 전에,
+        등록된 순서대로 각 핸들러의 :meth:`~benchmon.monitors.messages.handlers.base.BaseHandler.on_flush` 를 호출한다.
+        """
+        for handler in self._handlers:
+            await handler.on_flush(context)
+
     @abstractmethod
     async def on_init(self, context: Context) -> None:
         """
@@ -0,0 +1,112 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional, Sequence, Set, TYPE_CHECKING
+
+from .base import BasePipeline
+
+if TYPE_CHECKING:
+    from ..messages import BaseMessage
+    from ... import Context
+
+
+class BatchingPipeline(BasePipeline):
+    """
+    전달된 메시지를 모아서 한번에 핸들러들의
+    :meth:`~benchmon.monitors.messages.handlers.base.BaseHandler.on_batch` 로 전달하는 파이프라인.
+
+    메시지는 `max_batch` 개가 모이거나, batch의 첫 메시지가 들어온 후 `window` 밀리초가 지나면 전달된다.
+    :meth:`~benchmon.monitors.messages.handlers.base.BaseHandler.on_batch` 를 override 하지 않은 핸들러는
+    기본 구현을 통해 메시지마다 :meth:`~benchmon.monitors.messages.handlers.base.BaseHandler.on_message` 가 호출된다.
+
+    batch들은 하나씩 순서대로 처리되며, batch 안의 메시지 순서도 파이프라인에 전달된 순서와 같다.
+    """
+    __slots__ = ('_max_batch', '_window', '_batch', '_timer', '_timed_flushes', '_lock')
+
+    _max_batch: int
+    _window: float
+    _batch: List[BaseMessage]
+    _timer: Optional[asyncio.TimerHandle]
+    _timed_flushes: Set[asyncio.Task]
+    """ `window` 가 지나서 시작된 flush들. :meth:`on_end` 에서 기다린다. """
+    _lock: Optional[asyncio.Lock]
+
+    def __init__(self, max_batch: int = 64, window: int = 1000) -> None:
+        super().__init__()
+
+        if max_batch <= 0:
+            raise ValueError(f'max_batch must be positive, but {max_batch} is given')
+
+        self._max_batch = max_batch
+        self._window = window / 1000
+        self._batch = list()
+        self._timer = None
+        self._timed_flushes = set()
+        self._lock = None
+
+    async def on_init(self, context: Context) -> None:
+        self._lock = asyncio.Lock()
+
+        if len(self._handlers) != 0:
+            await asyncio.wait(tuple(handler.on_init(context) for handler in self._handlers))
+
+    async def on_message(self, context: Context, message: BaseMessage) -> None:
+        self._batch.append(message)
+
+        if len(self._batch) >= self._max_batch:
+            await self._flush(context)
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._window, self._start_timed_flush, context)
+
+    def _start_timed_flush(self, context: Context) -> None:
+        task = asyncio.create_task(self._flush(context))
+        self._timed_flushes.add(task)
+        task.add_done_callback(lambda done: self._on_timed_flush_done(context, done))
+
+    def _on_timed_flush_done(self, context: Context, task: asyncio.Task) -> None:
+        self._timed_flushes.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            context.logger.error(f'{self} failed to flush a batch: {task.exception()!r}')
+
+    async def _flush(self, context: Context) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if len(self._batch) == 0:
+            return
+
+        batch: Sequence[BaseMessage] = tuple(self._batch)
+        self._batch.clear()
+
+        async with self._lock:
+            for idx, handler in enumerate(self._handlers):
+                # the handler is skipped only when it would not accept any message of the batch,
+                # so that the order of the messages is kept as is
+                if not any(idx in self._route(message) for message in batch):
+                    continue
+
+                batch = await handler.on_batch(context, batch)
+
+                if len(batch) == 0:
+                    break
+
+    async def on_end(self, context: Context) -> None:
+        await self._flush(context)
+        await self._flush_handlers(context)
+        # messages that the handlers have sent while flushing
+        await self._flush(context)
+
+        # flushes that were started by the timer may be still running, since `_flush()` only cancels the timer
+        if len(self._timed_flushes) != 0:
+            await asyncio.wait(tuple(self._timed_flushes))
+
+        if len(self._handlers) != 0:
+            await asyncio.wait(tuple(handler.on_end(context) for handler in self._handlers))
+
+    async def on_destroy(self, context: Context) -> None:
+        if len(self._handlers) != 0:
+            await asyncio.wait(tuple(handler.on_destroy(context) for handler in self._handlers))
@@ -28,13 +28,19 @@ class DefaultPipeline(BasePipeline):
             await asyncio.wait(tuple(handler.on_init(context) for handler in self._handlers))
 
     async def on_message(self, context: Context, message: BaseMessage) -> None:
-        for handler in self._handlers:
-            message = await handler.on_message(context, message)
+        idx = self._next_handler(message)
+
+        while idx is not None:
+            message = await self._handlers[idx].on_message(context, message)
 
             if message is None:
                 break
 
+            idx = self._next_handler(message, idx)
+
     async def on_end(self, context: Context) -> None:
+        await self._flush_handlers(context)
+
         if len(self._handlers) is not 0:
             await asyncio.wait(tuple(handler.on_end(context) for handler in self._handlers))
 
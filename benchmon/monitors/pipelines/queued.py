@@ -0,0 +1,205 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+import asyncio
+import enum
+from dataclasses import dataclass
+from typing import List, Optional, TYPE_CHECKING, Tuple
+
+from .base import BasePipeline
+
+if TYPE_CHECKING:
+    from ..messages import BaseMessage
+    from ..messages.handlers import BaseHandler
+    from ... import Context
+
+
+class QueueFullPolicy(enum.Enum):
+    """ :class:`QueuedPipeline` 의 한 스테이지의 큐가 가득 찼을 때 새로 들어온 메시지의 처리 방법 """
+    BLOCK = 'block'
+    """ 큐에 자리가 날 때 까지 메시지를 넣는 쪽 (모니터 혹은 이전 스테이지) 을 기다리게 한다. """
+    DROP_OLDEST = 'drop_oldest'
+    """ 큐에서 가장 오래된 메시지를 버리고 새 메시지를 넣는다. """
+    DROP_NEWEST = 'drop_newest'
+    """ 새로 들어온 메시지를 버린다. """
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    """ :class:`QueuedPipeline` 의 한 스테이지 (핸들러) 의 상태 """
+    __slots__ = ('handler', 'depth', 'max_depth', 'processed', 'dropped', 'mean_latency', 'max_latency')
+
+    handler: BaseHandler
+    """ 이 스테이지의 핸들러 """
+    depth: int
+    """ 현재 큐에 쌓여있는 메시지의 수 """
+    max_depth: int
+    """ 큐에 쌓였던 메시지 수의 최대값 """
+    processed: int
+    """ 핸들러가 처리한 메시지의 수 """
+    dropped: int
+    """ :class:`QueueFullPolicy` 에 의해 버려진 메시지의 수 """
+    mean_latency: float
+    """ 메시지가 큐에 들어온 후 핸들러가 처리를 끝낼 때 까지 걸린 시간의 평균 (초) """
+    max_latency: float
+    """ 메시지가 큐에 들어온 후 핸들러가 처리를 끝낼 때 까지 걸린 시간의 최대값 (초) """
+
+
+class _Stage:
+    __slots__ = ('handler', 'queue', 'worker', 'max_depth', 'processed', 'dropped', 'total_latency', 'max_latency')
+
+    handler: BaseHandler
+    queue: asyncio.Queue
+    worker: Optional[asyncio.Task]
+    max_depth: int
+    processed: int
+    dropped: int
+    total_latency: float
+    max_latency: float
+
+    def __init__(self, handler: BaseHandler, max_size: int) -> None:
+        self.handler = handler
+        self.queue = asyncio.Queue(max_size)
+        self.worker = None
+        self.max_depth = 0
+        self.processed = 0
+        self.dropped = 0
+        self.total_latency = 0
+        self.max_latency = 0
+
+    def metrics(self) -> StageMetrics:
+        mean_latency = self.total_latency / self.processed if self.processed != 0 else 0
+        return StageMetrics(self.handler, self.queue.qsize(), self.max_depth, self.processed, self.dropped,
+                            mean_latency, self.max_latency)
+
+
+class QueuedPipeline(BasePipeline):
+    """
+    핸들러마다 크기가 제한된 큐와 worker를 가지는 스테이지를 만들어, 각 핸들러가 동시에 메시지를 처리하는 파이프라인.
+
+    :meth:`on_message` 는 첫 스테이지의 큐에 메시지를 넣기만 하기 때문에,
+    느린 핸들러가 있더라도 모니터의 모니터링 주기가 밀리지 않는다.
+    메시지는 그 메시지를 처리하지 않는 핸들러의 스테이지를 거치지 않고, 처리할 다음 스테이지의 큐로 바로 전달된다.
+    각 스테이지는 하나의 worker가 큐에 들어온 순서대로 처리하므로,
+    같은 모니터 (정확히는 같은 메시지 타입과 같은 모니터 타입) 로부터 온 메시지들의 순서는 파이프라인에 전달된 순서대로 유지된다.
+
+    큐가 가득 찼을 경우 :class:`QueueFullPolicy` 에 따라 처리하며, 각 스테이지의 상태는 :attr:`metrics` 로 확인할 수 있다.
+
+    .. note::
+
+        * 스테이지는 :meth:`on_init` 에서 만들어지기 때문에, 그 이후에 추가된 핸들러는 사용되지 않는다.
+    """
+    __slots__ = ('_max_size', '_full_policy', '_stages')
+
+    _max_size: int
+    _full_policy: QueueFullPolicy
+    _stages: List[_Stage]
+
+    def __init__(self, max_size: int = 128, full_policy: QueueFullPolicy = QueueFullPolicy.BLOCK) -> None:
+        super().__init__()
+
+        if max_size <= 0:
+            raise ValueError(f'max_size must be positive, but {max_size} is given')
+
+        self._max_size = max_size
+        self._full_policy = full_policy
+        self._stages = list()
+
+    async def on_init(self, context: Context) -> None:
+        if len(self._handlers) != 0:
+            await asyncio.wait(tuple(handler.on_init(context) for handler in self._handlers))
+
+        self._stages = [_Stage(handler, self._max_size) for handler in self._handlers]
+        for idx, stage in enumerate(self._stages):
+            stage.worker = asyncio.create_task(self._work(context, idx))
+
+    async def _enqueue(self, stage: _Stage, message: BaseMessage) -> None:
+        item = (message, asyncio.get_running_loop().time())
+
+        if stage.queue.full():
+            if self._full_policy is QueueFullPolicy.DROP_NEWEST:
+                stage.dropped += 1
+                return
+
+            elif self._full_policy is QueueFullPolicy.DROP_OLDEST:
+                stage.queue.get_nowait()
+                stage.queue.task_done()
+                stage.dropped += 1
+
+        await stage.queue.put(item)
+        stage.max_depth = max(stage.max_depth, stage.queue.qsize())
+
+    async def _work(self, context: Context, idx: int) -> None:
+        stage = self._stages[idx]
+        loop = asyncio.get_running_loop()
+
+        while True:
+            message, enqueued_at = await stage.queue.get()
+
+            try:
+                message = await stage.handler.on_message(context, message)
+
+                latency = loop.time() - enqueued_at
+                stage.processed += 1
+                stage.total_latency += latency
+                stage.max_latency = max(stage.max_latency, latency)
+
+                if message is not None:
+                    next_idx = self._next_handler(message, idx)
+
+                    if next_idx is not None and next_idx < len(self._stages):
+                        await self._enqueue(self._stages[next_idx], message)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                context.logger.exception(f'{stage.handler} failed to handle {message}: {e}')
+
+            finally:
+                stage.queue.task_done()
+
+    async def on_message(self, context: Context, message: BaseMessage) -> None:
+        idx = self._next_handler(message)
+
+        if idx is not None and idx < len(self._stages):
+            await self._enqueue(self._stages[idx], message)
+
+    async def _drain(self) -> None:
+        # stages are drained in order, because a stage only pushes to later ones before it marks its item done
+        for stage in self._stages:
+            await stage.queue.join()
+
+    async def on_end(self, context: Context) -> None:
+        await self._drain()
+
+        # the workers are still running, so that the messages sent while flushing are also handled
+        for handler in self._handlers:
+            await handler.on_flush(context)
+            await self._drain()
+
+        workers = tuple(stage.worker for stage in self._stages)
+        for worker in workers:
+            worker.cancel()
+        if len(workers) != 0:
+            await asyncio.wait(workers)
+
+        if len(self._handlers) != 0:
+            await asyncio.wait(tuple(handler.on_end(context) for handler in self._handlers))
+
+    async def on_destroy(self, context: Context) -> None:
+        if len(self._handlers) != 0:
+            await asyncio.wait(tuple(handler.on_destroy(context) for handler in self._handlers))
+
+        self._stages = list()
+
+    @property
+    def metrics(self) -> Tuple[StageMetrics, ...]:
+        """
+        각 스테이지의 현재 상태를 파이프라인에 등록된 핸들러 순서대로 반환한다.
+
+        :return: 각 스테이지의 현재 상태
+        :rtype: typing.Tuple[benchmon.monitors.pipelines.queued.StageMetrics, ...]
+        """
+        return tuple(stage.metrics() for stage in self._stages)
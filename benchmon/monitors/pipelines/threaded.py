@@ -0,0 +1,182 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional, TYPE_CHECKING, Tuple
+
+from .base import BasePipeline
+from .default import DefaultPipeline
+from .queued import QueueFullPolicy
+
+if TYPE_CHECKING:
+    from ..messages import BaseMessage
+    from ..messages.handlers import BaseHandler
+    from ... import Context
+
+
+class ThreadedPipeline(BasePipeline):
+    """
+    별도의 스레드에서 실행되는 전용 이벤트 루프 위에서 핸들러들을 실행하는 파이프라인.
+
+    실제 메시지 처리는 내부의 `pipeline` (기본값은 :class:`~benchmon.monitors.pipelines.default.DefaultPipeline`) 이 담당하며,
+    모니터의 이벤트 루프에서 :meth:`on_message` 로 전달된 메시지는 thread-safe하게 전용 이벤트 루프의 큐로 넘겨진 뒤
+    전달된 순서대로 처리된다.
+    따라서 연산량이 많은 핸들러가 있더라도 모니터들이 실행되는 이벤트 루프를 차지하지 않는다.
+    큐의 크기는 `max_size` 로 제한되며, 큐가 가득 찼을 경우
+    :class:`~benchmon.monitors.pipelines.queued.QueueFullPolicy` 에 따라 처리한다.
+    버려진 메시지의 수는 :attr:`dropped` 로 확인할 수 있다.
+
+    :meth:`on_init`, :meth:`on_end`, :meth:`on_destroy` 는 전용 이벤트 루프에서 내부 파이프라인의 같은 메소드를 실행하고,
+    그 실행이 끝날 때 까지 기다린다.
+    스레드는 :meth:`on_init` 에서 시작되어 :meth:`on_destroy` 에서 종료된다.
+
+    .. note::
+
+        * 핸들러들은 모니터와 다른 스레드에서 실행되기 때문에,
+          :func:`~benchmon.context.aio_context` 처럼 다른 이벤트 루프나 스레드와 공유하는 자원을 사용할 때 주의해야 한다.
+          :class:`~benchmon.context.Context` 의 검색 캐시는 lock으로 보호되므로 두 스레드에서 함께 사용할 수 있다.
+        * :attr:`QueueFullPolicy.BLOCK <benchmon.monitors.pipelines.queued.QueueFullPolicy.BLOCK>` 일 경우
+          메시지마다 전용 이벤트 루프에 자리가 날 때 까지 기다리므로, 다른 policy보다 :meth:`on_message` 의 비용이 크다.
+        * 핸들러가 전용 이벤트 루프에서 이 파이프라인으로 다시 보낸 메시지는 큐를 거치지 않고 바로 내부 파이프라인으로 전달되므로,
+          `max_size` 와 `full_policy` 의 영향을 받지 않는다.
+    """
+    __slots__ = ('_pipeline', '_max_size', '_full_policy', '_loop', '_thread', '_queue', '_worker', '_dropped')
+
+    _pipeline: BasePipeline
+    _max_size: int
+    _full_policy: QueueFullPolicy
+    _loop: Optional[asyncio.AbstractEventLoop]
+    _thread: Optional[threading.Thread]
+    _queue: Optional[asyncio.Queue]
+    _worker: Optional[asyncio.Task]
+    _dropped: int
+
+    def __init__(self, pipeline: BasePipeline = None, max_size: int = 1024,
+                 full_policy: QueueFullPolicy = QueueFullPolicy.BLOCK) -> None:
+        super().__init__()
+
+        if max_size <= 0:
+            raise ValueError(f'max_size must be positive, but {max_size} is given')
+
+        self._pipeline = DefaultPipeline() if pipeline is None else pipeline
+        self._max_size = max_size
+        self._full_policy = full_policy
+        self._loop = None
+        self._thread = None
+        self._queue = None
+        self._worker = None
+        self._dropped = 0
+
+    def add_handler(self, handler: BaseHandler) -> ThreadedPipeline:
+        self._pipeline.add_handler(handler)
+
+        return self
+
+    def _run_in_thread(self, coroutine: Awaitable[Any]) -> asyncio.Future:
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, self._loop))
+
+    async def on_init(self, context: Context) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=f'pipeline-{id(self):x}', daemon=True)
+        self._thread.start()
+
+        try:
+            await self._run_in_thread(self._start(context))
+        except BaseException:
+            await self._stop_thread()
+            raise
+
+    async def _start(self, context: Context) -> None:
+        await self._pipeline.on_init(context)
+
+        self._queue = asyncio.Queue(self._max_size)
+        self._dropped = 0
+        self._worker = asyncio.create_task(self._work(context))
+
+    async def _stop_thread(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+        self._loop.close()
+
+        self._loop = None
+        self._thread = None
+        self._queue = None
+        self._worker = None
+
+    async def _work(self, context: Context) -> None:
+        while True:
+            message = await self._queue.get()
+
+            try:
+                await self._pipeline.on_message(context, message)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                context.logger.exception(f'{self._pipeline} failed to handle {message}: {e}')
+
+            finally:
+                self._queue.task_done()
+
+    async def on_message(self, context: Context, message: BaseMessage) -> None:
+        # a handler that sends its results through this pipeline is already on the dedicated event loop,
+        # and waiting there for the queue that only the same loop consumes never ends
+        if threading.get_ident() == self._thread.ident:
+            await self._pipeline.on_message(context, message)
+        elif self._full_policy is QueueFullPolicy.BLOCK:
+            await self._run_in_thread(self._queue.put(message))
+        else:
+            self._loop.call_soon_threadsafe(self._enqueue_nowait, message)
+
+    def _enqueue_nowait(self, message: BaseMessage) -> None:
+        if self._queue.full():
+            self._dropped += 1
+
+            if self._full_policy is QueueFullPolicy.DROP_NEWEST:
+                return
+
+            self._queue.get_nowait()
+            self._queue.task_done()
+
+        self._queue.put_nowait(message)
+
+    async def on_end(self, context: Context) -> None:
+        await self._run_in_thread(self._stop(context))
+
+    async def _stop(self, context: Context) -> None:
+        await self._queue.join()
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        await self._pipeline.on_end(context)
+
+    async def on_destroy(self, context: Context) -> None:
+        await self._run_in_thread(self._pipeline.on_destroy(context))
+        await self._stop_thread()
+
+    @property
+    def handlers(self) -> Tuple[BaseHandler, ...]:
+        return self._pipeline.handlers
+
+    @property
+    def dropped(self) -> int:
+        """
+        :return: 마지막 :meth:`on_init` 이후로 큐가 가득 차서 버려진 메시지의 수
+        :rtype: int
+        """
+        return self._dropped
+
+    @property
+    def pipeline(self) -> BasePipeline:
+        """
+        :return: 전용 이벤트 루프에서 실제로 메시지를 처리하는 파이프라인
+        :rtype: benchmon.monitors.pipelines.base.BasePipeline
+        """
+        return self._pipeline
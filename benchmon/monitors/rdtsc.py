@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import Hashable, TYPE_CHECKING
 
 import rdtsc
 
 from .accumulative import AccumulativeMonitor
+from .interval import OverrunPolicy
 from .messages import SystemMessage
 
 if TYPE_CHECKING:
+    from .sampler import SystemSampler
     from .. import Context
 
 
@@ -19,8 +21,9 @@ class RDTSCMonitor(AccumulativeMonitor[SystemMessage, int]):
     _prev_data: int
     _is_stopped: bool
 
-    def __init__(self, interval: int) -> None:
-        super().__init__(interval)
+    def __init__(self, interval: int, overrun_policy: OverrunPolicy = OverrunPolicy.COALESCE,
+                 sampler: SystemSampler = None) -> None:
+        super().__init__(interval, overrun_policy, sampler)
 
         self._prev_data = rdtsc.get_cycles()
         self._is_stopped = False
@@ -34,11 +37,14 @@ class RDTSCMonitor(AccumulativeMonitor[SystemMessage, int]):
         return after - before
 
     async def create_message(self, context: Context, data: int) -> SystemMessage[int]:
-        return SystemMessage(data, self)
+        return SystemMessage(data, self, self._scheduled_time, self._actual_time)
 
     async def monitor_once(self, context: Context) -> int:
         return rdtsc.get_cycles()
 
+    def _sample_key(self, context: Context) -> Hashable:
+        return RDTSCMonitor
+
     @property
     def stopped(self) -> bool:
         return self._is_stopped
@@ -2,45 +2,72 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Mapping, TYPE_CHECKING, Tuple
+from array import array
+from typing import Hashable, Optional, TYPE_CHECKING, Tuple
 
 from .accumulative import AccumulativeMonitor
+from .interval import OverrunPolicy
 from .messages import MonitoredMessage, PerBenchMessage, SystemMessage
+from .messages.sample import Sample, SampleSchema
 from ..benchmark import BaseBenchmark
 from ..utils import ResCtrl
 
 if TYPE_CHECKING:
+    from .sampler import SystemSampler
     from .. import Context
 
-DAT_TYPE = Tuple[Mapping[str, int], ...]
+DAT_TYPE = Tuple[Sample, ...]
+
+# features that are not counters but gauges, so their values are not accumulated
+_GAUGE_FEATURES = ('llc_occupancy',)
 
 
 class ResCtrlMonitor(AccumulativeMonitor[MonitoredMessage, DAT_TYPE]):
-    __slots__ = ('_is_stopped', '_group')
+    __slots__ = ('_is_stopped', '_group', '_benchmark', '_schema', '_counters')
 
     _is_stopped: bool
     _group: ResCtrl
+    _benchmark: Optional[BaseBenchmark]
+    _schema: SampleSchema
+    _counters: Tuple[int, ...]
 
-    def __init__(self, interval: int) -> None:
-        super().__init__(interval)
+    def __init__(self, interval: int, overrun_policy: OverrunPolicy = OverrunPolicy.COALESCE,
+                 sampler: SystemSampler = None) -> None:
+        super().__init__(interval, overrun_policy, sampler)
 
         self._is_stopped = False
         self._group = ResCtrl()
+        self._benchmark = None
+        self._schema = SampleSchema(ResCtrl.FEATURES)
+        self._counters = tuple(
+                idx for idx, feature in enumerate(ResCtrl.FEATURES) if feature not in _GAUGE_FEATURES
+        )
 
     async def on_init(self, context: Context) -> None:
         await super().on_init(context)
 
-        benchmark = BaseBenchmark.of(context)
+        # noinspection PyProtectedMember
+        self._benchmark = context._find(BaseBenchmark)
 
-        if benchmark is not None:
-            self._group.group_name = benchmark.group_name
+        if self._benchmark is not None:
+            self._group.group_name = self._benchmark.group_name
 
         await self._group.prepare_to_read()
 
         self._prev_data = await self.monitor_once(context)
 
     async def monitor_once(self, context: Context) -> DAT_TYPE:
-        return await self._group.read()
+        values = await self._group.read_array()
+        num_features = len(self._schema)
+
+        # the slices are already `array('q')`, so they can be used as the values of the samples as is
+        return tuple(
+                Sample(self._schema, values[idx:idx + num_features])
+                for idx in range(0, len(values), num_features)
+        )
+
+    def _sample_key(self, context: Context) -> Hashable:
+        return ResCtrlMonitor, self._group.group_name
 
     @property
     def stopped(self) -> bool:
@@ -50,28 +77,32 @@ class ResCtrlMonitor(AccumulativeMonitor[MonitoredMessage, DAT_TYPE]):
         self._is_stopped = True
 
     def accumulate(self, before: DAT_TYPE, after: DAT_TYPE) -> DAT_TYPE:
-        result: List[Dict[str, int]] = list()
+        result = list()
 
-        for idx, d in enumerate(after):
-            merged: Dict[str, int] = dict()
+        for prev, curr in zip(before, after):
+            values = array(curr.array.typecode, curr.array)
+            prev_values = prev.array
 
-            for k, v in d.items():
-                # FIXME: hard coded
-                if k != 'llc_occupancy':
-                    v -= before[idx][k]
+            for idx in self._counters:
+                values[idx] -= prev_values[idx]
 
-                merged[k] = v
-            result.append(merged)
+            result.append(Sample(self._schema, values))
 
         return tuple(result)
 
-    async def create_message(self, context: Context, data: DAT_TYPE) -> MonitoredMessage[DAT_TYPE]:
-        benchmark = BaseBenchmark.of(context)
+    @property
+    def schema(self) -> SampleSchema:
+        """
+        :return: 각 소켓의 :class:`~benchmon.monitors.messages.sample.Sample` 이 공유하는 스키마
+        :rtype: benchmon.monitors.messages.sample.SampleSchema
+        """
+        return self._schema
 
-        if benchmark is None:
-            return SystemMessage(data, self)
+    async def create_message(self, context: Context, data: DAT_TYPE) -> MonitoredMessage[DAT_TYPE]:
+        if self._benchmark is None:
+            return SystemMessage(data, self, self._scheduled_time, self._actual_time)
         else:
-            return PerBenchMessage(data, self, benchmark)
+            return PerBenchMessage(data, self, self._benchmark, self._scheduled_time, self._actual_time)
 
     async def on_end(self, context: Context) -> None:
         try:
@@ -41,4 +41,4 @@ class RuntimeMonitor(BaseMonitor[PerBenchMessage, float]):
         pass
 
     async def create_message(self, context: Context, data: float) -> PerBenchMessage[float]:
-        return PerBenchMessage(data, self, BaseBenchmark.of(context))
+        return PerBenchMessage(data, self, BaseBenchmark.of(context), None, None)
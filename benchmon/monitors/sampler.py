@@ -0,0 +1,222 @@
+# coding: UTF-8
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Hashable, List, TYPE_CHECKING, Tuple
+
+from .interval import IntervalMonitor, OverrunPolicy
+from .messages import SystemMessage
+from .pipelines import BasePipeline, DefaultPipeline
+from .. import Context
+
+if TYPE_CHECKING:
+    from .messages.handlers import BaseHandler
+
+DAT_TYPE = Dict[Hashable, Any]
+
+# (the context of the monitor, the sample key of the monitor, the future that resolves when the monitor leaves)
+_REG_TYPE = Tuple[Context, Hashable, asyncio.Future]
+
+
+class SystemSampler(IntervalMonitor[SystemMessage, DAT_TYPE]):
+    """
+    여러 벤치마크의 :class:`~benchmon.monitors.interval.IntervalMonitor` 들을 하나의 타이머로 구동하는 시스템 레벨 모니터.
+
+    각 벤치마크의 모니터가 따로 타이머를 가지고 같은 값을 따로 읽는 대신,
+    생성시 `sampler` 로 이 객체가 주어진 모니터들은 :meth:`join` 을 통해 이 객체에 등록되며
+    매 tick마다 등록된 모든 모니터들의 값을 :meth:`~benchmon.monitors.interval.IntervalMonitor._sample_key` 별로 한번씩만 읽은 뒤,
+    각 모니터에게 나눠주어 해당 모니터가 속한 벤치마크의 파이프라인으로 전달되도록 한다.
+
+    또한 벤치마크와 무관한 시스템 레벨의 :class:`파이프라인 <benchmon.monitors.pipelines.base.BasePipeline>` 을 가지며,
+    :meth:`add_monitor` 로 추가된 시스템 레벨 모니터들의 메시지는 이 파이프라인으로 전달된다.
+
+    사용 예:
+
+    .. code-block:: python
+
+        sampler = SystemSampler(interval)
+
+        bench = await bench_cfg.generate_builder(privilege_config, logging.INFO)
+            .add_monitor(RDTSCMonitor(interval, sampler=sampler))
+            .add_monitor(ResCtrlMonitor(interval, sampler=sampler))
+            .finalize()
+
+        sampler_task = asyncio.create_task(sampler.run())
+        await bench.monitor()
+        await sampler.stop()
+        await sampler_task
+    """
+    __slots__ = ('_is_stopped', '_context', '_pipeline', '_system_monitors', '_registrations')
+
+    _is_stopped: bool
+    _context: Context
+    _pipeline: BasePipeline
+    _system_monitors: List[IntervalMonitor]
+    _registrations: Dict[IntervalMonitor, _REG_TYPE]
+
+    def __init__(self, interval: int, overrun_policy: OverrunPolicy = OverrunPolicy.COALESCE,
+                 pipeline: BasePipeline = None) -> None:
+        super().__init__(interval, overrun_policy)
+
+        self._is_stopped = False
+        self._pipeline = DefaultPipeline() if pipeline is None else pipeline
+        self._system_monitors = list()
+        self._registrations = dict()
+
+        self._context = Context()
+        # noinspection PyProtectedMember
+        self._context._assign(self._pipeline)
+        # noinspection PyProtectedMember
+        self._context._assign(logging.getLogger('benchmon'), logging.Logger)
+
+    def add_handler(self, handler: BaseHandler) -> SystemSampler:
+        """
+        시스템 레벨 파이프라인의 맨 끝에 `handler` 를 추가한다.
+
+        :param handler: 추가할 메시지 핸들러
+        :type handler: benchmon.monitors.messages.handlers.base.BaseHandler
+        :return: Method chaining을 위한 샘플러 객체 그대로 반환
+        :rtype: benchmon.monitors.sampler.SystemSampler
+        """
+        self._pipeline.add_handler(handler)
+
+        return self
+
+    def add_monitor(self, monitor: IntervalMonitor) -> SystemSampler:
+        """
+        시스템 레벨 모니터 `monitor` 를 추가한다.
+        `monitor` 는 이 샘플러를 `sampler` 로 가지고 생성되어야 하며, 시스템 레벨 :attr:`context` 로 모니터링 된다.
+
+        :param monitor: 추가할 시스템 레벨 모니터
+        :type monitor: benchmon.monitors.interval.IntervalMonitor
+        :return: Method chaining을 위한 샘플러 객체 그대로 반환
+        :rtype: benchmon.monitors.sampler.SystemSampler
+        """
+        if monitor.sampler is not self:
+            raise ValueError(f'{monitor} is not driven by this sampler')
+
+        self._system_monitors.append(monitor)
+
+        return self
+
+    async def join(self, monitor: IntervalMonitor, context: Context) -> None:
+        """
+        `monitor` 를 이 샘플러에 등록하고, `monitor` 가 멈추거나 샘플러가 멈출 때 까지 기다린다.
+        :meth:`~benchmon.monitors.interval.IntervalMonitor._monitor` 에서 호출된다.
+
+        :param monitor: 이 샘플러의 tick으로 구동될 모니터
+        :type monitor: benchmon.monitors.interval.IntervalMonitor
+        :param context: `monitor` 가 속한 벤치마크의 정보를 담고있는 객체
+        :type context: benchmon.context.Context
+        """
+        if self._is_stopped:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        # noinspection PyProtectedMember
+        self._registrations[monitor] = (context, monitor._sample_key(context), future)
+
+        try:
+            await future
+        finally:
+            self._registrations.pop(monitor, None)
+
+    async def run(self) -> None:
+        """
+        시스템 레벨 파이프라인과 모니터들을 초기화 한 후, :meth:`stop` 이 호출될 때 까지 샘플링을 진행한다.
+        """
+        await self._pipeline.on_init(self._context)
+        await self.on_init(self._context)
+
+        for monitor in self._system_monitors:
+            await monitor.on_init(self._context)
+
+        system_tasks = tuple(asyncio.create_task(mon.monitor(self._context)) for mon in self._system_monitors)
+
+        try:
+            await self.monitor(self._context)
+        finally:
+            self._is_stopped = True
+            self._release(tuple(self._registrations.keys()))
+
+            if len(system_tasks) != 0:
+                await asyncio.wait(system_tasks)
+
+            for monitor in self._system_monitors:
+                await monitor.on_end(self._context)
+                await monitor.on_destroy(self._context)
+
+            await self.on_end(self._context)
+            await self.on_destroy(self._context)
+
+            await self._pipeline.on_end(self._context)
+            await self._pipeline.on_destroy(self._context)
+
+    def _release(self, monitors: Tuple[IntervalMonitor, ...]) -> None:
+        for monitor in monitors:
+            _, _, future = self._registrations.pop(monitor)
+            if not future.done():
+                future.set_result(None)
+
+    async def monitor_once(self, context: Context) -> DAT_TYPE:
+        return await self._read(tuple(self._registrations.items()))
+
+    @staticmethod
+    async def _read(registrations: Tuple[Tuple[IntervalMonitor, _REG_TYPE], ...]) -> DAT_TYPE:
+        readers: Dict[Hashable, Tuple[IntervalMonitor, Context]] = dict()
+
+        for monitor, (mon_context, key, _) in registrations:
+            if key not in readers:
+                readers[key] = (monitor, mon_context)
+
+        values = await asyncio.gather(*(monitor.monitor_once(mon_context)
+                                        for monitor, mon_context in readers.values()))
+
+        return dict(zip(readers.keys(), values))
+
+    async def _on_tick(self, context: Context) -> None:
+        self._release(tuple(monitor for monitor in self._registrations.keys() if monitor.stopped))
+
+        if len(self._registrations) == 0:
+            return
+
+        # monitors that join while reading get their first sample on the next tick
+        registrations = tuple(self._registrations.items())
+        samples = await self._read(registrations)
+
+        # noinspection PyProtectedMember
+        for monitor, _ in registrations:
+            monitor._scheduled_time = self._scheduled_time
+            monitor._actual_time = self._actual_time
+
+        # noinspection PyProtectedMember
+        await asyncio.gather(*(monitor._on_sample(mon_context, samples[key])
+                               for monitor, (mon_context, key, _) in registrations))
+
+    async def create_message(self, context: Context, data: DAT_TYPE) -> SystemMessage[DAT_TYPE]:
+        return SystemMessage(data, self, self._scheduled_time, self._actual_time)
+
+    @property
+    def stopped(self) -> bool:
+        return self._is_stopped
+
+    async def stop(self) -> None:
+        self._is_stopped = True
+
+    @property
+    def context(self) -> Context:
+        """
+        :return: 시스템 레벨 파이프라인과 모니터들의 정보를 담고있는 객체
+        :rtype: benchmon.context.Context
+        """
+        return self._context
+
+    @property
+    def pipeline(self) -> BasePipeline:
+        """
+        :return: 시스템 레벨 파이프라인
+        :rtype: benchmon.monitors.pipelines.base.BasePipeline
+        """
+        return self._pipeline
@@ -0,0 +1,118 @@
+# coding: UTF-8
+
+"""
+:mod:`affinity` -- NUMA memory policy wrapper
+============================================================
+
+`numactl` 없이 `set_mempolicy(2)` 와 `get_mempolicy(2)` 를 ctypes로 직접 호출한다.
+
+memory policy는 스레드 단위로 설정되며, 그 스레드가 만든 자식 프로세스에게 상속되고 exec 이후에도 유지된다.
+따라서 잠깐 쓰고 버리는 스레드에서 :func:`set_mempolicy` 를 호출한 뒤 그 스레드에서 프로세스를 생성하면,
+event loop나 다른 스레드의 policy는 그대로 둔 채 생성된 프로세스와 그 자손들만 해당 policy를 사용한다.
+(:class:`~benchmon.benchmark.drivers.engines.affinity.AffinityEngine` 참고)
+
+.. module:: benchmon.utils.affinity
+    :synopsis: NUMA memory policy wrapper
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+from __future__ import annotations
+
+import ctypes
+import enum
+import os
+import platform
+from typing import Iterable, Optional, Tuple
+
+# (`__NR_set_mempolicy`, `__NR_get_mempolicy`) of each architecture
+_SYSCALL_NUMBERS = {
+    'x86_64': (238, 239),
+    'aarch64': (237, 236),
+    'ppc64le': (261, 260),
+}
+
+_ULONG_BITS = ctypes.sizeof(ctypes.c_ulong) * 8
+# `MAX_NUMNODES` of the kernel is at most 1024 (`CONFIG_NODES_SHIFT` = 10)
+_MAX_NODES = 1024
+
+_libc: Optional[ctypes.CDLL] = None
+
+
+class MemPolicy(enum.IntEnum):
+    """ `set_mempolicy(2)` 의 mode (``MPOL_*``) """
+    DEFAULT = 0
+    PREFERRED = 1
+    BIND = 2
+    INTERLEAVE = 3
+    LOCAL = 4
+
+    @classmethod
+    def from_str(cls, name: str) -> MemPolicy:
+        """
+        :param name: 대소문자를 구분하지 않는 policy 이름 (e.g. ``'interleave'``)
+        :type name: str
+        :return: `name` 의 policy
+        :rtype: benchmon.utils.affinity.MemPolicy
+        """
+        try:
+            return cls[name.upper()]
+        except KeyError:
+            raise ValueError(f'{name!r} is not a memory policy') from None
+
+
+def _syscall(index: int, *args) -> None:
+    global _libc
+
+    numbers = _SYSCALL_NUMBERS.get(platform.machine())
+    if numbers is None:
+        raise OSError(f'NUMA memory policy is not supported on {platform.machine()}')
+
+    if _libc is None:
+        _libc = ctypes.CDLL(None, use_errno=True)
+
+    if _libc.syscall(numbers[index], *args) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def _node_mask(nodes: Iterable[int]) -> ctypes.Array:
+    mask = (ctypes.c_ulong * (_MAX_NODES // _ULONG_BITS))()
+    for node in nodes:
+        mask[node // _ULONG_BITS] |= 1 << (node % _ULONG_BITS)
+    return mask
+
+
+def set_mempolicy(policy: MemPolicy, nodes: Iterable[int] = ()) -> None:
+    """
+    이 스레드의 NUMA memory policy를 설정한다.
+
+    :raises OSError: 시스템 콜이 실패하거나, 현재 아키텍처를 지원하지 않을 때
+
+    :param policy: 설정할 policy
+    :type policy: benchmon.utils.affinity.MemPolicy
+    :param nodes: policy가 사용할 NUMA 노드들. :attr:`MemPolicy.DEFAULT` 와 :attr:`MemPolicy.LOCAL` 은 비워야 한다.
+    :type nodes: typing.Iterable[int]
+    """
+    nodes = tuple(nodes)
+    mask = _node_mask(nodes) if len(nodes) != 0 else None
+    # like libnuma, pass one more than the number of bits since the kernel ignores the last one
+    _syscall(0, ctypes.c_int(policy), mask, ctypes.c_ulong(_MAX_NODES + 1))
+
+
+def get_mempolicy() -> Tuple[int, Tuple[int, ...]]:
+    """
+    :raises OSError: 시스템 콜이 실패하거나, 현재 아키텍처를 지원하지 않을 때
+
+    :return: 이 스레드의 memory policy의 mode (flag 포함) 와 NUMA 노드들
+    :rtype: typing.Tuple[int, typing.Tuple[int, ...]]
+    """
+    mode = ctypes.c_int()
+    mask = _node_mask(())
+    _syscall(1, ctypes.byref(mode), mask, ctypes.c_ulong(_MAX_NODES + 1), None, ctypes.c_ulong(0))
+
+    nodes = tuple(
+            idx * _ULONG_BITS + bit
+            for idx, word in enumerate(mask) if word != 0
+            for bit in range(_ULONG_BITS) if word & (1 << bit)
+    )
+    return mode.value, nodes
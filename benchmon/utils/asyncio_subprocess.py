@@ -1,8 +1,9 @@
 # coding: UTF-8
 
 import asyncio
-from subprocess import CalledProcessError
-from typing import Union
+import os
+from subprocess import CalledProcessError, Popen
+from typing import Optional, Union
 
 
 # noinspection PyShadowingBuiltins
@@ -31,3 +32,58 @@ async def check_run(program: str, *args, input: bytes = None, **kwargs) -> None:
 
     proc = await asyncio.create_subprocess_exec(program, *args, **kwargs)
     await proc.communicate(input)
+
+
+class PopenProcess:
+    """
+    asyncio 밖에서 생성된 :class:`subprocess.Popen` 을 :class:`asyncio.subprocess.Process` 처럼 기다릴 수 있도록 감싼다.
+    파이프 (`stdin`, `stdout`, `stderr`) 를 통한 통신은 지원하지 않는다.
+
+    커널이 지원한다면 pidfd로 프로세스의 종료를 기다리며, 그렇지 않다면 executor에서 기다린다.
+    """
+    __slots__ = ('_popen',)
+
+    _popen: Popen
+
+    def __init__(self, popen: Popen) -> None:
+        self._popen = popen
+
+    @property
+    def pid(self) -> int:
+        return self._popen.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._popen.returncode
+
+    async def wait(self) -> int:
+        if self._popen.returncode is not None:
+            return self._popen.returncode
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            pidfd = os.pidfd_open(self._popen.pid)
+        except (AttributeError, OSError):
+            # pidfd is not supported by the kernel
+            return await loop.run_in_executor(None, self._popen.wait)
+
+        exited = loop.create_future()
+        loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+
+        return self._popen.wait()
+
+    def send_signal(self, sig: int) -> None:
+        self._popen.send_signal(sig)
+
+    def terminate(self) -> None:
+        self._popen.terminate()
+
+    def kill(self) -> None:
+        self._popen.kill()
@@ -6,6 +6,8 @@
 
 `/sys/devices/system/cpu` 에 있는 DVFS에 관한 Linux API wrapper
 
+짧은 주기로 주파수를 여러번 바꾸는 경우에는 파일을 열어둔 채로 바뀐 값만 쓰는 :class:`CpuFreqController` 를 사용한다.
+
 .. todo::
     * per-core DVFS지원 check
 
@@ -14,8 +16,15 @@
 .. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
 """
 
+from __future__ import annotations
+
+import asyncio
 import os
-from typing import Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .sysfs import sys_path
 
 
 def set_max_freq(core_id: int, freq: int) -> None:
@@ -30,7 +39,7 @@ def set_max_freq(core_id: int, freq: int) -> None:
     :param freq: 바꿀 주파수 값
     :type freq: int
     """
-    with open(f'/sys/devices/system/cpu/cpu{core_id}/cpufreq/scaling_max_freq', 'w') as fp:
+    with open(sys_path(f'devices/system/cpu/cpu{core_id}/cpufreq/scaling_max_freq'), 'w') as fp:
         fp.write(f'{freq}\n')
 
 
@@ -48,7 +57,7 @@ async def set_max_freqs(core_ids: Iterable[int], freq: int) -> None:
     """
     encoded_freq = f'{freq}\n'.encode()
     for core_id in core_ids:
-        fd = os.open(f'/sys/devices/system/cpu/cpu{core_id}/cpufreq/scaling_max_freq', os.O_WRONLY)
+        fd = os.open(sys_path(f'devices/system/cpu/cpu{core_id}/cpufreq/scaling_max_freq'), os.O_WRONLY)
         os.write(fd, encoded_freq)
         os.close(fd)
 
@@ -62,7 +71,7 @@ def read_max_freq(core_id: int) -> int:
     :return: 코어의 최대 주파수
     :rtype: int
     """
-    with open(f'/sys/devices/system/cpu/cpu{core_id}/cpufreq/scaling_max_freq') as fp:
+    with open(sys_path(f'devices/system/cpu/cpu{core_id}/cpufreq/scaling_max_freq')) as fp:
         line: str = fp.readline()
         return int(line)
 
@@ -77,3 +86,217 @@ def read_max_freqs(core_ids: Iterable[int]) -> Tuple[int, ...]:
     :rtype: typing.Tuple[int, ...]
     """
     return tuple(read_max_freq(core_id) for core_id in core_ids)
+
+
+@dataclass(frozen=True)
+class CpuFreqSetting:
+    """ 한 코어의 cpufreq 설정 """
+    __slots__ = ('min_freq', 'max_freq', 'governor')
+
+    min_freq: int
+    """ `scaling_min_freq` (kHz) """
+    max_freq: int
+    """ `scaling_max_freq` (kHz) """
+    governor: str
+    """ `scaling_governor` """
+
+
+class CpuFreqController:
+    """
+    코어들의 `scaling_{min,max}_freq` 와 `scaling_governor` 를 열어둔 채로 관리한다.
+
+    * 마지막으로 쓴 값을 기억하여, 값이 바뀌는 코어의 파일에만 쓴다.
+    * 한번의 요청에 필요한 쓰기들은 이 객체의 전용 스레드에서 요청 순서대로 한번에 실행되므로, event loop를 막지 않는다.
+    * 생성될 때 각 코어의 설정을 읽어두고, :meth:`restore` 로 그 설정으로 정확히 되돌린다.
+
+    .. note::
+
+        * 관리하는 코어들의 설정을 다른 곳에서 바꾸지 않는다고 가정한다. 그렇지 않다면 기억하는 값과 실제 값이 달라
+          필요한 쓰기를 건너뛸 수 있다.
+        * 사용이 끝나면 :meth:`close` 를 호출하거나 :keyword:`with` 를 사용하여 열어둔 파일들을 닫아야 한다.
+    """
+    __slots__ = ('_fds', '_current', '_original', '_executor')
+
+    _fds: Dict[int, Tuple[int, int, int]]
+    _current: Dict[int, CpuFreqSetting]
+    _original: Dict[int, CpuFreqSetting]
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(self, core_ids: Iterable[int]) -> None:
+        """
+        :param core_ids: 관리할 CPU 코어 번호들
+        :type core_ids: typing.Iterable[int]
+        """
+        self._fds = dict()
+        self._executor = None
+        opened: List[int] = list()
+
+        try:
+            for core_id in core_ids:
+                for name in ('scaling_min_freq', 'scaling_max_freq', 'scaling_governor'):
+                    path = sys_path(f'devices/system/cpu/cpu{core_id}/cpufreq/{name}')
+                    opened.append(os.open(path, os.O_RDWR | os.O_CLOEXEC))
+
+                self._fds[core_id] = tuple(opened[-3:])
+        except BaseException:
+            for fd in opened:
+                os.close(fd)
+            self._fds = dict()
+            raise
+
+        self._original = {core_id: self._read(core_id) for core_id in self._fds}
+        self._current = dict(self._original)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cpufreq')
+
+    def __enter__(self) -> CpuFreqController:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _read(self, core_id: int) -> CpuFreqSetting:
+        # only the first token is used, since a shorter value may not overwrite the whole content of a regular file
+        min_fd, max_fd, governor_fd = self._fds[core_id]
+        return CpuFreqSetting(int(os.pread(min_fd, 64, 0).split()[0]),
+                              int(os.pread(max_fd, 64, 0).split()[0]),
+                              os.pread(governor_fd, 64, 0).split()[0].decode())
+
+    @property
+    def core_ids(self) -> Tuple[int, ...]:
+        return tuple(self._fds.keys())
+
+    @property
+    def original(self) -> Mapping[int, CpuFreqSetting]:
+        """
+        :return: 이 객체가 생성될 때의 코어별 설정
+        :rtype: typing.Mapping[int, benchmon.utils.dvfs.CpuFreqSetting]
+        """
+        return self._original
+
+    @property
+    def current(self) -> Mapping[int, CpuFreqSetting]:
+        """
+        :return: 마지막으로 요청된 코어별 설정
+        :rtype: typing.Mapping[int, benchmon.utils.dvfs.CpuFreqSetting]
+        """
+        return self._current
+
+    async def apply(self, settings: Mapping[int, CpuFreqSetting]) -> int:
+        """
+        코어들을 `settings` 로 설정한다. 이미 같은 값으로 설정된 항목은 쓰지 않는다.
+
+        :raises OSError: 쓰기에 실패했을 때. 실패한 요청의 코어들은 실제 값을 다시 읽어 기억한다.
+
+        :param settings: 코어별 설정
+        :type settings: typing.Mapping[int, benchmon.utils.dvfs.CpuFreqSetting]
+        :return: 실제로 쓴 파일의 수
+        :rtype: int
+        """
+        if self._executor is None:
+            raise ValueError('The controller is already closed.')
+
+        writes: List[Tuple[int, bytes]] = list()
+
+        for core_id, target in settings.items():
+            current = self._current[core_id]
+            if current == target:
+                continue
+
+            min_fd, max_fd, governor_fd = self._fds[core_id]
+
+            if current.governor != target.governor:
+                writes.append((governor_fd, f'{target.governor}\n'.encode()))
+
+            limits = list()
+            if current.min_freq != target.min_freq:
+                limits.append((min_fd, f'{target.min_freq}\n'.encode()))
+            if current.max_freq != target.max_freq:
+                limits.append((max_fd, f'{target.max_freq}\n'.encode()))
+
+            # older kernels reject a minimum above the current maximum, so raise the maximum first in that case
+            if target.min_freq > current.max_freq:
+                limits.reverse()
+
+            writes.extend(limits)
+            self._current[core_id] = target
+
+        if len(writes) == 0:
+            return 0
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, _write_all, writes)
+        except OSError:
+            for core_id in settings:
+                self._current[core_id] = await loop.run_in_executor(self._executor, self._read, core_id)
+            raise
+
+        return len(writes)
+
+    async def set_max_freqs(self, freqs: Mapping[int, int]) -> int:
+        """
+        코어별 최대 주파수를 설정한다.
+
+        :param freqs: 코어 번호 별 최대 주파수 (kHz)
+        :type freqs: typing.Mapping[int, int]
+        :return: 실제로 쓴 파일의 수
+        :rtype: int
+        """
+        return await self.apply({
+            core_id: CpuFreqSetting(self._current[core_id].min_freq, freq, self._current[core_id].governor)
+            for core_id, freq in freqs.items()
+        })
+
+    async def set_max_freq(self, core_ids: Iterable[int], freq: int) -> int:
+        """
+        `core_ids` 번 코어들의 최대 주파수를 모두 `freq` 로 설정한다.
+
+        :param core_ids: 주파수를 바꿀 CPU 코어 번호들
+        :type core_ids: typing.Iterable[int]
+        :param freq: 바꿀 주파수 값 (kHz)
+        :type freq: int
+        :return: 실제로 쓴 파일의 수
+        :rtype: int
+        """
+        return await self.set_max_freqs(dict.fromkeys(core_ids, freq))
+
+    async def set_governor(self, core_ids: Iterable[int], governor: str) -> int:
+        """
+        `core_ids` 번 코어들의 governor를 `governor` 로 설정한다.
+
+        :param core_ids: governor를 바꿀 CPU 코어 번호들
+        :type core_ids: typing.Iterable[int]
+        :param governor: 바꿀 governor (e.g. ``'performance'``)
+        :type governor: str
+        :return: 실제로 쓴 파일의 수
+        :rtype: int
+        """
+        return await self.apply({
+            core_id: CpuFreqSetting(self._current[core_id].min_freq, self._current[core_id].max_freq, governor)
+            for core_id in core_ids
+        })
+
+    async def restore(self) -> int:
+        """
+        모든 코어를 이 객체가 생성될 때의 설정으로 되돌린다.
+
+        :return: 실제로 쓴 파일의 수
+        :rtype: int
+        """
+        return await self.apply(self._original)
+
+    def close(self) -> None:
+        """ 열어둔 파일들을 닫는다. 설정을 되돌리지는 않는다. """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+        for fds in self._fds.values():
+            for fd in fds:
+                os.close(fd)
+        self._fds = dict()
+
+
+def _write_all(writes: Iterable[Tuple[int, bytes]]) -> None:
+    for fd, content in writes:
+        os.pwrite(fd, content, 0)
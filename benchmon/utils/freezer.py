@@ -0,0 +1,188 @@
+# coding: UTF-8
+
+"""
+:mod:`freezer` -- cgroup freezer wrapper
+============================================================
+
+cgroup에 속한 모든 프로세스와 스레드를 한번에 멈추거나 다시 실행시킨다.
+
+* cgroup v2: `cgroup.freeze` 에 쓰고, `cgroup.events` 의 `frozen` 값이 바뀌는 것을 ``EPOLLPRI`` 로 기다린다.
+* cgroup v1: `freezer` 서브 시스템의 `freezer.state` 에 쓰고, 상태가 바뀔 때 까지 짧은 주기로 확인한다.
+
+.. module:: benchmon.utils.freezer
+    :synopsis: cgroup freezer wrapper
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import select
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .sysfs import sys_path
+
+# fallback timeout (seconds) in case that the kernel does not notify the change of `cgroup.events`
+_EVENTS_TIMEOUT = 0.1
+
+_MIN_POLL_INTERVAL = 0.001
+_MAX_POLL_INTERVAL = 0.016
+
+
+def is_unified() -> bool:
+    """
+    :return: cgroup v2 (unified hierarchy) 가 `/sys/fs/cgroup` 에 mount 되어있다면 ``True``
+    :rtype: bool
+    """
+    return sys_path('fs/cgroup/cgroup.controllers').exists()
+
+
+class CGroupFreezer:
+    """
+    하나의 cgroup에 대한 freezer.
+    :meth:`freeze` 와 :meth:`thaw` 는 요청만 하고 바로 반환되며, 실제로 상태가 바뀔 때 까지 기다리려면 :meth:`wait` 를 사용한다.
+    """
+    __slots__ = ('_group_path', '_unified')
+
+    _group_path: Path
+    _unified: bool
+
+    def __init__(self, group_path: Path, unified: bool) -> None:
+        self._group_path = group_path
+        self._unified = unified
+
+    @classmethod
+    def of_group(cls, group_name: str, controllers: Iterable[str]) -> Optional[CGroupFreezer]:
+        """
+        `group_name` cgroup의 freezer를 만든다.
+
+        :param group_name: cgroup의 이름 (cgroup 파일 시스템의 root로부터의 경로)
+        :type group_name: str
+        :param controllers: 그룹이 사용하는 서브 시스템들. cgroup v1에서는 `freezer` 가 포함되어야 한다.
+        :type controllers: typing.Iterable[str]
+        :return: freezer를 사용할 수 없다면 ``None``
+        :rtype: typing.Optional[benchmon.utils.freezer.CGroupFreezer]
+        """
+        group_name = group_name.strip('/')
+
+        if is_unified():
+            group_path = sys_path('fs/cgroup', group_name)
+            if (group_path / 'cgroup.freeze').exists():
+                return cls(group_path, True)
+
+        elif 'freezer' in controllers:
+            group_path = sys_path('fs/cgroup/freezer', group_name)
+            if (group_path / 'freezer.state').exists():
+                return cls(group_path, False)
+
+        return None
+
+    def freeze(self) -> None:
+        """그룹에 속한 모든 태스크를 멈추도록 요청한다."""
+        if self._unified:
+            (self._group_path / 'cgroup.freeze').write_text('1')
+        else:
+            (self._group_path / 'freezer.state').write_text('FROZEN')
+
+    def thaw(self) -> None:
+        """그룹에 속한 모든 태스크를 다시 실행하도록 요청한다."""
+        if self._unified:
+            (self._group_path / 'cgroup.freeze').write_text('0')
+        else:
+            (self._group_path / 'freezer.state').write_text('THAWED')
+
+    def prepare_thaw(self, stack: contextlib.ExitStack) -> Callable[[], None]:
+        """
+        :meth:`thaw` 에 필요한 파일을 미리 열어두고, 호출하면 쓰기 한번으로 그룹을 다시 실행시키는 함수를 반환한다.
+        열어둔 파일은 `stack` 이 닫힐 때 닫힌다.
+
+        :param stack: 열어둔 파일의 수명을 관리하는 객체
+        :type stack: contextlib.ExitStack
+        :return: 그룹에 속한 모든 태스크를 다시 실행하도록 요청하는 함수
+        :rtype: typing.Callable[[], None]
+        """
+        if self._unified:
+            path, content = self._group_path / 'cgroup.freeze', b'0'
+        else:
+            path, content = self._group_path / 'freezer.state', b'THAWED'
+
+        fd = os.open(path, os.O_WRONLY | os.O_CLOEXEC)
+        stack.callback(os.close, fd)
+
+        def thaw() -> None:
+            os.write(fd, content)
+
+        return thaw
+
+    def is_frozen(self) -> bool:
+        """
+        :return: 그룹에 속한 모든 태스크가 멈췄다면 ``True``
+        :rtype: bool
+        """
+        if self._unified:
+            return _frozen_of_events((self._group_path / 'cgroup.events').read_bytes())
+        else:
+            return (self._group_path / 'freezer.state').read_text().strip() == 'FROZEN'
+
+    async def wait(self, frozen: bool = True) -> None:
+        """
+        그룹의 상태가 `frozen` 이 될 때 까지 기다린다.
+
+        :param frozen: ``True`` 일 경우 멈출 때 까지, ``False`` 일 경우 다시 실행될 때 까지 기다린다.
+        :type frozen: bool
+        """
+        if self._unified:
+            await self._wait_events(frozen)
+        else:
+            interval = _MIN_POLL_INTERVAL
+
+            while self.is_frozen() != frozen:
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, _MAX_POLL_INTERVAL)
+
+    async def _wait_events(self, frozen: bool) -> None:
+        loop = asyncio.get_running_loop()
+        fd = os.open(self._group_path / 'cgroup.events', os.O_RDONLY | os.O_CLOEXEC)
+        # kernfs reports the modification of the file as `EPOLLPRI`, which can not be waited by the event loop directly
+        epoll = select.epoll()
+
+        try:
+            try:
+                epoll.register(fd, select.EPOLLPRI)
+            except OSError:
+                # not a kernfs file (e.g. a simulated tree), so just poll with the fallback timeout
+                epoll.close()
+                epoll = None
+
+            # reading the file also resets the notification
+            while _frozen_of_events(os.pread(fd, 4096, 0)) != frozen:
+                if epoll is None:
+                    await asyncio.sleep(_EVENTS_TIMEOUT)
+                    continue
+
+                notified = loop.create_future()
+                loop.add_reader(epoll.fileno(), lambda: notified.done() or notified.set_result(None))
+
+                try:
+                    await asyncio.wait_for(notified, _EVENTS_TIMEOUT)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    loop.remove_reader(epoll.fileno())
+
+        finally:
+            if epoll is not None:
+                epoll.close()
+            os.close(fd)
+
+
+def _frozen_of_events(content: bytes) -> bool:
+    for line in content.splitlines():
+        key, _, value = line.partition(b' ')
+        if key == b'frozen':
+            return value.strip() == b'1'
+
+    return False
@@ -19,6 +19,7 @@ import os
 from typing import Set
 
 from .ranges import Ranges
+from .sysfs import sys_path
 
 
 @contextlib.contextmanager
@@ -34,7 +35,7 @@ def hyper_threading_guard(ht_flag: bool) -> None:
     """
 
     if not ht_flag:
-        with open('/sys/devices/system/cpu/online') as fp:
+        with sys_path('devices/system/cpu/online').open() as fp:
             raw_input: str = fp.readline()
 
         online_cores: Ranges = Ranges.from_str(raw_input)
@@ -44,12 +45,12 @@ def hyper_threading_guard(ht_flag: bool) -> None:
         logical_cores: Set[int] = set()
 
         for core_id in online_cores:
-            with open(f'/sys/devices/system/cpu/cpu{core_id}/topology/thread_siblings_list') as fp:
+            with sys_path(f'devices/system/cpu/cpu{core_id}/topology/thread_siblings_list').open() as fp:
                 line: str = fp.readline()
                 logical_cores.update(map(int, line.strip().split(',')[1:]))
 
         for core_id in logical_cores:
-            fd = os.open(f'/sys/devices/system/cpu/cpu{core_id}/online', os.O_WRONLY)
+            fd = os.open(sys_path(f'devices/system/cpu/cpu{core_id}/online'), os.O_WRONLY)
             os.write(fd, b'0')
             os.close(fd)
 
@@ -58,7 +59,7 @@ def hyper_threading_guard(ht_flag: bool) -> None:
         print('restoring Hyper-Threading...')
 
         for core_id in logical_cores:
-            fd = os.open(f'/sys/devices/system/cpu/cpu{core_id}/online', os.O_WRONLY)
+            fd = os.open(sys_path(f'devices/system/cpu/cpu{core_id}/online'), os.O_WRONLY)
             os.write(fd, b'1')
             os.close(fd)
 
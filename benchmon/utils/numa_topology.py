@@ -6,6 +6,9 @@
 
 `/sys/devices/system/node` 에서 제공하는 정보들을 가공한다
 
+모든 정보는 처음 사용될 때 :func:`~benchmon.utils.topology.hardware_topology` 로부터 읽어오기 때문에,
+이 모듈을 import 하는 것 만으로는 `/sys` 를 읽지 않는다.
+
 .. note::
     완벽하게 정리된 구현이 아니므로 사용에 주의가 필요하다
 
@@ -14,69 +17,53 @@
 .. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>, Yoonsung Nam <ysnam@dcslab.snu.ac.kr>
 """
 
-from pathlib import Path
-from typing import Dict, Mapping, Set
+from typing import Callable, FrozenSet, Iterator, Mapping, Set, TypeVar
 
-from .ranges import Ranges
+from .topology import HardwareTopology, hardware_topology
 
-_BASE_PATH: Path = Path('/sys/devices/system/node')
+_KT = TypeVar('_KT')
+_VT = TypeVar('_VT')
 
 
 def get_mem_topo() -> Set[int]:
-    has_memory_path = _BASE_PATH / 'has_memory'
-
-    with has_memory_path.open() as fp:
-        line: str = fp.readline()
-        mem_topo = Ranges.from_str(line)
-
-        # TODO: get_mem_topo can be enhanced by using real numa memory access latency
-
-    return mem_topo.to_set()
+    # TODO: get_mem_topo can be enhanced by using real numa memory access latency
+    return set(hardware_topology().mem_sockets)
 
 
 def cur_online_sockets() -> Set[int]:
-    online_path: Path = _BASE_PATH / 'online'
-
-    with online_path.open() as fp:
-        line: str = fp.readline()
-        sockets = Ranges.from_str(line)
-
-    return sockets.to_set()
+    return set(hardware_topology().online_sockets)
 
 
 def possible_sockets() -> Set[int]:
-    possible_path: Path = _BASE_PATH / 'possible'
-
-    with possible_path.open() as fp:
-        line: str = fp.readline()
-        sockets = Ranges.from_str(line)
-
-    return sockets.to_set()
+    return set(hardware_topology().possible_sockets)
 
 
 def core_belongs_to(socket_id: int) -> Set[int]:
-    cpulist_path: Path = _BASE_PATH / f'node{socket_id}/cpulist'
+    return set(hardware_topology().socket_cores[socket_id])
+
 
-    with cpulist_path.open() as fp:
-        line: str = fp.readline()
-        return Ranges.from_str(line).to_set()
+class _TopologyMapping(Mapping[_KT, _VT]):
+    __slots__ = ('_getter',)
 
+    _getter: Callable[[HardwareTopology], Mapping[_KT, _VT]]
 
-def _socket_to_core() -> Dict[int, Set[int]]:
-    sockets = cur_online_sockets()
-    return dict((socket_id, core_belongs_to(socket_id)) for socket_id in sockets)
+    def __init__(self, getter: Callable[[HardwareTopology], Mapping[_KT, _VT]]) -> None:
+        self._getter = getter
 
+    def __getitem__(self, key: _KT) -> _VT:
+        return self._getter(hardware_topology())[key]
 
-def _core_to_socket() -> Dict[int, int]:
-    ret_dict: Dict[int, int] = dict()
-    sockets = cur_online_sockets()
+    def __iter__(self) -> Iterator[_KT]:
+        return iter(self._getter(hardware_topology()))
 
-    for socket_id in sockets:
-        for core_id in core_belongs_to(socket_id):
-            ret_dict[core_id] = socket_id
+    def __len__(self) -> int:
+        return len(self._getter(hardware_topology()))
 
-    return ret_dict
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
-socket_to_core: Mapping[int, Set[int]] = _socket_to_core()  # key: socket id, value: corresponding core ids
-core_to_socket: Mapping[int, int] = _core_to_socket()  # key: core id, value: corresponding socket id
+# key: socket id, value: corresponding core ids
+socket_to_core: Mapping[int, FrozenSet[int]] = _TopologyMapping(lambda topology: topology.socket_cores)
+# key: core id, value: corresponding socket id
+core_to_socket: Mapping[int, int] = _TopologyMapping(lambda topology: topology.core_socket)
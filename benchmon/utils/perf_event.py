@@ -0,0 +1,313 @@
+# coding: UTF-8
+
+"""
+:mod:`perf_event` -- Linux의 `perf_event_open` API wrapper
+============================================================
+
+`perf` 프로세스를 실행해 그 출력을 파싱하는 대신, :mod:`ctypes` 로 `perf_event_open(2)` 을 직접 호출하여
+한 프로세스의 이벤트들을 하나의 group으로 열고 `PERF_FORMAT_GROUP` 으로 모든 카운터를 ``read()`` 한번에 읽는다.
+
+지원하는 이벤트 표기법:
+
+* `perf list` 의 generic hardware, software 이벤트 (e.g. `instructions`, `cycles`, `task-clock`, `page-faults`)
+* raw 이벤트 (e.g. `r1b2`)
+* `/sys/bus/event_source/devices` 에 등록된 PMU 표기 (e.g. `cpu/event=0xb1,umask=0x01,cmask=1,inv=1/`,
+  `intel_cqm/llc_occupancy/`)
+
+.. note::
+    * `l2_rqsts.miss` 처럼 `perf` 가 내부 JSON 테이블로 해석하는 이름은 지원하지 않기 때문에, raw 혹은 PMU 표기로 바꿔야한다.
+    * 카운팅 모드로만 사용하기 때문에 mmap ring buffer는 사용하지 않는다.
+
+.. module:: benchmon.utils.perf_event
+    :synopsis: Linux의 perf_event_open API wrapper
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+import ctypes
+import fcntl
+import os
+import platform
+import re
+import struct
+from pathlib import Path
+from typing import ClassVar, Dict, Iterable, List, Mapping, Optional, Pattern, Tuple
+
+from .sysfs import sys_path
+
+_SYSCALL_NUMBERS: Mapping[str, int] = {
+    'x86_64': 298,
+    'i386': 336,
+    'i686': 336,
+    'aarch64': 241,
+    'armv7l': 364,
+    'ppc64le': 319,
+}
+
+PERF_TYPE_HARDWARE = 0
+PERF_TYPE_SOFTWARE = 1
+PERF_TYPE_RAW = 4
+
+PERF_FORMAT_TOTAL_TIME_ENABLED = 1 << 0
+PERF_FORMAT_TOTAL_TIME_RUNNING = 1 << 1
+PERF_FORMAT_GROUP = 1 << 3
+
+_FLAG_DISABLED = 1 << 0
+_FLAG_INHERIT = 1 << 1
+_FLAG_EXCLUDE_HV = 1 << 6
+
+PERF_EVENT_IOC_ENABLE = 0x2400
+PERF_EVENT_IOC_DISABLE = 0x2401
+PERF_IOC_FLAG_GROUP = 1
+
+HARDWARE_EVENTS: Mapping[str, int] = {
+    'cpu-cycles': 0,
+    'cycles': 0,
+    'instructions': 1,
+    'cache-references': 2,
+    'cache-misses': 3,
+    'branch-instructions': 4,
+    'branches': 4,
+    'branch-misses': 5,
+    'bus-cycles': 6,
+    'stalled-cycles-frontend': 7,
+    'stalled-cycles-backend': 8,
+    'ref-cycles': 9,
+}
+
+SOFTWARE_EVENTS: Mapping[str, int] = {
+    'cpu-clock': 0,
+    'task-clock': 1,
+    'page-faults': 2,
+    'faults': 2,
+    'context-switches': 3,
+    'cs': 3,
+    'cpu-migrations': 4,
+    'migrations': 4,
+    'minor-faults': 5,
+    'major-faults': 6,
+    'alignment-faults': 7,
+    'emulation-faults': 8,
+}
+
+CLOCK_EVENTS: Tuple[str, ...] = ('cpu-clock', 'task-clock')
+""" 값이 nanosecond 단위인 software 이벤트. `perf stat` 과 같이 msec 단위로 변환하여 사용한다. """
+
+
+class _PerfEventAttr(ctypes.Structure):
+    """ `struct perf_event_attr` (`PERF_ATTR_SIZE_VER5`) """
+    _fields_ = (
+        ('type', ctypes.c_uint32),
+        ('size', ctypes.c_uint32),
+        ('config', ctypes.c_uint64),
+        ('sample_period', ctypes.c_uint64),
+        ('sample_type', ctypes.c_uint64),
+        ('read_format', ctypes.c_uint64),
+        ('flags', ctypes.c_uint64),
+        ('wakeup_events', ctypes.c_uint32),
+        ('bp_type', ctypes.c_uint32),
+        ('config1', ctypes.c_uint64),
+        ('config2', ctypes.c_uint64),
+        ('branch_sample_type', ctypes.c_uint64),
+        ('sample_regs_user', ctypes.c_uint64),
+        ('sample_stack_user', ctypes.c_uint32),
+        ('clockid', ctypes.c_int32),
+        ('sample_regs_intr', ctypes.c_uint64),
+        ('aux_watermark', ctypes.c_uint32),
+        ('sample_max_stack', ctypes.c_uint16),
+        ('_reserved_2', ctypes.c_uint16),
+    )
+
+
+_libc = ctypes.CDLL(None, use_errno=True)
+_libc.syscall.restype = ctypes.c_long
+
+
+def _perf_event_open(attr: _PerfEventAttr, pid: int, cpu: int, group_fd: int, flags: int) -> int:
+    machine = platform.machine()
+    if machine not in _SYSCALL_NUMBERS:
+        raise NotImplementedError(f'perf_event_open is not supported on {machine}')
+
+    fd = _libc.syscall(_SYSCALL_NUMBERS[machine], ctypes.byref(attr),
+                       ctypes.c_int(pid), ctypes.c_int(cpu), ctypes.c_int(group_fd), ctypes.c_ulong(flags))
+    if fd < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f'perf_event_open failed: {os.strerror(errno)}')
+
+    return fd
+
+
+class EventParser:
+    """
+    `perf` 의 이벤트 표기법을 `perf_event_attr` 의 (`type`, `config`, `config1`, `config2`) 로 변환한다.
+    """
+    _RAW_PATTERN: ClassVar[Pattern[str]] = re.compile(r'^r([0-9a-fA-F]+)$')
+    _PMU_PATTERN: ClassVar[Pattern[str]] = re.compile(r'^([\w.\-]+)/(.*)/$')
+    _FORMAT_PATTERN: ClassVar[Pattern[str]] = re.compile(r'^(config[12]?):(.+)$')
+
+    @classmethod
+    def parse(cls, event: str) -> Tuple[int, int, int, int]:
+        """
+        :raises ValueError: 지원하지 않는 이벤트 표기법일 때
+
+        :param event: `perf` 의 이벤트 표기
+        :type event: str
+        :return: (`type`, `config`, `config1`, `config2`)
+        :rtype: typing.Tuple[int, int, int, int]
+        """
+        if event in HARDWARE_EVENTS:
+            return PERF_TYPE_HARDWARE, HARDWARE_EVENTS[event], 0, 0
+        elif event in SOFTWARE_EVENTS:
+            return PERF_TYPE_SOFTWARE, SOFTWARE_EVENTS[event], 0, 0
+
+        matched = cls._RAW_PATTERN.match(event)
+        if matched is not None:
+            return PERF_TYPE_RAW, int(matched.group(1), 16), 0, 0
+
+        matched = cls._PMU_PATTERN.match(event)
+        if matched is not None:
+            return cls._parse_pmu(matched.group(1), matched.group(2))
+
+        raise ValueError(f'`{event}` is not supported by the perf_event backend. Use raw or PMU notation instead.')
+
+    @classmethod
+    def _parse_pmu(cls, pmu: str, terms: str) -> Tuple[int, int, int, int]:
+        pmu_path = sys_path('bus/event_source/devices', pmu)
+        if not pmu_path.is_dir():
+            raise ValueError(f'PMU `{pmu}` does not exist.')
+
+        pmu_type = int((pmu_path / 'type').read_text())
+        configs: Dict[str, int] = dict(config=0, config1=0, config2=0)
+
+        for name, value in cls._expand_terms(pmu_path, terms):
+            format_file = pmu_path / 'format' / name
+            if not format_file.is_file():
+                raise ValueError(f'`{name}` is not a valid format of PMU `{pmu}`.')
+
+            matched = cls._FORMAT_PATTERN.match(format_file.read_text().strip())
+            target, bit_ranges = matched.groups()
+
+            for bit_range in bit_ranges.split(','):
+                bounds = tuple(map(int, bit_range.split('-')))
+                low, high = bounds[0], bounds[-1]
+                width = high - low + 1
+                configs[target] |= (value & ((1 << width) - 1)) << low
+                value >>= width
+
+        return pmu_type, configs['config'], configs['config1'], configs['config2']
+
+    @classmethod
+    def _expand_terms(cls, pmu_path: Path, terms: str) -> Iterable[Tuple[str, int]]:
+        for term in filter(None, terms.split(',')):
+            if '=' in term:
+                name, value = term.split('=', 1)
+                yield name, int(value, 0)
+            elif (pmu_path / 'events' / term).is_file():
+                yield from cls._expand_terms(pmu_path, (pmu_path / 'events' / term).read_text().strip())
+            else:
+                yield term, 1
+
+
+class PerfEventGroup:
+    """
+    한 thread (`inherit` 에 따라 그 thread가 이후에 생성하는 thread들 포함) 에 대한 이벤트들을 하나의 group으로 묶어서 연다.
+
+    group leader에 ``read()`` 를 한번 호출하는 것으로 모든 카운터와 `time_enabled`, `time_running` 을 읽는다.
+
+    .. note::
+        * 하드웨어 카운터 수보다 많은 이벤트를 하나의 group으로 묶으면 group 전체가 스케쥴링 되지 못한다.
+          이 경우 :meth:`read` 의 `time_running` 이 계속 0으로 반환된다.
+    """
+    __slots__ = ('_fds', '_buffer', '_struct')
+
+    _fds: List[int]
+    _buffer: bytearray
+    _struct: struct.Struct
+
+    def __init__(self, events: Iterable[str], pid: int, inherit: bool = True) -> None:
+        """
+        :param events: 모니터링 할 `perf` 의 이벤트 표기들. 첫번째 이벤트가 group leader가 된다.
+        :type events: typing.Iterable[str]
+        :param pid: 모니터링 할 thread의 TID
+        :type pid: int
+        :param inherit: ``True`` 일 경우 `pid` 가 이후에 생성하는 thread와 프로세스도 함께 카운팅 한다.
+        :type inherit: bool
+        """
+        self._fds = list()
+
+        try:
+            for event in events:
+                self._open_event(EventParser.parse(event), pid, inherit)
+        except Exception:
+            self.close()
+            raise
+
+        # u64 nr, u64 time_enabled, u64 time_running, u64 value[nr]
+        self._struct = struct.Struct(f'={3 + len(self._fds)}Q')
+        self._buffer = bytearray(self._struct.size)
+
+    def _open_event(self, parsed: Tuple[int, int, int, int], pid: int, inherit: bool) -> None:
+        attr = _PerfEventAttr()
+        attr.type, attr.config, attr.config1, attr.config2 = parsed
+        attr.size = ctypes.sizeof(_PerfEventAttr)
+        attr.read_format = PERF_FORMAT_GROUP | PERF_FORMAT_TOTAL_TIME_ENABLED | PERF_FORMAT_TOTAL_TIME_RUNNING
+        attr.flags = _FLAG_EXCLUDE_HV
+
+        if inherit:
+            attr.flags |= _FLAG_INHERIT
+
+        if len(self._fds) == 0:
+            attr.flags |= _FLAG_DISABLED
+            group_fd = -1
+        else:
+            group_fd = self._fds[0]
+
+        self._fds.append(_perf_event_open(attr, pid, -1, group_fd, 0))
+
+    def enable(self) -> None:
+        """ group의 모든 카운터를 동시에 시작한다. """
+        fcntl.ioctl(self._fds[0], PERF_EVENT_IOC_ENABLE, PERF_IOC_FLAG_GROUP)
+
+    def disable(self) -> None:
+        """ group의 모든 카운터를 동시에 멈춘다. """
+        fcntl.ioctl(self._fds[0], PERF_EVENT_IOC_DISABLE, PERF_IOC_FLAG_GROUP)
+
+    def read(self) -> Tuple[int, ...]:
+        """
+        ``read()`` 한번으로 group의 모든 카운터 값을 읽는다.
+
+        :return: (`time_enabled`, `time_running`, 이벤트 값...) 의 누적값
+        :rtype: typing.Tuple[int, ...]
+        """
+        os.readv(self._fds[0], (self._buffer,))
+        return self._struct.unpack_from(self._buffer)[1:]
+
+    def close(self) -> None:
+        for fd in reversed(self._fds):
+            os.close(fd)
+        self._fds.clear()
+
+
+def scale_delta(before: Optional[Tuple[int, ...]], after: Tuple[int, ...]) -> Tuple[float, ...]:
+    """
+    :meth:`PerfEventGroup.read` 로 읽은 두 값의 차이를 구하고, 카운터가 multiplexing 되었다면
+    `perf stat` 과 같이 `time_enabled / time_running` 비율로 보정한다.
+
+    :param before: 이전에 읽은 값. ``None`` 일 경우 0부터의 차이를 구한다.
+    :type before: typing.Optional[typing.Tuple[int, ...]]
+    :param after: 이번에 읽은 값
+    :type after: typing.Tuple[int, ...]
+    :return: 보정된 이벤트별 차이값
+    :rtype: typing.Tuple[float, ...]
+    """
+    if before is None:
+        deltas = after
+    else:
+        deltas = tuple(a - b for a, b in zip(after, before))
+
+    enabled, running = deltas[0], deltas[1]
+
+    if running == 0 or running == enabled:
+        return deltas[2:]
+    else:
+        ratio = enabled / running
+        return tuple(v * ratio for v in deltas[2:])
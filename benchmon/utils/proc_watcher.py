@@ -0,0 +1,353 @@
+# coding: UTF-8
+
+"""
+:mod:`proc_watcher` -- 프로세스의 fork, exec, exit 이벤트 감시
+============================================================
+
+리눅스의 netlink proc connector (``NETLINK_CONNECTOR`` / ``CN_IDX_PROC``) 로 시스템의 모든 fork, exec, exit 이벤트를 받아,
+특정 프로세스의 Process Tree 안에서 exec가 일어나는 즉시 이를 기다리는 코루틴을 깨운다.
+
+proc connector는 ``CAP_NET_ADMIN`` 권한이 필요하기 때문에, 사용할 수 없는 경우 짧은 주기부터 점점 주기를 늘려가며
+`/proc` 를 다시 확인하도록 깨우는 방식으로 동작한다.
+이 때에도 :func:`os.pidfd_open` 을 사용할 수 있다면 감시중인 프로세스의 종료는 즉시 알 수 있다.
+
+하나의 이벤트 루프에서는 :meth:`ProcessWatcher.shared` 로 얻는 하나의 감시자를 여러 드라이버가 공유하며,
+감시자의 소켓은 첫 구독이 시작될 때 열리고 마지막 구독이 끝날 때 닫힌다.
+
+.. module:: benchmon.utils.proc_watcher
+    :synopsis: 프로세스의 fork, exec, exit 이벤트 감시
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+from __future__ import annotations
+
+import asyncio
+import errno
+import logging
+import os
+import socket
+import struct
+from typing import ClassVar, Dict, List, Optional, Set, Tuple
+
+_NETLINK_CONNECTOR = 11
+_CN_IDX_PROC = 1
+_CN_VAL_PROC = 1
+_PROC_CN_MCAST_LISTEN = 1
+_PROC_CN_MCAST_IGNORE = 2
+_NLMSG_DONE = 3
+
+_PROC_EVENT_FORK = 0x00000001
+_PROC_EVENT_EXEC = 0x00000002
+_PROC_EVENT_EXIT = 0x80000000
+
+_NLMSGHDR = struct.Struct('=IHHII')
+_CN_MSG = struct.Struct('=IIIIHH')
+# what, cpu, timestamp_ns
+_PROC_EVENT_HDR = struct.Struct('=IIQ')
+# fork: parent_pid, parent_tgid, child_pid, child_tgid / exec: process_pid, process_tgid / exit: pid, tgid, ...
+_PROC_EVENT_IDS = struct.Struct('=IIII')
+
+_RECV_BUF_SIZE = 64 * 1024
+
+# polling intervals (seconds) when the proc connector is not available
+_MIN_POLL_INTERVAL = 0.001
+_MAX_POLL_INTERVAL = 0.064
+
+
+class ProcessSubscription:
+    """
+    :meth:`ProcessWatcher.subscribe` 로 만들어지며, :meth:`watch` 로 지정한 프로세스와 그 자손들을 추적한다.
+
+    :meth:`wait` 는 추적중인 프로세스 중 하나가 exec 하거나, 지정한 프로세스가 종료되면 반환된다.
+    proc connector를 사용할 수 없는 경우에는 점점 늘어나는 주기마다 반환되어, 호출자가 `/proc` 를 다시 확인하게 한다.
+
+    .. note::
+
+        * 벤치마크를 실행하기 전에 구독을 시작해야, 실행 직후의 fork나 exec를 놓치지 않는다.
+          :meth:`watch` 이전에 받은 이벤트들은 저장되었다가 :meth:`watch` 가 호출될 때 처리된다.
+    """
+    __slots__ = ('_watcher', '_root', '_tree', '_pending', '_changed', '_root_exited', '_pidfd', '_poll_interval')
+
+    _watcher: ProcessWatcher
+    _root: Optional[int]
+    _tree: Set[int]
+    _pending: Optional[List[Tuple[int, int, int]]]
+    _changed: asyncio.Event
+    _root_exited: bool
+    _pidfd: Optional[int]
+    _poll_interval: float
+
+    def __init__(self, watcher: ProcessWatcher) -> None:
+        self._watcher = watcher
+        self._root = None
+        self._tree = set()
+        self._pending = list()
+        self._changed = asyncio.Event()
+        self._root_exited = False
+        self._pidfd = None
+        self._poll_interval = _MIN_POLL_INTERVAL
+
+    def watch(self, pid: int) -> None:
+        """
+        `pid` 와 그 자손 프로세스들을 추적하기 시작한다.
+
+        :param pid: 추적할 프로세스의 pid
+        :type pid: int
+        """
+        self._root = pid
+        self._tree.add(pid)
+
+        pending, self._pending = self._pending, None
+        for what, tgid, parent_tgid in pending:
+            self._dispatch(what, tgid, parent_tgid)
+
+        if hasattr(os, 'pidfd_open'):
+            try:
+                self._pidfd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                self._root_exited = True
+                self._changed.set()
+            except OSError:
+                # pidfd is not supported by the kernel
+                pass
+            else:
+                asyncio.get_running_loop().add_reader(self._pidfd, self._on_root_exit)
+
+    def _on_root_exit(self) -> None:
+        self._root_exited = True
+        self._changed.set()
+        self._close_pidfd()
+
+    def _close_pidfd(self) -> None:
+        if self._pidfd is not None:
+            asyncio.get_running_loop().remove_reader(self._pidfd)
+            os.close(self._pidfd)
+            self._pidfd = None
+
+    def _dispatch(self, what: int, tgid: int, parent_tgid: int) -> None:
+        if self._pending is not None:
+            self._pending.append((what, tgid, parent_tgid))
+            return
+
+        if what == _PROC_EVENT_FORK:
+            if parent_tgid in self._tree:
+                self._tree.add(tgid)
+
+        elif what == _PROC_EVENT_EXEC:
+            if tgid in self._tree:
+                self._changed.set()
+
+        elif what == _PROC_EVENT_EXIT:
+            if tgid == self._root:
+                self._root_exited = True
+                self._changed.set()
+            self._tree.discard(tgid)
+
+    def _invalidate(self) -> None:
+        # some events are lost, so the caller should check the process tree again
+        self._changed.set()
+
+    async def wait(self) -> None:
+        """
+        추적중인 프로세스 중 하나가 exec 하거나 :meth:`watch` 로 지정한 프로세스가 종료될 때 까지 기다린다.
+        proc connector를 사용할 수 없다면 최대 수십 밀리초 마다 반환된다.
+        """
+        if self._watcher.is_event_driven:
+            await self._changed.wait()
+        else:
+            try:
+                await asyncio.wait_for(self._changed.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                self._poll_interval = min(self._poll_interval * 2, _MAX_POLL_INTERVAL)
+
+        self._changed.clear()
+
+    @property
+    def root_exited(self) -> bool:
+        """
+        :return: :meth:`watch` 로 지정한 프로세스가 종료되었는지 여부
+        :rtype: bool
+        """
+        return self._root_exited
+
+    @property
+    def tree(self) -> Set[int]:
+        """
+        proc connector를 사용할 수 없는 경우, :meth:`watch` 로 지정한 프로세스 외에는 추적되지 않는다.
+
+        :return: 추적중인 프로세스들의 pid
+        :rtype: typing.Set[int]
+        """
+        return self._tree
+
+    async def __aenter__(self) -> ProcessSubscription:
+        await self._watcher._add(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._close_pidfd()
+        self._watcher._remove(self)
+
+
+class ProcessWatcher:
+    """
+    proc connector의 이벤트를 받아 구독중인 :class:`ProcessSubscription` 들에게 전달하는 감시자.
+
+    .. code-block:: python
+
+        async with ProcessWatcher.shared().subscribe() as subscription:
+            proc = await asyncio.create_subprocess_exec(...)
+            subscription.watch(proc.pid)
+
+            while find_target() is None:
+                await subscription.wait()
+    """
+    __slots__ = ('_loop', '_socket', '_subscriptions', '_event_driven', '_logger')
+
+    _instances: ClassVar[Dict[asyncio.AbstractEventLoop, ProcessWatcher]] = dict()
+
+    _loop: asyncio.AbstractEventLoop
+    _socket: Optional[socket.socket]
+    _subscriptions: List[ProcessSubscription]
+    _event_driven: bool
+    _logger: logging.Logger
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._socket = None
+        self._subscriptions = list()
+        self._event_driven = False
+        self._logger = logging.getLogger(__name__)
+
+    @classmethod
+    def shared(cls) -> ProcessWatcher:
+        """
+        :return: 현재 실행중인 이벤트 루프의 감시자
+        :rtype: benchmon.utils.proc_watcher.ProcessWatcher
+        """
+        loop = asyncio.get_running_loop()
+
+        watcher = cls._instances.get(loop)
+        if watcher is None:
+            watcher = cls._instances[loop] = cls(loop)
+
+        return watcher
+
+    def subscribe(self) -> ProcessSubscription:
+        """
+        :keyword:`async with` 와 사용되며, 블럭 안에서만 이벤트를 받는 구독을 만든다.
+
+        :return: 새 구독
+        :rtype: benchmon.utils.proc_watcher.ProcessSubscription
+        """
+        return ProcessSubscription(self)
+
+    @property
+    def is_event_driven(self) -> bool:
+        """
+        :return: proc connector로 이벤트를 받고 있다면 ``True``, `/proc` 를 주기적으로 확인하는 방식이라면 ``False``
+        :rtype: bool
+        """
+        return self._event_driven
+
+    async def _add(self, subscription: ProcessSubscription) -> None:
+        if len(self._subscriptions) == 0:
+            self._open()
+
+        self._subscriptions.append(subscription)
+
+    def _remove(self, subscription: ProcessSubscription) -> None:
+        self._subscriptions.remove(subscription)
+
+        if len(self._subscriptions) == 0:
+            self._close()
+            ProcessWatcher._instances.pop(self._loop, None)
+
+    def _open(self) -> None:
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_CONNECTOR)
+        except (AttributeError, OSError) as e:
+            self._logger.debug(f'The proc connector is not available, fall back to polling /proc: {e}')
+            return
+
+        try:
+            sock.bind((0, _CN_IDX_PROC))
+            sock.send(self._control_message(_PROC_CN_MCAST_LISTEN))
+            sock.setblocking(False)
+        except OSError as e:
+            sock.close()
+            self._logger.debug(f'The proc connector is not available, fall back to polling /proc: {e}')
+            return
+
+        self._socket = sock
+        self._event_driven = True
+        self._loop.add_reader(sock.fileno(), self._on_readable)
+
+    def _close(self) -> None:
+        if self._socket is None:
+            return
+
+        self._loop.remove_reader(self._socket.fileno())
+
+        try:
+            self._socket.send(self._control_message(_PROC_CN_MCAST_IGNORE))
+        except OSError:
+            pass
+
+        self._socket.close()
+        self._socket = None
+        self._event_driven = False
+
+    @staticmethod
+    def _control_message(op: int) -> bytes:
+        payload = struct.pack('=I', op)
+        cn_msg = _CN_MSG.pack(_CN_IDX_PROC, _CN_VAL_PROC, 0, 0, len(payload), 0)
+        length = _NLMSGHDR.size + len(cn_msg) + len(payload)
+
+        return _NLMSGHDR.pack(length, _NLMSG_DONE, 0, 0, os.getpid()) + cn_msg + payload
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                data = self._socket.recv(_RECV_BUF_SIZE)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    # the receive buffer was overrun and some events are dropped
+                    for subscription in self._subscriptions:
+                        subscription._invalidate()
+                    continue
+                raise
+
+            self._parse(data)
+
+    def _parse(self, data: bytes) -> None:
+        offset = 0
+
+        while offset + _NLMSGHDR.size <= len(data):
+            length = _NLMSGHDR.unpack_from(data, offset)[0]
+            if length < _NLMSGHDR.size:
+                return
+
+            event_offset = offset + _NLMSGHDR.size + _CN_MSG.size
+            if event_offset + _PROC_EVENT_HDR.size + _PROC_EVENT_IDS.size <= offset + length:
+                what = _PROC_EVENT_HDR.unpack_from(data, event_offset)[0]
+                first, second, third, fourth = _PROC_EVENT_IDS.unpack_from(data, event_offset + _PROC_EVENT_HDR.size)
+
+                if what == _PROC_EVENT_FORK:
+                    # only the creation of processes is interesting, not of threads
+                    if third == fourth:
+                        self._dispatch(what, fourth, second)
+                elif what == _PROC_EVENT_EXEC:
+                    self._dispatch(what, second, 0)
+                elif what == _PROC_EVENT_EXIT:
+                    if first == second:
+                        self._dispatch(what, second, 0)
+
+            # netlink messages are aligned to 4 bytes
+            offset += (length + 3) & ~3
+
+    def _dispatch(self, what: int, tgid: int, parent_tgid: int) -> None:
+        for subscription in self._subscriptions:
+            subscription._dispatch(what, tgid, parent_tgid)
@@ -1,10 +1,13 @@
 # coding: UTF-8
 
 import asyncio
-import re
-import subprocess
+import os
+from array import array
 from pathlib import Path
-from typing import ClassVar, Dict, Iterable, Mapping, Optional, TextIO, Tuple
+from typing import FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from .sysfs import sys_path
+from .topology import ResCtrlInfo, ensure_resctrl_mounted, hardware_topology
 
 
 def mask_to_bits(mask: str) -> int:
@@ -36,12 +39,56 @@ def bits_to_mask(bits: int) -> str:
     return f'{bits:x}'
 
 
-def _read_file(path: Path, monitor: TextIO) -> Tuple[str, int]:
-    monitor.seek(0)
-    return path.name, int(monitor.readline())
+# a monitoring file contains a u64 counter in decimal (at most 20 digits) and a newline
+_VALUE_BUF_SIZE = 32
+
+
+def _resctrl_info() -> ResCtrlInfo:
+    info = hardware_topology().resctrl
+
+    if info is None:
+        raise AttributeError('resctrl is not supported on this machine.')
+
+    return info
 
 
-class ResCtrl:
+class _ResCtrlMeta(type):
+    """
+    :class:`ResCtrl` 의 하드웨어 정보들을 import 시점이 아닌, 처음 사용될 때
+    :func:`~benchmon.utils.topology.hardware_topology` 로부터 읽어오기 위한 metaclass.
+    resctrl이 지원되지 않는 경우 :attr:`MOUNT_POINT` 를 제외한 속성들은 :class:`AttributeError` 를 발생시킨다.
+    """
+
+    @property
+    def MOUNT_POINT(cls) -> Path:
+        return sys_path('fs/resctrl')
+
+    @property
+    def FEATURES(cls) -> Tuple[str, ...]:
+        return _resctrl_info().mon_features
+
+    @property
+    def _MON_NAMES(cls) -> Tuple[str, ...]:
+        return _resctrl_info().mon_names
+
+    @property
+    def MAX_MASK(cls) -> str:
+        return _resctrl_info().cbm_mask
+
+    @property
+    def MAX_BITS(cls) -> int:
+        return mask_to_bits(_resctrl_info().cbm_mask)
+
+    @property
+    def MIN_BITS(cls) -> int:
+        return _resctrl_info().min_cbm_bits
+
+    @property
+    def MIN_MASK(cls) -> str:
+        return bits_to_mask(_resctrl_info().min_cbm_bits)
+
+
+class ResCtrl(metaclass=_ResCtrlMeta):
     """
     리눅스에서 `/sys/fs/resctrl` 에 마운트 되는 Intel CAT과 관련된 API wrapper.
 
@@ -49,6 +96,7 @@ class ResCtrl:
         * :meth:`read` 같은 메소드를 호출하기 이전에 딱 한번 :meth:`prepare_to_read` 으로 초기화 해줘야 한다.
         * 현재 `info/L3_MON/mon_features` 에 listing된 것들의 monitoring 기능과, CAT 기능을 지원함.
         * 모든 기능들은 파일 읽기 쓰기를 통해 진행되기 때문에, 잦은 호출은 큰 오버헤드를 가져올 수 있음
+          (모니터링 값 읽기는 :meth:`read_array` 에서 미리 열어둔 파일들을 한번에 읽는 방식으로 최소화 되어있음)
 
     .. todo::
 
@@ -71,44 +119,25 @@ class ResCtrl:
                 * 하지만 H/W dependent 할 수도..?
                 * 현재까지 경험에 의하면 root 권한 필요
     """
-    __slots__ = ('_group_name', '_group_path', '_prepare_read', '_monitors')
-
-    MOUNT_POINT: ClassVar[Path] = Path('/sys/fs/resctrl')
-
-    # FIXME: H/W support check before adjust config to benchmark
-    if MOUNT_POINT.exists():
-        if not MOUNT_POINT.is_mount():
-            # TODO: replace with non-shell implementation
-            subprocess.check_call(('mount', '-t', 'resctrl', 'resctrl', '/sys/fs/resctrl'))
-
-        FEATURES: ClassVar[Tuple[str, ...]] = tuple(
-                (MOUNT_POINT / 'info' / 'L3_MON' / 'mon_features').read_text('ASCII').strip().split()
-        )
-
-        # filter L3 related monitors and sort by name (currently same as socket number)
-        _MON_NAMES: ClassVar[Tuple[str, ...]] = tuple(sorted(
-                map(
-                        lambda x: x.name,
-                        filter(
-                                lambda m: re.match(r'mon_L3_(\d+)', m.name),
-                                MOUNT_POINT.joinpath('mon_data').glob('mon_L3_*')
-                        )
-                )
-        ))
-
-        MAX_MASK: ClassVar[str] = MOUNT_POINT.joinpath('info/L3/cbm_mask').read_text(encoding='ASCII').strip()
-        MAX_BITS: ClassVar[int] = mask_to_bits(MAX_MASK)
-        MIN_BITS: ClassVar[int] = int((MOUNT_POINT / 'info' / 'L3' / 'min_cbm_bits').read_text())
-        MIN_MASK: ClassVar[str] = bits_to_mask(MIN_BITS)
+    __slots__ = ('_group_name', '_group_path', '_prepare_read', '_monitor_paths', '_fds', '_buffer', '_tasks_fd')
 
     _group_name: str
     _group_path: Path
     _prepare_read: bool
-    # tuple of each feature monitors for each socket
-    _monitors: Tuple[Dict[Path, Optional[TextIO]], ...]
+    # monitoring files of each feature for each socket, ordered by (socket, feature)
+    _monitor_paths: Tuple[Path, ...]
+    _fds: Tuple[int, ...]
+    _buffer: bytearray
+    # `tasks` of the group, opened on the first call of `add_tasks()`
+    _tasks_fd: Optional[int]
 
     def __init__(self, group_name: str = str()) -> None:
+        ensure_resctrl_mounted()
+
         self._prepare_read = False
+        self._fds = tuple()
+        self._buffer = bytearray(_VALUE_BUF_SIZE)
+        self._tasks_fd = None
         self.group_name = group_name
 
     @property
@@ -136,13 +165,14 @@ class ResCtrl:
         :param new_name: 새로 pointing 할 그룹의 이름
         :type new_name: str
         """
+        self.close_tasks()
+
         self._group_name = new_name
         self._group_path = ResCtrl.MOUNT_POINT / new_name
-        self._monitors: Tuple[Dict[Path, Optional[TextIO]], ...] = tuple(
-                dict.fromkeys(
-                        self._group_path / 'mon_data' / mon_name / feature for feature in ResCtrl.FEATURES
-                )
+        self._monitor_paths = tuple(
+                self._group_path / 'mon_data' / mon_name / feature
                 for mon_name in ResCtrl._MON_NAMES
+                for feature in ResCtrl.FEATURES
         )
 
     def create_group(self) -> None:
@@ -160,11 +190,17 @@ class ResCtrl:
         if self._prepare_read:
             raise AssertionError('The ResCtrl object is already prepared to read.')
 
+        fds = list()
+        try:
+            for file_path in self._monitor_paths:
+                fds.append(os.open(file_path, os.O_RDONLY | os.O_CLOEXEC))
+        except OSError:
+            for fd in fds:
+                os.close(fd)
+            raise
+
+        self._fds = tuple(fds)
         self._prepare_read = True
-        for monitor_dict in self._monitors:
-            for file_path in monitor_dict.keys():
-                # TODO: compare between open and aiofile.
-                monitor_dict[file_path] = file_path.open()
 
     async def add_task(self, pid: int) -> None:
         """
@@ -173,21 +209,61 @@ class ResCtrl:
         :param pid: 그룹에 추가할 pid
         :type pid: int
         """
-        (self._group_path / 'tasks').write_text(str(pid))
+        await self.add_tasks((pid,))
 
-    async def add_tasks(self, pids: Iterable[int]) -> None:
+    async def add_tasks(self, pids: Iterable[int]) -> Tuple[int, ...]:
         """
         `pids` 들을 이 객체가 가리키는 그룹에 모두 추가
 
-        .. todo::
+        처음 호출될 때 연 `tasks` 파일을 :meth:`close_tasks` 가 호출될 때 까지 재사용하며,
+        모든 쓰기는 event loop를 막지 않도록 executor에서 한번에 처리한다.
+
+        .. note::
 
-            * 내부적으로 :meth:`add_task` 를 여러번 호출하는데, 이 경우 파일 쓰기를 순차적으로 사용하기 때문에 큰 delay가 생김
-              * 현재까지 Linux의 `/sys/fs/resctrl` 인터페이스를 통한 task 추가는 순차적으로 밖에 진행할 수 없음
+            * Linux의 `/sys/fs/resctrl` 인터페이스는 한번의 쓰기에 하나의 pid만 받으므로, pid마다 `write` 를 호출한다.
 
         :param pids: 추가할 pid들
         :type pids: typing.Iterable[int]
+        :return: 추가되기 전에 종료되어 추가하지 못한 pid들
+        :rtype: typing.Tuple[int, ...]
+        """
+        pids = tuple(pids)
+        if len(pids) == 0:
+            return tuple()
+
+        return await asyncio.get_running_loop().run_in_executor(None, self._write_tasks, pids)
+
+    def _write_tasks(self, pids: Tuple[int, ...]) -> Tuple[int, ...]:
+        if self._tasks_fd is None:
+            self._tasks_fd = os.open(self._group_path / 'tasks', os.O_WRONLY | os.O_CLOEXEC)
+
+        fd = self._tasks_fd
+        vanished: List[int] = list()
+
+        for pid in pids:
+            try:
+                os.write(fd, b'%d' % pid)
+            except ProcessLookupError:
+                vanished.append(pid)
+
+        return tuple(vanished)
+
+    async def read_tasks(self) -> FrozenSet[int]:
+        """
+        :return: 이 객체가 가리키는 그룹에 현재 속한 pid (tid) 들
+        :rtype: typing.FrozenSet[int]
         """
-        await asyncio.wait(tuple(self.add_task(pid) for pid in pids))
+        return await asyncio.get_running_loop().run_in_executor(None, self._read_tasks)
+
+    def _read_tasks(self) -> FrozenSet[int]:
+        with (self._group_path / 'tasks').open() as fp:
+            return frozenset(map(int, fp.read().split()))
+
+    def close_tasks(self) -> None:
+        """ :meth:`add_tasks` 가 열어둔 `tasks` 파일을 닫는다. """
+        if self._tasks_fd is not None:
+            os.close(self._tasks_fd)
+            self._tasks_fd = None
 
     async def assign_llc(self, *masks: str) -> None:
         """
@@ -234,22 +310,64 @@ class ResCtrl:
         :return: 모니터링한 값
         :rtype: typing.Tuple[typing.Mapping[str, int], ...]
         """
-        if not self._prepare_read:
-            raise AssertionError('The ResCtrl object is not ready to read.')
+        return tuple(
+                dict(zip(ResCtrl.FEATURES, values))
+                for values in await self.read_values()
+        )
+
+    async def read_values(self) -> Tuple[Tuple[int, ...], ...]:
+        """
+        :meth:`read` 와 같지만, 각 LLC마다 dict 대신 :attr:`FEATURES` 순서대로 정렬된 값들의 튜플로 반환
+
+        :return: 모니터링한 값
+        :rtype: typing.Tuple[typing.Tuple[int, ...], ...]
+        """
+        values = await self.read_array()
+        num_features = len(ResCtrl.FEATURES)
 
         return tuple(
-                dict(_read_file(k, v) for k, v in mons.items())
-                for mons in self._monitors
+                tuple(values[idx:idx + num_features])
+                for idx in range(0, len(values), num_features)
         )
 
+    async def read_array(self) -> array:
+        """
+        모든 LLC의 모든 `mon_feature` 를 한번에 읽어 ``array('q')`` 로 반환한다.
+
+        `socket` 번째 LLC의 `feature` 번째 (:attr:`FEATURES` 기준) 값은
+        ``socket * len(ResCtrl.FEATURES) + feature`` 에 위치한다.
+
+        :meth:`prepare_to_read` 에서 열어둔 파일들을 :func:`os.preadv` 로 미리 할당된 버퍼에 읽으며,
+        이벤트 루프를 막지 않도록 모든 파일 읽기는 한번의 executor 호출 안에서 진행된다.
+
+        :return: 모니터링한 값
+        :rtype: array.array
+        """
+        if not self._prepare_read:
+            raise AssertionError('The ResCtrl object is not ready to read.')
+
+        return await asyncio.get_running_loop().run_in_executor(None, self._read_all)
+
+    def _read_all(self) -> array:
+        buffer = self._buffer
+        values = array('q', bytes(8 * len(self._fds)))
+
+        for idx, fd in enumerate(self._fds):
+            read = os.preadv(fd, (buffer,), 0)
+            values[idx] = int(buffer[:read])
+
+        return values
+
     async def end_read(self) -> None:
         """:meth:`prepare_to_read` 를 통해 초기화한 것들을 돌려 놓음"""
         if not self._prepare_read:
             raise AssertionError('The ResCtrl object is not ready to read.')
 
-        for mon_dict in self._monitors:
-            for mon in mon_dict.values():
-                mon.close()
+        self._prepare_read = False
+
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = tuple()
 
     async def delete(self) -> None:
         """
@@ -258,7 +376,10 @@ class ResCtrl:
         if self._prepare_read:
             await self.end_read()
 
+        self.close_tasks()
+
         if self._group_name is str():
             raise PermissionError('Can not remove root directory of resctrl')
 
         self._group_path.rmdir()
+
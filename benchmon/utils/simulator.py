@@ -0,0 +1,351 @@
+# coding: UTF-8
+
+"""
+:mod:`simulator` -- 가상의 하드웨어 파일 시스템
+============================================================
+
+root 권한이나 Intel RDT, RAPL 등이 없는 머신에서도 모니터, constraint, 핸들러들을 테스트하거나 부하를 측정할 수 있도록,
+`/sys` 의 하드웨어 관련 파일들을 흉내내는 디렉토리 트리를 만들고 시간에 따라 값을 갱신한다.
+
+.. code-block:: python
+
+    with SimulatedHardware(Path('/tmp/fake_sys'), sockets=2) as hw:
+        # 이 블럭 안에서는 benchmon.utils.sysfs.sys_path() 가 /tmp/fake_sys 를 가리킨다
+        ...
+
+.. note::
+
+    * 갱신되는 카운터 파일들은 읽는 도중 크기가 바뀌지 않도록 0으로 채운 고정 길이로 쓰여진다.
+    * 만들어지는 파일들은 일반 파일이기 때문에, 쓰기 (e.g. `scaling_max_freq`, `schemata`) 는 그대로 저장만 된다.
+
+.. module:: benchmon.utils.simulator
+    :synopsis: 가상의 하드웨어 파일 시스템
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import sysfs
+from .ranges import Ranges
+
+# directories in the resctrl root that are not resource groups
+_RESCTRL_RESERVED = frozenset(('info', 'mon_data', 'mon_groups'))
+_COUNTER_WIDTH = 20
+
+
+class _Counter:
+    __slots__ = ('fd', 'value', 'rate', 'max_value')
+
+    fd: int
+    value: int
+    rate: float
+    max_value: Optional[int]
+
+    def __init__(self, path: Path, value: int, rate: float, max_value: int = None) -> None:
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        self.value = value
+        self.rate = rate
+        self.max_value = max_value
+
+        self.write()
+
+    def write(self) -> None:
+        os.pwrite(self.fd, f'{self.value:0{_COUNTER_WIDTH}d}\n'.encode(), 0)
+
+
+class SimulatedHardware:
+    """
+    `root` 에 가상의 `/sys` 트리를 만들고, :meth:`tick` 이나 :meth:`start` 로 카운터들을 증가시킨다.
+
+    만들어지는 파일들:
+
+    * `devices/system/node`: `online`, `possible`, `has_memory`, 각 노드의 `cpulist`
+    * `devices/system/cpu`: `online`, 각 코어의 `online`, `topology/thread_siblings_list`,
+      `cpufreq/{scaling,cpuinfo}_{max,min}_freq`, `cpufreq/scaling_governor`
+    * `fs/resctrl`: `info/L3_MON/mon_features`, `info/L3/{cbm_mask,min_cbm_bits}`, 각 그룹의 `schemata`, `tasks`,
+      `mon_data/mon_L3_*/*`. `mbm_*_bytes` 는 단조 증가하고 `llc_occupancy` 는 임의로 변한다.
+      :meth:`~benchmon.utils.resctrl.ResCtrl.create_group` 으로 새로 만들어진 그룹은 다음 :meth:`tick` 에서 채워진다.
+    * `class/powercap/intel-rapl`: 각 소켓의 package, core, dram 도메인의 `energy_uj`.
+      `max_energy_range_uj` 를 넘으면 0부터 다시 시작한다.
+    * `bus/event_source/devices/cpu`: `type`, `format/{event,umask}`
+
+    :keyword:`with` 와 사용할 경우 트리를 만들고, :func:`~benchmon.utils.sysfs.set_root` 로 root를 `root` 로 바꾼 뒤
+    백그라운드 스레드에서 `interval` 초마다 :meth:`tick` 을 호출한다. 블럭이 끝나면 원래의 root로 돌아간다.
+    """
+    __slots__ = ('_root', '_sockets', '_cores_per_socket', '_threads_per_core', '_mon_features', '_cbm_bits',
+                 '_max_freq', '_min_freq', '_max_energy', '_interval', '_random', '_counters', '_gauges',
+                 '_groups', '_lock', '_thread', '_stop_event', '_prev_root')
+
+    _root: Path
+    _sockets: int
+    _cores_per_socket: int
+    _threads_per_core: int
+    _mon_features: Tuple[str, ...]
+    _cbm_bits: int
+    _max_freq: int
+    _min_freq: int
+    _max_energy: int
+    _interval: float
+    _random: random.Random
+    _counters: List[_Counter]
+    _gauges: List[Tuple[_Counter, int]]
+    _groups: Dict[Path, None]
+    _lock: threading.Lock
+    _thread: Optional[threading.Thread]
+    _stop_event: threading.Event
+    _prev_root: Optional[Tuple[Path, Path]]
+
+    def __init__(self, root: Path, sockets: int = 2, cores_per_socket: int = 8, threads_per_core: int = 2,
+                 mon_features: Tuple[str, ...] = ('llc_occupancy', 'mbm_total_bytes', 'mbm_local_bytes'),
+                 cbm_bits: int = 11, max_freq: int = 3_000_000, min_freq: int = 1_200_000,
+                 max_energy: int = 262_143_328_850, interval: float = 0.01, seed: int = 0) -> None:
+        """
+        :param root: 가상의 `/sys` 로 사용할 디렉토리. 없을 경우 만들어진다.
+        :type root: pathlib.Path
+        :param sockets: 소켓 (NUMA 노드, LLC) 의 수
+        :type sockets: int
+        :param cores_per_socket: 소켓 당 물리 코어의 수
+        :type cores_per_socket: int
+        :param threads_per_core: 물리 코어 당 논리 코어의 수
+        :type threads_per_core: int
+        :param mon_features: `info/L3_MON/mon_features` 에 적힐 모니터링 기능들
+        :type mon_features: typing.Tuple[str, ...]
+        :param cbm_bits: LLC의 CBM 비트 수
+        :type cbm_bits: int
+        :param max_freq: 코어의 최대 주파수 (kHz)
+        :type max_freq: int
+        :param min_freq: 코어의 최소 주파수 (kHz)
+        :type min_freq: int
+        :param max_energy: RAPL의 `max_energy_range_uj`. 작게 설정하면 wraparound를 빠르게 재현할 수 있다.
+        :type max_energy: int
+        :param interval: 백그라운드 스레드에서 :meth:`tick` 을 호출하는 주기 (초)
+        :type interval: float
+        :param seed: 카운터 증가량을 정하는 난수의 seed
+        :type seed: int
+        """
+        self._root = root
+        self._sockets = sockets
+        self._cores_per_socket = cores_per_socket
+        self._threads_per_core = threads_per_core
+        self._mon_features = tuple(mon_features)
+        self._cbm_bits = cbm_bits
+        self._max_freq = max_freq
+        self._min_freq = min_freq
+        self._max_energy = max_energy
+        self._interval = interval
+        self._random = random.Random(seed)
+        self._counters = list()
+        self._gauges = list()
+        self._groups = dict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._prev_root = None
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def num_cpus(self) -> int:
+        return self._sockets * self._cores_per_socket * self._threads_per_core
+
+    def cpus_of(self, socket_id: int) -> Tuple[int, ...]:
+        """
+        리눅스와 같이 모든 소켓의 첫번째 논리 코어들에 번호를 먼저 매긴 뒤, 그 형제 코어들에 번호를 매긴다.
+
+        :param socket_id: 소켓 번호
+        :type socket_id: int
+        :return: `socket_id` 소켓에 속한 논리 코어 번호들
+        :rtype: typing.Tuple[int, ...]
+        """
+        num_physical = self._sockets * self._cores_per_socket
+
+        return tuple(
+                thread * num_physical + socket_id * self._cores_per_socket + core
+                for thread in range(self._threads_per_core)
+                for core in range(self._cores_per_socket)
+        )
+
+    def _write(self, relative: str, content: str) -> Path:
+        path = self._root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return path
+
+    def build(self) -> None:
+        """가상의 `/sys` 트리를 만든다. 이미 만들어진 카운터들은 초기화된다."""
+        self.close()
+
+        all_sockets = Ranges.convert_to_str(range(self._sockets))
+        self._write('devices/system/node/online', f'{all_sockets}\n')
+        self._write('devices/system/node/possible', f'{all_sockets}\n')
+        self._write('devices/system/node/has_memory', f'{all_sockets}\n')
+
+        num_physical = self._sockets * self._cores_per_socket
+        self._write('devices/system/cpu/online', f'{Ranges.convert_to_str(range(self.num_cpus))}\n')
+
+        for socket_id in range(self._sockets):
+            cpus = self.cpus_of(socket_id)
+            self._write(f'devices/system/node/node{socket_id}/cpulist', f'{Ranges.convert_to_str(cpus)}\n')
+
+        for cpu in range(self.num_cpus):
+            base = f'devices/system/cpu/cpu{cpu}'
+            siblings = range(cpu % num_physical, self.num_cpus, num_physical)
+
+            self._write(f'{base}/online', '1\n')
+            self._write(f'{base}/topology/thread_siblings_list', ','.join(map(str, siblings)) + '\n')
+            self._write(f'{base}/cpufreq/cpuinfo_max_freq', f'{self._max_freq}\n')
+            self._write(f'{base}/cpufreq/cpuinfo_min_freq', f'{self._min_freq}\n')
+            self._write(f'{base}/cpufreq/scaling_max_freq', f'{self._max_freq}\n')
+            self._write(f'{base}/cpufreq/scaling_min_freq', f'{self._min_freq}\n')
+            self._write(f'{base}/cpufreq/scaling_governor', 'powersave\n')
+
+        self._write('bus/event_source/devices/cpu/type', '4\n')
+        self._write('bus/event_source/devices/cpu/format/event', 'config:0-7\n')
+        self._write('bus/event_source/devices/cpu/format/umask', 'config:8-15\n')
+
+        resctrl = self._root / 'fs' / 'resctrl'
+        self._write('fs/resctrl/info/L3_MON/mon_features', '\n'.join(self._mon_features) + '\n')
+        self._write('fs/resctrl/info/L3/cbm_mask', f'{(1 << self._cbm_bits) - 1:x}\n')
+        self._write('fs/resctrl/info/L3/min_cbm_bits', '1\n')
+        self._populate_group(resctrl)
+
+        for socket_id in range(self._sockets):
+            package = f'class/powercap/intel-rapl/intel-rapl:{socket_id}'
+            package_watts = self._random.uniform(40, 120)
+
+            self._add_energy(package, f'package-{socket_id}', package_watts)
+            self._add_energy(f'{package}/intel-rapl:{socket_id}:0', 'core', package_watts * 0.6)
+            self._add_energy(f'{package}/intel-rapl:{socket_id}:1', 'dram', package_watts * 0.15)
+
+    def _add_energy(self, relative: str, name: str, watts: float) -> None:
+        self._write(f'{relative}/name', f'{name}\n')
+        self._write(f'{relative}/max_energy_range_uj', f'{self._max_energy}\n')
+
+        energy = self._random.randrange(self._max_energy)
+        counter = _Counter(self._root / relative / 'energy_uj', energy, watts * 1_000_000, self._max_energy)
+        self._counters.append(counter)
+
+    def _populate_group(self, group: Path) -> None:
+        mask = f'{(1 << self._cbm_bits) - 1:x}'
+
+        if not (group / 'schemata').exists():
+            masks = ';'.join(f'{socket_id}={mask}' for socket_id in range(self._sockets))
+            (group / 'schemata').write_text(f'L3:{masks}\n')
+        if not (group / 'tasks').exists():
+            (group / 'tasks').write_text('')
+
+        llc_size = self._cbm_bits * 2 * 1024 * 1024
+
+        for socket_id in range(self._sockets):
+            mon_dir = group / 'mon_data' / f'mon_L3_{socket_id:02d}'
+            mon_dir.mkdir(parents=True, exist_ok=True)
+
+            total_rate = self._random.uniform(1e8, 2e9)
+
+            for feature in self._mon_features:
+                if feature == 'llc_occupancy':
+                    counter = _Counter(mon_dir / feature, self._random.randrange(llc_size), 0)
+                    self._gauges.append((counter, llc_size))
+                    continue
+                elif feature == 'mbm_local_bytes':
+                    rate = total_rate * self._random.uniform(0.5, 0.9)
+                else:
+                    rate = total_rate
+
+                self._counters.append(_Counter(mon_dir / feature, 0, rate))
+
+        self._groups[group] = None
+
+    def _find_new_groups(self) -> List[Path]:
+        resctrl = self._root / 'fs' / 'resctrl'
+
+        return [
+            path for path in resctrl.iterdir()
+            if path.is_dir() and path.name not in _RESCTRL_RESERVED and path not in self._groups
+        ]
+
+    def tick(self, elapsed: float) -> None:
+        """
+        `elapsed` 초가 지난것 처럼 카운터들을 증가시키고, 새로 만들어진 resctrl 그룹들을 채운다.
+
+        :param elapsed: 지난 시간 (초)
+        :type elapsed: float
+        """
+        with self._lock:
+            for group in self._find_new_groups():
+                self._populate_group(group)
+
+            for counter in self._counters:
+                counter.value += int(counter.rate * elapsed * self._random.uniform(0.8, 1.2))
+                if counter.max_value is not None:
+                    counter.value %= counter.max_value
+                counter.write()
+
+            for gauge, max_value in self._gauges:
+                step = max_value // 100
+                gauge.value = min(max(gauge.value + self._random.randint(-step, step), 0), max_value)
+                gauge.write()
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 `interval` 초마다 :meth:`tick` 을 호출하기 시작한다."""
+        if self._thread is not None:
+            raise AssertionError('The simulator is already started.')
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='hardware-simulator', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        prev = time.monotonic()
+
+        while not self._stop_event.wait(self._interval):
+            now = time.monotonic()
+            self.tick(now - prev)
+            prev = now
+
+    def stop(self) -> None:
+        """:meth:`start` 로 시작된 백그라운드 스레드를 멈춘다."""
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def close(self) -> None:
+        """백그라운드 스레드를 멈추고 카운터 파일들을 닫는다. 만들어진 파일들은 지워지지 않는다."""
+        self.stop()
+
+        for counter in self._counters:
+            os.close(counter.fd)
+        for gauge, _ in self._gauges:
+            os.close(gauge.fd)
+
+        self._counters.clear()
+        self._gauges.clear()
+        self._groups.clear()
+
+    def __enter__(self) -> SimulatedHardware:
+        self.build()
+
+        self._prev_root = (sysfs.sys_path(), sysfs.proc_path())
+        sysfs.set_root(sys_root=self._root)
+
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+        sys_root, proc_root = self._prev_root
+        self._prev_root = None
+        sysfs.set_root(sys_root, proc_root)
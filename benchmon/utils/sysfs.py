@@ -0,0 +1,100 @@
+# coding: UTF-8
+
+"""
+:mod:`sysfs` -- 하드웨어 관련 파일 시스템의 root
+============================================================
+
+`/sys` 와 `/proc` 를 직접 사용하는 대신 이 모듈의 :func:`sys_path` 와 :func:`proc_path` 로 경로를 만들어,
+실제 하드웨어가 아닌 다른 디렉토리 (e.g. :mod:`benchmon.utils.simulator` 가 만든 가상 트리) 를 사용할 수 있게 한다.
+
+root는 import 시점에 환경 변수 ``BENCHMON_SYS_ROOT`` 와 ``BENCHMON_PROC_ROOT`` 로 정해지며
+(없을 경우 `/sys` 와 `/proc`), 실행 중에는 :func:`set_root` 로 바꿀 수 있다.
+import 시점에 하드웨어 정보를 읽어두는 모듈들은 :func:`on_root_changed` 로 root가 바뀔 때 다시 읽도록 등록한다.
+
+.. module:: benchmon.utils.sysfs
+    :synopsis: 하드웨어 관련 파일 시스템의 root
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, List, Union
+
+_DEFAULT_SYS_ROOT = Path('/sys')
+_DEFAULT_PROC_ROOT = Path('/proc')
+
+_sys_root: Path = Path(os.environ.get('BENCHMON_SYS_ROOT', _DEFAULT_SYS_ROOT))
+_proc_root: Path = Path(os.environ.get('BENCHMON_PROC_ROOT', _DEFAULT_PROC_ROOT))
+
+_reload_hooks: List[Callable[[], None]] = list()
+
+
+def sys_path(*parts: str) -> Path:
+    """
+    `/sys` 아래의 경로 `parts` 를 현재 root 기준으로 변환한다.
+
+    :param parts: `/sys` 로부터의 상대 경로들. e.g. ``sys_path('devices/system/cpu', 'online')``
+    :type parts: str
+    :return: 변환된 경로
+    :rtype: pathlib.Path
+    """
+    return _sys_root.joinpath(*parts)
+
+
+def proc_path(*parts: str) -> Path:
+    """
+    `/proc` 아래의 경로 `parts` 를 현재 root 기준으로 변환한다.
+
+    :param parts: `/proc` 로부터의 상대 경로들. e.g. ``proc_path(str(pid), 'task')``
+    :type parts: str
+    :return: 변환된 경로
+    :rtype: pathlib.Path
+    """
+    return _proc_root.joinpath(*parts)
+
+
+def is_simulated() -> bool:
+    """
+    :return: `/sys` 의 root가 실제 `/sys` 가 아닌지 여부.
+             ``True`` 라면 mount 처럼 실제 시스템을 변경하는 작업은 하지 않아야 한다.
+    :rtype: bool
+    """
+    return _sys_root != _DEFAULT_SYS_ROOT
+
+
+def set_root(sys_root: Union[str, Path] = None, proc_root: Union[str, Path] = None) -> None:
+    """
+    root를 변경하고, :func:`on_root_changed` 로 등록된 함수들을 등록된 순서대로 호출한다.
+
+    :param sys_root: `/sys` 대신 사용할 경로. ``None`` 일 경우 변경하지 않는다.
+    :type sys_root: typing.Union[str, pathlib.Path, None]
+    :param proc_root: `/proc` 대신 사용할 경로. ``None`` 일 경우 변경하지 않는다.
+    :type proc_root: typing.Union[str, pathlib.Path, None]
+    """
+    global _sys_root, _proc_root
+
+    if sys_root is not None:
+        _sys_root = Path(sys_root)
+    if proc_root is not None:
+        _proc_root = Path(proc_root)
+
+    for hook in _reload_hooks:
+        hook()
+
+
+def reset_root() -> None:
+    """root를 실제 `/sys` 와 `/proc` 로 되돌린다."""
+    set_root(_DEFAULT_SYS_ROOT, _DEFAULT_PROC_ROOT)
+
+
+def on_root_changed(hook: Callable[[], None]) -> Callable[[], None]:
+    """
+    :func:`set_root` 로 root가 바뀔 때 호출될 `hook` 을 등록한다. decorator로 사용할 수 있다.
+
+    :param hook: 등록할 함수
+    :type hook: typing.Callable[[], None]
+    :return: `hook`
+    :rtype: typing.Callable[[], None]
+    """
+    _reload_hooks.append(hook)
+    return hook
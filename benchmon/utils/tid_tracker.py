@@ -0,0 +1,233 @@
+# coding: UTF-8
+
+"""
+:mod:`tid_tracker` -- 벤치마크에 속한 스레드들의 TID 추적
+============================================================
+
+psutil로 프로세스마다 스레드 목록을 만드는 대신 `/proc` 와 cgroup 파일을 직접 읽어 TID들을 모은다.
+각 tracker는 마지막으로 읽은 TID 집합을 가지고 있어, :meth:`TidTracker.update` 로 그 사이에 생기거나 사라진 TID만
+:class:`TidDiff` 로 얻을 수 있다.
+따라서 resctrl 그룹처럼 TID를 등록해야하는 constraint들은 주기적으로 차이만 반영하면 된다.
+
+* :class:`ProcessTreeTidTracker`: 루트 프로세스와 그 자손 프로세스들의 `/proc/<pid>/task`
+* :class:`CGroupTidTracker`: cgroup의 `cgroup.threads` (v2) 혹은 `tasks` (v1)
+
+.. module:: benchmon.utils.tid_tracker
+    :synopsis: 벤치마크에 속한 스레드들의 TID 추적
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+from __future__ import annotations
+
+import os
+from abc import ABCMeta, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from .freezer import is_unified
+from .sysfs import proc_path, sys_path
+
+
+@dataclass(frozen=True)
+class TidDiff:
+    """ 두 :meth:`TidTracker.update` 사이의 TID 변화 """
+    __slots__ = ('added', 'removed')
+
+    added: FrozenSet[int]
+    """ 새로 생긴 TID들 """
+    removed: FrozenSet[int]
+    """ 사라진 TID들 """
+
+    def __bool__(self) -> bool:
+        return len(self.added) != 0 or len(self.removed) != 0
+
+
+class TidTracker(metaclass=ABCMeta):
+    """
+    어떤 범위 (e.g. Process Tree, cgroup) 에 속한 TID들을 읽고, 마지막으로 읽은 TID 집합을 기억한다.
+
+    .. note::
+
+        * 기억하는 집합은 객체마다 따로 가지므로, 차이를 따로 소비하는 사용처마다 객체를 하나씩 만들어야 한다.
+    """
+    __slots__ = ('_tids',)
+
+    _tids: FrozenSet[int]
+
+    def __init__(self) -> None:
+        self._tids = frozenset()
+
+    @property
+    def tids(self) -> FrozenSet[int]:
+        """
+        :return: 마지막 :meth:`update` 에서 읽은 TID들
+        :rtype: typing.FrozenSet[int]
+        """
+        return self._tids
+
+    @abstractmethod
+    def scan(self) -> FrozenSet[int]:
+        """
+        현재 범위에 속한 모든 TID를 읽는다. 기억하고 있는 집합은 바꾸지 않는다.
+
+        :return: 범위에 속한 TID들. 범위가 더 이상 존재하지 않는다면 빈 집합.
+        :rtype: typing.FrozenSet[int]
+        """
+        pass
+
+    def update(self) -> TidDiff:
+        """
+        :meth:`scan` 으로 TID들을 다시 읽어 기억하고, 직전 호출과의 차이를 반환한다.
+        처음 호출하면 모든 TID가 :attr:`TidDiff.added` 에 담긴다.
+
+        :return: 직전 호출 이후로 생기거나 사라진 TID들
+        :rtype: benchmon.utils.tid_tracker.TidDiff
+        """
+        current = self.scan()
+        diff = TidDiff(current - self._tids, self._tids - current)
+        self._tids = current
+        return diff
+
+    def reset(self) -> None:
+        """ 기억하고 있는 TID 집합을 비운다. """
+        self._tids = frozenset()
+
+
+class ProcessTreeTidTracker(TidTracker):
+    """
+    `root_pid` 프로세스와 그 모든 자손 프로세스들의 TID를 `/proc/<pid>/task` 에서 읽는다.
+
+    자손 프로세스는 `/proc/<pid>/task/<tid>/children` 으로 찾으며,
+    커널이 그 파일을 지원하지 않는다면 (``CONFIG_PROC_CHILDREN``) 모든 `/proc/<pid>/stat` 의 부모 PID로 찾는다.
+    """
+    __slots__ = ('_root_pid',)
+
+    _root_pid: int
+
+    def __init__(self, root_pid: int) -> None:
+        super().__init__()
+
+        self._root_pid = root_pid
+
+    @property
+    def root_pid(self) -> int:
+        return self._root_pid
+
+    def scan(self) -> FrozenSet[int]:
+        tids: List[int] = list()
+        pids = [self._root_pid]
+        children_map: Optional[Dict[int, List[int]]] = None
+
+        while len(pids) != 0:
+            pid = pids.pop()
+            task_dir = str(proc_path(str(pid), 'task'))
+
+            try:
+                task_ids = tuple(map(int, os.listdir(task_dir)))
+            except FileNotFoundError:
+                # the process is already terminated
+                continue
+
+            tids.extend(task_ids)
+
+            if children_map is None:
+                for tid in task_ids:
+                    try:
+                        pids.extend(_read_children(f'{task_dir}/{tid}/children'))
+                    except FileNotFoundError:
+                        if os.path.isdir(f'{task_dir}/{tid}'):
+                            # the kernel does not support `children`
+                            children_map = _children_map()
+                            break
+                        # otherwise the thread is terminated while reading
+
+            if children_map is not None:
+                pids.extend(children_map.get(pid, ()))
+
+        return frozenset(tids)
+
+
+class CGroupTidTracker(TidTracker):
+    """
+    cgroup에 속한 모든 TID를 cgroup v2의 `cgroup.threads` 혹은 cgroup v1의 `tasks` 에서 읽는다.
+    한번의 읽기로 그룹 전체를 얻으므로, 그룹에 속한 프로세스의 수와 상관없이 비용이 일정하다.
+    """
+    __slots__ = ('_path',)
+
+    _path: str
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: TID가 나열된 cgroup 파일의 경로
+        :type path: str
+        """
+        super().__init__()
+
+        self._path = path
+
+    @classmethod
+    def of_group(cls, group_name: str, controllers: Iterable[str]) -> Optional[CGroupTidTracker]:
+        """
+        `group_name` cgroup의 tracker를 만든다.
+
+        :param group_name: cgroup의 이름 (cgroup 파일 시스템의 root로부터의 경로)
+        :type group_name: str
+        :param controllers: 그룹이 사용하는 서브 시스템들. cgroup v1에서는 그 중 첫번째 서브 시스템의 그룹을 읽는다.
+        :type controllers: typing.Iterable[str]
+        :return: 그룹을 찾을 수 없다면 ``None``
+        :rtype: typing.Optional[benchmon.utils.tid_tracker.CGroupTidTracker]
+        """
+        group_name = group_name.strip('/')
+
+        if is_unified():
+            path = sys_path('fs/cgroup', group_name, 'cgroup.threads')
+        else:
+            controller = next(iter(controllers), None)
+            if controller is None:
+                return None
+            path = sys_path('fs/cgroup', controller, group_name, 'tasks')
+
+        if not path.exists():
+            return None
+
+        return cls(str(path))
+
+    def scan(self) -> FrozenSet[int]:
+        try:
+            with open(self._path, 'rb') as fp:
+                return frozenset(map(int, fp.read().split()))
+        except FileNotFoundError:
+            return frozenset()
+
+
+def _read_children(path: str) -> List[int]:
+    try:
+        with open(path, 'rb') as fp:
+            return list(map(int, fp.read().split()))
+    except ProcessLookupError:
+        return list()
+
+
+def _children_map() -> Dict[int, List[int]]:
+    """
+    :return: 모든 프로세스의 부모 PID 별 자식 PID 목록
+    :rtype: typing.Dict[int, typing.List[int]]
+    """
+    proc_root = str(proc_path())
+    children: Dict[int, List[int]] = dict()
+
+    for entry in os.listdir(proc_root):
+        if not entry.isdigit():
+            continue
+
+        try:
+            with open(f'{proc_root}/{entry}/stat', 'rb') as fp:
+                stat = fp.read()
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+
+        # the second field (comm) may contain spaces and parentheses
+        ppid = int(stat[stat.rfind(b')') + 2:].split(maxsplit=2)[1])
+        children.setdefault(ppid, list()).append(int(entry))
+
+    return children
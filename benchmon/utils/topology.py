@@ -0,0 +1,390 @@
+# coding: UTF-8
+
+"""
+:mod:`topology` -- 지연 계산되는 하드웨어 구성 정보
+============================================================
+
+소켓, 코어, SMT 형제 코어, LLC의 CBM, resctrl의 모니터링 기능, RAPL 도메인처럼 부팅 이후 바뀌지 않는 하드웨어 정보를
+:class:`HardwareTopology` 로 모아, :func:`hardware_topology` 가 처음 호출될 때 한번만 읽는다.
+따라서 :mod:`benchmon` 을 import 하는 것 만으로는 `/sys` 를 읽거나 resctrl을 mount하지 않는다.
+
+:func:`set_cache_file` (또는 환경 변수 ``BENCHMON_TOPOLOGY_CACHE``) 로 캐시 파일이 지정되면,
+읽은 정보를 부팅 id (`/proc/sys/kernel/random/boot_id`) 및 online 코어 목록과 함께 저장하고,
+같은 부팅에서 online 코어가 바뀌지 않았다면 `/sys` 대신 캐시 파일을 읽는다.
+캐시 파일은 현재 사용자 소유이고 다른 사용자가 쓸 수 없을 때만 읽으므로, root로 실행한다면 `/run` 이나 `/var/cache`
+처럼 root만 쓸 수 있는 폴더에 두어야 한다.
+
+:func:`~benchmon.utils.sysfs.set_root` 로 root가 바뀌면 계산된 정보는 버려진다.
+
+.. module:: benchmon.utils.topology
+    :synopsis: 지연 계산되는 하드웨어 구성 정보
+.. moduleauthor:: Byeonghoon Yoo <bh322yoo@gmail.com>
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import stat
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from .ranges import Ranges
+from .sysfs import is_simulated, on_root_changed, proc_path, sys_path
+
+# increase when the layout of the cache file is changed
+_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ResCtrlInfo:
+    """ resctrl 파일 시스템의 `info` 에서 읽은 정보 """
+    __slots__ = ('mon_features', 'mon_names', 'cbm_mask', 'min_cbm_bits')
+
+    mon_features: Tuple[str, ...]
+    """ `info/L3_MON/mon_features` 에 listing된 모니터링 기능들 """
+    mon_names: Tuple[str, ...]
+    """ `mon_data` 안의 L3 모니터 디렉토리 이름들. 이름 순서 (현재는 소켓 번호 순서와 같음) 로 정렬되어있다. """
+    cbm_mask: str
+    """ `info/L3/cbm_mask` """
+    min_cbm_bits: int
+    """ `info/L3/min_cbm_bits` """
+
+    @property
+    def cbm_bits(self) -> int:
+        """
+        :return: CBM의 비트 수
+        :rtype: int
+        """
+        return int(self.cbm_mask, 16).bit_length()
+
+
+@dataclass(frozen=True)
+class RaplDomain:
+    """ `/sys/class/powercap/intel-rapl` 의 RAPL 도메인 """
+    __slots__ = ('path', 'name', 'sub_domains')
+
+    path: str
+    """ `/sys` 로부터의 상대 경로 """
+    name: str
+    """ 도메인의 이름 (e.g. `package-0`, `core`, `dram`) """
+    sub_domains: Tuple[RaplDomain, ...]
+
+
+@dataclass(frozen=True)
+class HardwareTopology:
+    """
+    부팅 이후 바뀌지 않는다고 가정하는 하드웨어 구성 정보.
+    직접 생성하지 않고 :func:`hardware_topology` 로 얻는다.
+    """
+    __slots__ = ('online_cpus', 'online_sockets', 'possible_sockets', 'mem_sockets', 'socket_cores', 'core_socket',
+                 'smt_siblings', 'resctrl', 'rapl_domains')
+
+    online_cpus: Tuple[int, ...]
+    online_sockets: Tuple[int, ...]
+    possible_sockets: Tuple[int, ...]
+    mem_sockets: Tuple[int, ...]
+    """ 메모리가 있는 소켓 (NUMA 노드) 들 """
+    socket_cores: Mapping[int, FrozenSet[int]]
+    """ key: 소켓 번호, value: 그 소켓에 속한 코어 번호들 """
+    core_socket: Mapping[int, int]
+    """ key: 코어 번호, value: 그 코어가 속한 소켓 번호 """
+    smt_siblings: Mapping[int, Tuple[int, ...]]
+    """ key: 코어 번호, value: 자신을 포함한 SMT 형제 코어 번호들 """
+    resctrl: Optional[ResCtrlInfo]
+    """ resctrl이 지원되지 않는다면 ``None`` """
+    rapl_domains: Tuple[RaplDomain, ...]
+    """ 소켓 (package) 별 RAPL 도메인들 """
+
+    @classmethod
+    def discover(cls) -> HardwareTopology:
+        """
+        :func:`~benchmon.utils.sysfs.sys_path` 기준의 `/sys` 에서 하드웨어 정보를 읽는다.
+
+        :return: 읽은 하드웨어 정보
+        :rtype: benchmon.utils.topology.HardwareTopology
+        """
+        node_path = sys_path('devices/system/node')
+        cpu_path = sys_path('devices/system/cpu')
+
+        online_sockets = _read_ranges(node_path / 'online')
+        socket_cores = {
+            socket_id: frozenset(_read_ranges(node_path / f'node{socket_id}' / 'cpulist'))
+            for socket_id in online_sockets
+        }
+        online_cpus = _read_ranges(cpu_path / 'online')
+
+        smt_siblings: Dict[int, Tuple[int, ...]] = dict()
+        for core_id in online_cpus:
+            siblings_path = cpu_path / f'cpu{core_id}' / 'topology' / 'thread_siblings_list'
+            smt_siblings[core_id] = _read_ranges(siblings_path) if siblings_path.exists() else (core_id,)
+
+        return cls(
+                online_cpus=online_cpus,
+                online_sockets=online_sockets,
+                possible_sockets=_read_ranges(node_path / 'possible'),
+                mem_sockets=_read_ranges(node_path / 'has_memory'),
+                socket_cores=socket_cores,
+                core_socket={core_id: socket_id for socket_id, cores in socket_cores.items() for core_id in cores},
+                smt_siblings=smt_siblings,
+                resctrl=_discover_resctrl(),
+                rapl_domains=_discover_rapl(sys_path('class/powercap/intel-rapl'))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: JSON으로 저장할 수 있는 형태로 변환된 정보
+        :rtype: typing.Dict[str, typing.Any]
+        """
+        return dict(
+                online_cpus=self.online_cpus,
+                online_sockets=self.online_sockets,
+                possible_sockets=self.possible_sockets,
+                mem_sockets=self.mem_sockets,
+                socket_cores={str(k): sorted(v) for k, v in self.socket_cores.items()},
+                smt_siblings={str(k): v for k, v in self.smt_siblings.items()},
+                resctrl=None if self.resctrl is None else dict(
+                        mon_features=self.resctrl.mon_features,
+                        mon_names=self.resctrl.mon_names,
+                        cbm_mask=self.resctrl.cbm_mask,
+                        min_cbm_bits=self.resctrl.min_cbm_bits
+                ),
+                rapl_domains=tuple(map(_rapl_to_dict, self.rapl_domains))
+        )
+
+    @classmethod
+    def from_dict(cls, source: Mapping[str, Any]) -> HardwareTopology:
+        """
+        :meth:`to_dict` 로 변환된 정보를 다시 객체로 만든다.
+
+        :param source: :meth:`to_dict` 의 결과
+        :type source: typing.Mapping[str, typing.Any]
+        :return: 만들어진 객체
+        :rtype: benchmon.utils.topology.HardwareTopology
+        """
+        socket_cores = {int(k): frozenset(v) for k, v in source['socket_cores'].items()}
+        resctrl = source['resctrl']
+
+        return cls(
+                online_cpus=tuple(source['online_cpus']),
+                online_sockets=tuple(source['online_sockets']),
+                possible_sockets=tuple(source['possible_sockets']),
+                mem_sockets=tuple(source['mem_sockets']),
+                socket_cores=socket_cores,
+                core_socket={core_id: socket_id for socket_id, cores in socket_cores.items() for core_id in cores},
+                smt_siblings={int(k): tuple(v) for k, v in source['smt_siblings'].items()},
+                resctrl=None if resctrl is None else ResCtrlInfo(
+                        mon_features=tuple(resctrl['mon_features']),
+                        mon_names=tuple(resctrl['mon_names']),
+                        cbm_mask=resctrl['cbm_mask'],
+                        min_cbm_bits=resctrl['min_cbm_bits']
+                ),
+                rapl_domains=tuple(map(_rapl_from_dict, source['rapl_domains']))
+        )
+
+
+def _read_ranges(path: Path) -> Tuple[int, ...]:
+    return tuple(sorted(Ranges.from_str(path.read_text().strip())))
+
+
+def _discover_resctrl() -> Optional[ResCtrlInfo]:
+    mount_point = sys_path('fs/resctrl')
+
+    # FIXME: H/W support check before adjust config to benchmark
+    if not mount_point.exists():
+        return None
+
+    ensure_resctrl_mounted()
+
+    return ResCtrlInfo(
+            mon_features=tuple((mount_point / 'info' / 'L3_MON' / 'mon_features').read_text('ASCII').strip().split()),
+            # filter L3 related monitors and sort by name (currently same as socket number)
+            mon_names=tuple(sorted(
+                    m.name for m in mount_point.joinpath('mon_data').glob('mon_L3_*')
+                    if re.match(r'mon_L3_(\d+)', m.name)
+            )),
+            cbm_mask=mount_point.joinpath('info/L3/cbm_mask').read_text(encoding='ASCII').strip(),
+            min_cbm_bits=int((mount_point / 'info' / 'L3' / 'min_cbm_bits').read_text())
+    )
+
+
+def _discover_rapl(parent: Path, prefix: str = 'intel-rapl:') -> Tuple[RaplDomain, ...]:
+    domains = list()
+
+    while True:
+        path = parent / f'{prefix}{len(domains)}'
+        if not path.exists():
+            break
+
+        domains.append(RaplDomain(
+                path=str(path.relative_to(sys_path())),
+                name=(path / 'name').read_text().strip(),
+                sub_domains=_discover_rapl(path, f'{path.name}:')
+        ))
+
+    return tuple(domains)
+
+
+def _rapl_to_dict(domain: RaplDomain) -> Dict[str, Any]:
+    return dict(path=domain.path, name=domain.name, sub_domains=tuple(map(_rapl_to_dict, domain.sub_domains)))
+
+
+def _rapl_from_dict(source: Mapping[str, Any]) -> RaplDomain:
+    return RaplDomain(source['path'], source['name'], tuple(map(_rapl_from_dict, source['sub_domains'])))
+
+
+_topology: Optional[HardwareTopology] = None
+_cache_file: Optional[Path] = Path(os.environ['BENCHMON_TOPOLOGY_CACHE']) \
+    if 'BENCHMON_TOPOLOGY_CACHE' in os.environ else None
+_mounted: bool = False
+
+
+def hardware_topology() -> HardwareTopology:
+    """
+    처음 호출될 때 하드웨어 정보를 읽고 (캐시 파일이 유효하다면 캐시 파일에서), 이후에는 그 결과를 반환한다.
+
+    :return: 하드웨어 정보
+    :rtype: benchmon.utils.topology.HardwareTopology
+    """
+    global _topology
+
+    if _topology is None:
+        topology = _load_cache()
+
+        if topology is None:
+            topology = HardwareTopology.discover()
+            _store_cache(topology)
+
+        _topology = topology
+
+    return _topology
+
+
+def set_cache_file(path: Optional[Path]) -> None:
+    """
+    :func:`hardware_topology` 의 결과를 저장할 캐시 파일을 지정한다.
+
+    :param path: 캐시 파일의 경로. ``None`` 일 경우 캐시 파일을 사용하지 않는다.
+    :type path: typing.Optional[pathlib.Path]
+    """
+    global _cache_file
+    _cache_file = path
+
+
+@on_root_changed
+def invalidate() -> None:
+    """:func:`hardware_topology` 가 다음 호출될 때 하드웨어 정보를 다시 읽도록 한다. 캐시 파일은 사용된다."""
+    global _topology, _mounted
+    _topology = None
+    _mounted = False
+
+
+def boot_id() -> Optional[str]:
+    """
+    :return: 현재 부팅의 id. 알 수 없다면 ``None``
+    :rtype: typing.Optional[str]
+    """
+    try:
+        return proc_path('sys/kernel/random/boot_id').read_text().strip()
+    except OSError:
+        return None
+
+
+def _cache_key() -> Optional[Dict[str, Any]]:
+    current_boot = boot_id()
+    if current_boot is None:
+        return None
+
+    # online_cpus, socket_cores and smt_siblings change when cores are offlined (e.g. by `hyper_threading_guard`)
+    try:
+        online = sys_path('devices/system/cpu/online').read_text().strip()
+    except OSError:
+        return None
+
+    return dict(version=_CACHE_VERSION, boot_id=current_boot, sys_root=str(sys_path()), online_cpus=online)
+
+
+def _load_cache() -> Optional[HardwareTopology]:
+    if _cache_file is None:
+        return None
+
+    key = _cache_key()
+    if key is None:
+        return None
+
+    try:
+        fd = os.open(_cache_file, os.O_RDONLY | os.O_NOFOLLOW | os.O_CLOEXEC)
+    except OSError:
+        return None
+
+    try:
+        with os.fdopen(fd) as fp:
+            file_stat = os.fstat(fp.fileno())
+            # trust only a regular file that no other user could have written
+            if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_uid != os.geteuid() \
+                    or file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                return None
+
+            cached = json.load(fp)
+
+        if cached.get('key') != key:
+            return None
+
+        topology = HardwareTopology.from_dict(cached['topology'])
+
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+    if topology.resctrl is not None:
+        ensure_resctrl_mounted()
+
+    return topology
+
+
+def _store_cache(topology: HardwareTopology) -> None:
+    if _cache_file is None:
+        return
+
+    key = _cache_key()
+    if key is None:
+        return
+
+    # a cache that can not be written is just ignored
+    try:
+        _cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # `mkstemp` creates a new file (O_EXCL, mode 0600) with an unpredictable name
+        fd, tmp_name = tempfile.mkstemp(prefix=f'.{_cache_file.name}.', dir=_cache_file.parent)
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(dict(key=key, topology=topology.to_dict()), fp)
+        os.replace(tmp_name, _cache_file)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
+
+def ensure_resctrl_mounted() -> None:
+    """
+    resctrl 파일 시스템이 mount 되어있지 않다면 mount 한다.
+    root가 :func:`~benchmon.utils.sysfs.set_root` 로 바뀐 경우에는 아무것도 하지 않는다.
+    """
+    global _mounted
+
+    if _mounted:
+        return
+
+    mount_point = sys_path('fs/resctrl')
+    if mount_point.exists() and not mount_point.is_mount() and not is_simulated():
+        # TODO: replace with non-shell implementation
+        subprocess.check_call(('mount', '-t', 'resctrl', 'resctrl', str(mount_point)))
+
+    _mounted = True
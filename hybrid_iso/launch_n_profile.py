@@ -1,30 +1,55 @@
 # coding: UTF-8
 
+from __future__ import annotations
+
 import argparse
 import asyncio
 import glob
+import json
 import logging
 import signal
 import sys
 from itertools import chain
 from pathlib import Path
-from typing import Iterable, List, TYPE_CHECKING, Tuple
+from typing import Callable, Iterable, List, Set, TYPE_CHECKING, Tuple
 
+from benchmon.benchmark import StartBarrier
 from benchmon.configs.parsers import BenchParser, PerfParser, PrivilegeParser, RabbitMQParser
-from benchmon.monitors import PerfMonitor, PowerMonitor, RDTSCMonitor, ResCtrlMonitor, RuntimeMonitor
+from benchmon.monitors import PerfMonitor, PowerMonitor, RDTSCMonitor, ResCtrlMonitor, RuntimeMonitor, SystemSampler
 from benchmon.monitors.messages.handlers import RabbitMQHandler
-from benchmon.utils.hyperthreading import hyper_threading_guard
+from benchmon.utils.privilege import drop_privilege
+from benchmon.utils.topology import set_cache_file
 from .benchmark.constraints import RabbitMQConstraint
 from .configs.parsers import LauncherParser
 from .monitors.messages.handlers import HybridIsoMerger, StorePerf, StoreResCtrl, StoreRuntime
+from .manifest import SweepManifest
+from .repetition import RepetitionPolicy, RepetitionRunner
+from .scheduler import WorkspaceScheduler
 
 if TYPE_CHECKING:
-    from benchmon.benchmark import BaseBenchmark
+    from benchmon.benchmark import BaseBenchmark, StartReport
     from benchmon.configs.containers import PerfConfig, RabbitMQConfig, PrivilegeConfig
     from .configs.containers import LauncherConfig
 
 MIN_PYTHON = (3, 7)
 
+# cancel functions of the running experiments, which are called on SIGINT
+_cancel_handlers: Set[Callable[[], None]] = set()
+
+
+def _cancel_all() -> None:
+    for handler in tuple(_cancel_handlers):
+        handler()
+
+
+def _store_start_report(workspace: Path, privilege_config: PrivilegeConfig, report: StartReport) -> None:
+    result_path = workspace / 'monitored' / 'start.json'
+    privilege_cfg = privilege_config.result
+
+    with drop_privilege(privilege_cfg.user, privilege_cfg.group):
+        result_path.parent.mkdir(exist_ok=True, parents=True)
+        result_path.write_text(json.dumps(report.to_dict()))
+
 
 async def launch(workspace: Path, silent: bool, verbose: bool) -> bool:
     perf_config: PerfConfig = PerfParser(workspace).parse()
@@ -32,11 +57,13 @@ async def launch(workspace: Path, silent: bool, verbose: bool) -> bool:
     launcher_config: LauncherConfig = LauncherParser(workspace).parse()
     privilege_config: PrivilegeConfig = PrivilegeParser(workspace).parse()
 
+    sampler = SystemSampler(perf_config.interval)
+
     benches: List[BaseBenchmark] = [
         await bench_cfg.generate_builder(privilege_config, logging.DEBUG if verbose else logging.INFO)
             .add_constraint(RabbitMQConstraint(rabbit_mq_config))
-            .add_monitor(RDTSCMonitor(perf_config.interval))
-            .add_monitor(ResCtrlMonitor(perf_config.interval))
+            .add_monitor(RDTSCMonitor(perf_config.interval, sampler=sampler))
+            .add_monitor(ResCtrlMonitor(perf_config.interval, sampler=sampler))
             .add_monitor(PerfMonitor(perf_config))
             .add_monitor(RuntimeMonitor())
             .add_monitor(PowerMonitor())
@@ -59,10 +86,10 @@ async def launch(workspace: Path, silent: bool, verbose: bool) -> bool:
         for t in current_tasks:  # type: asyncio.Task
             t.cancel()
 
-    loop = asyncio.get_event_loop()
-    loop.add_signal_handler(signal.SIGINT, cancel_current_tasks)
+    _cancel_handlers.add(cancel_current_tasks)
 
-    with hyper_threading_guard(launcher_config.hyper_threading):
+    # Hyper-Threading is set by the scheduler for all concurrently running experiments
+    try:
         current_tasks = tuple(asyncio.create_task(bench.start_and_pause(silent)) for bench in benches)
         _, pending = await asyncio.wait(current_tasks)
 
@@ -70,25 +97,37 @@ async def launch(workspace: Path, silent: bool, verbose: bool) -> bool:
             return False
 
         if not is_cancelled:
-            for bench in benches:
-                bench.resume()
-
-            current_tasks = tuple(asyncio.create_task(bench.monitor()) for bench in benches)
-            if launcher_config.stops_with_the_first:
-                return_when = asyncio.FIRST_COMPLETED
-            else:
-                return_when = asyncio.ALL_COMPLETED
-            _, pending = await asyncio.wait(current_tasks, return_when=return_when)
-
-            for task in pending:  # type: asyncio.Task
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    # TODO: is this right?
-                    pass
-
-    loop.remove_signal_handler(signal.SIGINT)
+            with StartBarrier(benches) as barrier:
+                start_report = barrier.fire()
+
+            logging.getLogger('benchmon').info(
+                    f'{len(benches)} benchmarks are resumed within {start_report.skew * 1e6:.1f} us')
+            _store_start_report(workspace, privilege_config, start_report)
+
+            sampler_task = asyncio.create_task(sampler.run())
+            try:
+                current_tasks = tuple(asyncio.create_task(bench.monitor()) for bench in benches)
+                if launcher_config.stops_with_the_first:
+                    return_when = asyncio.FIRST_COMPLETED
+                else:
+                    return_when = asyncio.ALL_COMPLETED
+                _, pending = await asyncio.wait(current_tasks, return_when=return_when)
+
+                for task in pending:  # type: asyncio.Task
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        # TODO: is this right?
+                        pass
+
+            finally:
+                # the sampler has to be stopped even if the monitoring failed, so that its pipeline is ended
+                await sampler.stop()
+                await sampler_task
+
+    finally:
+        _cancel_handlers.discard(cancel_current_tasks)
 
     logger = logging.getLogger('benchmon')
 
@@ -111,19 +150,69 @@ async def main() -> None:
                         help='Directory path where the config file (config.json) exist. (support wildcard *)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Print more detail log')
     parser.add_argument('-s', '--silent', action='store_true', help='Do not print any log to stdin.')
-    parser.add_argument('--expt-interval', type=int, default=10, help='interval (sec) to sleep between each experiment')
+    parser.add_argument('--expt-interval', type=int, default=10,
+                        help='interval (sec) to sleep before reusing the resources of a finished experiment')
+    parser.add_argument('-j', '--max-concurrent', type=int, default=1,
+                        help='Maximum number of experiments that run concurrently if their resources do not overlap')
+    parser.add_argument('--socket-exclusive', action='store_true',
+                        help='Do not run experiments that use the same socket concurrently')
+    parser.add_argument('-r', '--repeat', type=int, default=1,
+                        help='Number of measured repetitions of each experiment (excluding warm-ups)')
+    parser.add_argument('--warm-up', type=int, default=0,
+                        help='Number of the first repetitions that are discarded from the statistics')
+    parser.add_argument('--max-repeat', type=int, default=None,
+                        help='Keep repeating until the confidence interval of the runtime converges, '
+                             'but at most this many times (excluding warm-ups)')
+    parser.add_argument('--target-ci-width', type=float, default=0.02,
+                        help='Relative width (width / mean) of the confidence interval of the runtime '
+                             'to stop repeating. Used only with --max-repeat')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help='Confidence level of the confidence interval of the runtime')
+    parser.add_argument('--manifest', type=str, default=None,
+                        help='File to record the progress of the experiments, so that rerunning the same command '
+                             'skips the completed ones. (default: .hybrid_iso_manifest.json in the common parent '
+                             'directory of the experiments)')
+    parser.add_argument('--rerun', action='store_true',
+                        help='Run all experiments even if they are completed according to the manifest')
+    parser.add_argument('--topology-cache', type=str, default=None,
+                        help='File to cache the hardware topology until the next reboot. It should be in a directory '
+                             'that only root can write, e.g. /run/benchmon/topology.json (default: disabled)')
 
     args = parser.parse_args()
 
-    dirs: Iterable[str] = chain(*(glob.glob(path) for path in args.config_dir))
+    # sorted so that the generated workspaces (e.g. by `hybrid_iso.sweep`) run in the order of their names
+    dirs: Iterable[str] = chain(*(sorted(glob.glob(path)) for path in args.config_dir))
 
     silent: bool = args.silent
     verbose: bool = args.verbose
     interval: int = args.expt_interval
 
-    for i, workspace in enumerate(dirs):
-        if i is not 0:
-            await asyncio.sleep(interval)
+    set_cache_file(Path(args.topology_cache) if args.topology_cache else None)
+
+    if args.max_repeat is None:
+        policy = RepetitionPolicy(args.repeat, args.warm_up, args.repeat, None, args.confidence)
+    else:
+        policy = RepetitionPolicy(args.repeat, args.warm_up, args.max_repeat, args.target_ci_width, args.confidence)
+
+    workspaces: Tuple[Path, ...] = tuple(map(Path, dirs))
+    manifest = SweepManifest(Path(args.manifest) if args.manifest else SweepManifest.default_path(workspaces),
+                             policy)
+
+    if not args.rerun:
+        completed = tuple(workspace for workspace in workspaces if manifest.is_completed(workspace))
+        if len(completed) != 0:
+            logging.getLogger('benchmon').info(f'Skipping {len(completed)} experiments that are already completed '
+                                               f'according to {manifest.path}.')
+            workspaces = tuple(workspace for workspace in workspaces if workspace not in completed)
+
+    runner = RepetitionRunner(lambda workspace: launch(workspace, silent, verbose), policy, interval)
+    scheduler = WorkspaceScheduler(workspaces, manifest.track(runner),
+                                   args.max_concurrent, args.socket_exclusive, interval)
+
+    loop = asyncio.get_event_loop()
+    loop.add_signal_handler(signal.SIGINT, _cancel_all)
 
-        if not await launch(Path(workspace), silent, verbose):
-            break
+    try:
+        await scheduler.run()
+    finally:
+        loop.remove_signal_handler(signal.SIGINT)
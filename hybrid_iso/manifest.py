@@ -0,0 +1,243 @@
+# coding: UTF-8
+
+"""
+:mod:`manifest` -- 여러 workspace를 실행하는 sweep의 진행 기록
+===================================================================
+
+:class:`SweepManifest` 는 각 workspace의 `config.json` 의 hash, 실행 상태, 결과 파일들의 checksum을 하나의 파일에 기록한다.
+기록은 매번 임시 파일에 쓴 뒤 `rename` 하므로, 실행 도중 프로세스가 죽거나 시스템이 재부팅 되어도 항상 온전한 기록이 남는다.
+
+같은 명령어를 다시 실행하면, 설정과 반복 설정 (:class:`~hybrid_iso.repetition.RepetitionPolicy`), 결과 파일이 바뀌지 않은 채로
+성공한 workspace들은 건너뛰고 실패했거나, 취소되었거나, 실행 도중 중단된 workspace들만 다시 실행한다.
+
+.. module:: hybrid_iso.manifest
+    :synopsis: 여러 workspace를 실행하는 sweep의 진행 기록
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import enum
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from .repetition import RepetitionPolicy
+
+# directories that each run of a workspace writes its results into
+_OUTPUT_DIRS = ('monitored', 'generated', 'repetitions')
+
+_VERSION = 1
+
+
+class RunStatus(str, enum.Enum):
+    """ manifest에 기록되는 workspace의 실행 상태 """
+    RUNNING = 'running'
+    """ 실행중. 다음 실행 때 이 상태로 남아있다면 그 sweep이 도중에 중단된 것이다. """
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+class SweepManifest:
+    """
+    sweep에 포함된 workspace들의 실행 기록.
+
+    .. note::
+
+        * 같은 event loop에서만 사용해야 한다. (동시에 실행되는 workspace들이 같은 객체를 갱신한다)
+    """
+    __slots__ = ('_path', '_policy', '_entries', '_logger')
+
+    _path: Path
+    _policy: Dict[str, Any]
+    _entries: Dict[str, Dict[str, Any]]
+    _logger: logging.Logger
+
+    def __init__(self, path: Path, policy: RepetitionPolicy) -> None:
+        """
+        `path` 에 기록된 manifest를 읽는다. 파일이 없다면 빈 manifest를 만든다.
+
+        :param path: manifest 파일의 경로
+        :type path: pathlib.Path
+        :param policy: 이번 sweep의 반복 설정. 다른 설정으로 성공한 workspace는 다시 실행한다.
+        :type policy: hybrid_iso.repetition.RepetitionPolicy
+        """
+        self._path = path
+        self._policy = dataclasses.asdict(policy)
+        self._logger = logging.getLogger('benchmon')
+
+        try:
+            with path.open() as fp:
+                content = json.load(fp)
+        except FileNotFoundError:
+            content = dict()
+        except json.JSONDecodeError:
+            # only a manually edited file can be broken, since the file is always replaced atomically
+            self._logger.warning(f'Ignoring the broken manifest {path}.')
+            content = dict()
+
+        self._entries = content.get('workspaces', dict())
+
+    @classmethod
+    def default_path(cls, workspaces: Iterable[Path]) -> Path:
+        """
+        :param workspaces: sweep에 포함된 workspace들
+        :type workspaces: typing.Iterable[pathlib.Path]
+        :return: workspace들의 공통 부모 폴더에 위치한 manifest 파일의 경로
+        :rtype: pathlib.Path
+        """
+        parents = tuple(str(workspace.resolve().parent) for workspace in workspaces)
+        if len(parents) == 0:
+            return Path('.hybrid_iso_manifest.json')
+        return Path(os.path.commonpath(parents)) / '.hybrid_iso_manifest.json'
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _key(self, workspace: Path) -> str:
+        return os.path.relpath(workspace.resolve(), self._path.resolve().parent)
+
+    def status(self, workspace: Path) -> Optional[RunStatus]:
+        """
+        :return: `workspace` 의 마지막 실행 상태. 실행된 적이 없다면 ``None``
+        :rtype: typing.Optional[hybrid_iso.manifest.RunStatus]
+        """
+        entry = self._entries.get(self._key(workspace))
+        if entry is None:
+            return None
+        return RunStatus(entry['status'])
+
+    def is_completed(self, workspace: Path) -> bool:
+        """
+        `workspace` 가 이번 sweep과 같은 반복 설정으로 성공적으로 실행된 이후로
+        `config.json` 과 결과 파일들이 바뀌지 않았는지 확인한다.
+
+        :param workspace: 확인할 workspace
+        :type workspace: pathlib.Path
+        :return: 다시 실행할 필요가 없다면 ``True``
+        :rtype: bool
+        """
+        entry = self._entries.get(self._key(workspace))
+        if entry is None or entry['status'] != RunStatus.COMPLETED:
+            return False
+
+        if entry['config_hash'] != _config_hash(workspace):
+            self._logger.info(f'The config of {workspace} is changed since the last run.')
+            return False
+
+        if entry.get('policy') != self._policy:
+            self._logger.info(f'{workspace} was run with different repetition settings.')
+            return False
+
+        if entry['outputs'] != _output_checksums(workspace):
+            self._logger.info(f'The results of {workspace} are changed or missing since the last run.')
+            return False
+
+        return True
+
+    def track(self, launcher: Callable[[Path], Awaitable[bool]]) -> Callable[[Path], Awaitable[bool]]:
+        """
+        `launcher` 가 workspace를 실행하기 전과 후의 상태를 기록하도록 감싼다.
+
+        :param launcher: workspace 하나를 실행하는 함수
+        :type launcher: typing.Callable[[pathlib.Path], typing.Awaitable[bool]]
+        :return: `launcher` 와 같은 일을 하며 상태를 기록하는 함수
+        :rtype: typing.Callable[[pathlib.Path], typing.Awaitable[bool]]
+        """
+
+        async def tracked(workspace: Path) -> bool:
+            self._update(workspace, RunStatus.RUNNING, started=time.time())
+
+            try:
+                succeeded = await launcher(workspace)
+            except BaseException:
+                self._update(workspace, RunStatus.FAILED, finished=time.time())
+                raise
+
+            if not succeeded:
+                self._update(workspace, RunStatus.CANCELLED, finished=time.time())
+                return False
+
+            loop = asyncio.get_running_loop()
+            outputs = await loop.run_in_executor(None, _output_checksums, workspace)
+
+            if len(outputs) == 0:
+                self._logger.warning(f'{workspace} has finished without any result.')
+                self._update(workspace, RunStatus.FAILED, finished=time.time())
+                return False
+
+            self._update(workspace, RunStatus.COMPLETED, finished=time.time(), outputs=outputs)
+            return True
+
+        return tracked
+
+    def _update(self, workspace: Path, status: RunStatus, **fields: Any) -> None:
+        key = self._key(workspace)
+
+        if status is RunStatus.RUNNING:
+            entry = self._entries[key] = {
+                'config_hash': _config_hash(workspace),
+                'policy': self._policy,
+                'outputs': dict(),
+            }
+        else:
+            entry = self._entries[key]
+
+        entry['status'] = status.value
+        entry.update(fields)
+
+        self._write()
+
+    def _write(self) -> None:
+        content = json.dumps({'version': _VERSION, 'workspaces': self._entries}, indent=4, sort_keys=True)
+        tmp_path = self._path.with_name(f'.{self._path.name}.{os.getpid()}.tmp')
+
+        with tmp_path.open('w') as fp:
+            fp.write(content)
+            fp.flush()
+            os.fsync(fp.fileno())
+
+        os.replace(tmp_path, self._path)
+
+        # persist the rename itself
+        dir_fd = os.open(self._path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _config_hash(workspace: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256((workspace / 'config.json').read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _output_checksums(workspace: Path) -> Dict[str, str]:
+    """
+    :return: 결과 파일들의 `workspace` 로부터의 경로 별 SHA-256
+    :rtype: typing.Dict[str, str]
+    """
+    checksums: Dict[str, str] = dict()
+
+    for name in _OUTPUT_DIRS:
+        for root, _, files in os.walk(workspace / name):
+            for file_name in files:
+                path = Path(root) / file_name
+                digest = hashlib.sha256()
+
+                with path.open('rb') as fp:
+                    for chunk in iter(lambda: fp.read(1 << 20), b''):
+                        digest.update(chunk)
+
+                checksums[str(path.relative_to(workspace))] = digest.hexdigest()
+
+    return checksums
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional, TYPE_CHECKING, Type, TypeVar, Union
+from typing import Dict, List, Optional, TYPE_CHECKING, Type, TypeVar, Union
 
 from benchmon.benchmark import BaseBenchmark
 from benchmon.monitors import MonitorData, PerfMonitor, RDTSCMonitor, ResCtrlMonitor
-from benchmon.monitors.messages import MonitoredMessage, RabbitMQMessage
+from benchmon.monitors.messages import MonitoredMessage, RabbitMQMessage, SampleSchema
 from benchmon.monitors.messages.handlers import BaseHandler
 
 if TYPE_CHECKING:
@@ -17,12 +17,21 @@ _MT = TypeVar('_MT')
 
 
 class HybridIsoMerger(BaseHandler):
-    __slots__ = ('_merge_dict',)
+    __slots__ = ('_merge_dict', '_routing_key', '_schema')
+
+    accepted_messages = (MonitoredMessage,)
 
     _merge_dict: Dict[Type[BaseMonitor[MonitorData]], Optional[MonitoredMessage]]
+    _routing_key: Optional[str]
+    _schema: Optional[SampleSchema]
 
     def __init__(self) -> None:
         self._merge_dict = dict.fromkeys((PerfMonitor, RDTSCMonitor, ResCtrlMonitor), None)
+        self._routing_key = None
+        self._schema = None
+
+    async def on_init(self, context: Context) -> None:
+        self._routing_key = BaseBenchmark.of(context).group_name
 
     async def on_message(self,
                          context: Context,
@@ -33,15 +42,20 @@ class HybridIsoMerger(BaseHandler):
         self._merge_dict[type(message.source)] = message
 
         if all(self._merge_dict.values()):
-            routing_key = BaseBenchmark.of(context).group_name
-            data = self._merge_dict[PerfMonitor].data
+            perf_data = self._merge_dict[PerfMonitor].data
+            resctrl_data = self._merge_dict[ResCtrlMonitor].data
+
+            # the merged schema is decided once by the first complete set of messages
+            if self._schema is None:
+                self._schema = perf_data.schema.extend(('wall_cycle',) + resctrl_data[0].schema.names)
 
-            data['wall_cycle'] = self._merge_dict[RDTSCMonitor].data
+            values: List[Union[int, float]] = list(perf_data.row())
+            values.append(self._merge_dict[RDTSCMonitor].data)
+            values.extend(map(sum, zip(*(socket.array for socket in resctrl_data))))
 
-            for key in self._merge_dict[ResCtrlMonitor].data[0].keys():
-                data[key] = sum(map(lambda x: x[key], self._merge_dict[ResCtrlMonitor].data))
+            data = self._schema.new(values)
 
-            ret = RabbitMQMessage(data, self, routing_key)
+            ret = RabbitMQMessage(data, self, self._routing_key)
 
             for key in self._merge_dict.keys():
                 self._merge_dict[key] = None
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Optional, TYPE_CHECKING, TextIO, Tuple, Union
+from typing import Iterable, Optional, Sequence, TYPE_CHECKING, TextIO, Tuple, Union
 
 from benchmon.benchmark import BaseBenchmark
 from benchmon.configs.containers import PrivilegeConfig
 from benchmon.monitors import PerfMonitor
-from benchmon.monitors.messages import PerBenchMessage
+from benchmon.monitors.messages import PerBenchMessage, Sample
 from benchmon.monitors.messages.handlers import BaseHandler
 from benchmon.utils.privilege import drop_privilege
 
@@ -20,6 +20,9 @@ if TYPE_CHECKING:
 class StorePerf(BaseHandler):
     __slots__ = ('_dest_file', '_event_order')
 
+    accepted_messages = (PerBenchMessage,)
+    accepted_sources = (PerfMonitor,)
+
     _dest_file: Optional[TextIO]
     _event_order: Tuple[str, ...]
 
@@ -29,8 +32,11 @@ class StorePerf(BaseHandler):
         self._dest_file = None
 
     def _generate_value_stream(self, message: PERF_MSG_TYPE) -> Iterable[Union[float, int]]:
-        for event_name in self._event_order:
-            yield message[event_name]
+        # the values of a sample are already ordered when the monitor uses the same events
+        if isinstance(message, Sample) and message.schema.names == self._event_order:
+            return message.row()
+
+        return (message[event_name] for event_name in self._event_order)
 
     async def on_init(self, context: Context) -> None:
         benchmark = BaseBenchmark.of(context)
@@ -57,6 +63,16 @@ class StorePerf(BaseHandler):
 
         return message
 
+    async def on_batch(self, context: Context,
+                       messages: Sequence[BaseMessage[PERF_MSG_TYPE]]) -> Tuple[BaseMessage[PERF_MSG_TYPE], ...]:
+        self._dest_file.write(''.join(
+                ','.join(map(str, self._generate_value_stream(message.data))) + '\n'
+                for message in messages
+                if isinstance(message, PerBenchMessage) and isinstance(message.source, PerfMonitor)
+        ))
+
+        return tuple(messages)
+
     async def on_end(self, context: Context) -> None:
         if self._dest_file is not None:
             self._dest_file.close()
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Optional, TYPE_CHECKING, Tuple, TypeVar
+from typing import Iterable, Optional, Sequence, TYPE_CHECKING, Tuple, TypeVar
 
 from aiofile_linux import WriteCmd
 
@@ -10,7 +10,7 @@ from benchmon.benchmark import BaseBenchmark
 from benchmon.configs.containers import PrivilegeConfig
 from benchmon.context import aio_context
 from benchmon.monitors import ResCtrlMonitor
-from benchmon.monitors.messages import PerBenchMessage
+from benchmon.monitors.messages import PerBenchMessage, Sample
 from benchmon.monitors.messages.handlers import BaseHandler
 from benchmon.utils.privilege import drop_privilege
 
@@ -27,6 +27,9 @@ _MT = TypeVar('_MT')
 class StoreResCtrl(BaseHandler):
     __slots__ = ('_event_order', '_aio_blocks', '_workspace')
 
+    accepted_messages = (PerBenchMessage,)
+    accepted_sources = (ResCtrlMonitor,)
+
     _event_order: Tuple[str, ...]
     _aio_blocks: Tuple[WriteCmd, ...]
     _workspace: Optional[Path]
@@ -54,19 +57,41 @@ class StoreResCtrl(BaseHandler):
             yield WriteCmd(file, '')
 
     def _generate_value_stream(self, message: RESCTRL_MSG_TYPE, idx: int) -> Iterable[int]:
-        for event_name in self._event_order:
-            yield message[idx][event_name]
+        socket = message[idx]
+
+        # the values of a sample are already ordered when the header is made from the same schema
+        if isinstance(socket, Sample) and socket.schema.names == self._event_order:
+            return socket.row()
+
+        return (socket[event_name] for event_name in self._event_order)
 
     async def on_message(self, context: Context, message: PerBenchMessage[_MT]) -> Optional[PerBenchMessage[_MT]]:
         if not isinstance(message, PerBenchMessage) or not isinstance(message.source, ResCtrlMonitor):
             return message
 
+        await self._write(context, (message,))
+
+        return message
+
+    async def on_batch(self, context: Context,
+                       messages: Sequence[PerBenchMessage[_MT]]) -> Tuple[PerBenchMessage[_MT], ...]:
+        targets = tuple(
+                message for message in messages
+                if isinstance(message, PerBenchMessage) and isinstance(message.source, ResCtrlMonitor)
+        )
+
+        if len(targets) != 0:
+            await self._write(context, targets)
+
+        return tuple(messages)
+
+    async def _write(self, context: Context, messages: Sequence[PerBenchMessage[RESCTRL_MSG_TYPE]]) -> None:
         if self._aio_blocks is tuple():
             benchmark = BaseBenchmark.of(context)
             privilege_cfg = PrivilegeConfig.of(context).result
 
-            self._aio_blocks = tuple(self._create_aio_blocks(privilege_cfg, benchmark.identifier, message.data))
-            self._event_order = tuple(message.data[0].keys())
+            self._aio_blocks = tuple(self._create_aio_blocks(privilege_cfg, benchmark.identifier, messages[0].data))
+            self._event_order = tuple(messages[0].data[0].keys())
 
             for block in self._aio_blocks:
                 block.buffer = (','.join(self._event_order) + '\n').encode()
@@ -74,14 +99,16 @@ class StoreResCtrl(BaseHandler):
             for block in self._aio_blocks:
                 block.offset += len(block.buffer)
 
+        # one submission per batch regardless of the number of messages
         for idx, block in enumerate(self._aio_blocks):
-            block.buffer = (','.join(map(str, self._generate_value_stream(message.data, idx))) + '\n').encode()
+            block.buffer = ''.join(
+                    ','.join(map(str, self._generate_value_stream(message.data, idx))) + '\n'
+                    for message in messages
+            ).encode()
         await aio_context().submit(*self._aio_blocks)
         for block in self._aio_blocks:
             block.offset += len(block.buffer)
 
-        return message
-
     async def on_end(self, context: Context) -> None:
         for block in self._aio_blocks:
             block.file.close()
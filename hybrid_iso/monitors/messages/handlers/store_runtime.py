@@ -16,21 +16,29 @@ if TYPE_CHECKING:
     from pathlib import Path
 
     from benchmon import Context
+    from benchmon.configs.containers import Privilege
 
 _MT = TypeVar('_MT')
 
 
 class StoreRuntime(BaseHandler):
-    __slots__ = ('_result_path',)
+    __slots__ = ('_result_path', '_identifier', '_privilege')
+
+    accepted_messages = (PerBenchMessage,)
+    accepted_sources = (RuntimeMonitor,)
 
     _result_path: Path
+    _identifier: str
+    _privilege: Privilege
 
     async def on_init(self, context: Context) -> None:
         benchmark = BaseBenchmark.of(context)
         workspace: Path = benchmark.bench_config.workspace / 'monitored'
         self._result_path = workspace / 'runtime.json'
+        self._identifier = benchmark.identifier
+        self._privilege = PrivilegeConfig.of(context).result
 
-        privilege_cfg = PrivilegeConfig.of(context).result
+        privilege_cfg = self._privilege
         with drop_privilege(privilege_cfg.user, privilege_cfg.group):
             if self._result_path.is_file():
                 self._result_path.unlink()
@@ -44,11 +52,11 @@ class StoreRuntime(BaseHandler):
         if not isinstance(message, PerBenchMessage) or not isinstance(message.source, RuntimeMonitor):
             return message
 
-        privilege_cfg = PrivilegeConfig.of(context).result
+        privilege_cfg = self._privilege
         with drop_privilege(privilege_cfg.user, privilege_cfg.group):
             with self._result_path.open(mode='r+') as fp:
                 content: Dict[str, float] = json.load(fp)
-                content[BaseBenchmark.of(context).identifier] = message.data
+                content[self._identifier] = message.data
 
                 fp.seek(0)
                 fp.truncate()
@@ -0,0 +1,309 @@
+# coding: UTF-8
+
+"""
+:mod:`repetition` -- 한 workspace의 실험을 신뢰구간이 충분히 좁아질 때 까지 반복
+===================================================================
+
+:class:`RepetitionRunner` 는 workspace 하나를 실행하는 함수를 감싸서, 그 실험을 여러번 반복한다.
+
+* 처음 `warm_up` 번의 결과는 (캐시, page cache, DVFS 등이 안정되기 전) 통계에서 제외한다.
+* 나머지 결과들의 :class:`~benchmon.monitors.runtime.RuntimeMonitor` 실행 시간으로 평균의 신뢰구간을 계산하여,
+  모든 벤치마크의 상대 신뢰구간 폭 (구간의 폭 / 평균) 이 목표 이하가 되거나 최대 반복 횟수에 도달하면 멈춘다.
+* 매 반복의 결과 (`monitored`, `generated`) 는 `repetitions/<번호>` 로 옮겨지며,
+  모든 반복이 끝나면 `repetitions/summary.json` 에 반복별 실행 시간과 벤치마크별 통계를 저장한다.
+
+.. module:: hybrid_iso.repetition
+    :synopsis: 한 workspace의 실험을 신뢰구간이 충분히 좁아질 때 까지 반복
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import shutil
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from benchmon.configs.parsers import PrivilegeParser
+from benchmon.utils.privilege import drop_privilege
+
+# directories of the results of a single run, which are moved into the directory of each repetition
+_RESULT_DIRS = ('monitored', 'generated')
+
+
+@dataclass(frozen=True)
+class RepetitionPolicy:
+    """ 실험을 몇 번, 언제까지 반복할지에 대한 설정 """
+    __slots__ = ('repetitions', 'warm_up', 'max_repetitions', 'target_width', 'confidence')
+
+    repetitions: int
+    """ 통계에 사용할 최소 반복 횟수 (`warm_up` 제외) """
+    warm_up: int
+    """ 통계에서 제외할 처음 반복 횟수 """
+    max_repetitions: int
+    """ 통계에 사용할 최대 반복 횟수 (`warm_up` 제외). 신뢰구간이 좁아지지 않더라도 이 횟수가 되면 멈춘다. """
+    target_width: Optional[float]
+    """ 목표로 하는 상대 신뢰구간 폭 (구간의 폭 / 평균). ``None`` 이면 정확히 `repetitions` 번 반복한다. """
+    confidence: float
+    """ 신뢰구간의 신뢰수준 (e.g. 0.95) """
+
+    def __post_init__(self) -> None:
+        if self.repetitions < 1:
+            raise ValueError(f'repetitions should be positive, but {self.repetitions} is given.')
+        if self.warm_up < 0:
+            raise ValueError(f'warm_up should not be negative, but {self.warm_up} is given.')
+        if self.max_repetitions < self.repetitions:
+            raise ValueError(f'max_repetitions ({self.max_repetitions}) should not be less than '
+                             f'repetitions ({self.repetitions}).')
+        if self.target_width is not None and self.target_width <= 0:
+            raise ValueError(f'target_width should be positive, but {self.target_width} is given.')
+        if not 0 < self.confidence < 1:
+            raise ValueError(f'confidence should be in (0, 1), but {self.confidence} is given.')
+
+    @property
+    def is_single(self) -> bool:
+        """
+        :return: 반복하지 않고 한번만 실행하는 설정이라면 ``True``
+        :rtype: bool
+        """
+        return self.warm_up == 0 and self.max_repetitions == 1
+
+
+@dataclass(frozen=True)
+class RuntimeStats:
+    """ 한 벤치마크의 반복된 실행 시간들의 통계 """
+    __slots__ = ('samples', 'mean', 'stdev', 'ci_low', 'ci_high')
+
+    samples: int
+    """ 통계에 사용된 실행 시간의 수 """
+    mean: float
+    """ 실행 시간의 평균 (초) """
+    stdev: float
+    """ 실행 시간의 표본 표준편차 (초). 표본이 하나라면 0. """
+    ci_low: float
+    """ 평균의 신뢰구간의 하한 (초). 표본이 하나라면 -inf. """
+    ci_high: float
+    """ 평균의 신뢰구간의 상한 (초). 표본이 하나라면 inf. """
+
+    @classmethod
+    def of(cls, runtimes: Sequence[float], confidence: float) -> RuntimeStats:
+        """
+        Student t-분포로 `runtimes` 의 평균의 신뢰구간을 계산한다.
+
+        :param runtimes: 실행 시간들 (초). 비어있으면 안된다.
+        :type runtimes: typing.Sequence[float]
+        :param confidence: 신뢰수준
+        :type confidence: float
+        :return: `runtimes` 의 통계
+        :rtype: hybrid_iso.repetition.RuntimeStats
+        """
+        mean = statistics.mean(runtimes)
+
+        if len(runtimes) < 2:
+            return cls(len(runtimes), mean, 0.0, -math.inf, math.inf)
+
+        stdev = statistics.stdev(runtimes)
+        half_width = _t_quantile(confidence, len(runtimes) - 1) * stdev / math.sqrt(len(runtimes))
+        return cls(len(runtimes), mean, stdev, mean - half_width, mean + half_width)
+
+    @property
+    def relative_width(self) -> float:
+        """
+        :return: 평균에 대한 신뢰구간 폭의 비율
+        :rtype: float
+        """
+        if self.mean == 0:
+            return math.inf if self.ci_high != self.ci_low else 0.0
+        return (self.ci_high - self.ci_low) / abs(self.mean)
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        # JSON has no infinity, so the unbounded values are stored as null
+        return {
+            'samples': self.samples,
+            'mean': self.mean,
+            'stdev': self.stdev,
+            'ci_low': self.ci_low if math.isfinite(self.ci_low) else None,
+            'ci_high': self.ci_high if math.isfinite(self.ci_high) else None,
+            'relative_width': self.relative_width if math.isfinite(self.relative_width) else None
+        }
+
+
+class RepetitionRunner:
+    """
+    workspace 하나를 실행하는 `launcher` 를 :class:`RepetitionPolicy` 에 따라 반복해서 호출한다.
+    `launcher` 와 같은 형태이므로 :class:`~hybrid_iso.scheduler.WorkspaceScheduler` 의 launcher로 그대로 사용할 수 있다.
+
+    `launcher` 가 ``False`` 를 반환하면 (e.g. 사용자가 취소) 더 이상 반복하지 않으며, 그때까지의 결과로 요약을 저장한다.
+    """
+    __slots__ = ('_launcher', '_policy', '_interval', '_logger')
+
+    _launcher: Callable[[Path], Awaitable[bool]]
+    _policy: RepetitionPolicy
+    _interval: float
+    _logger: logging.Logger
+
+    def __init__(self,
+                 launcher: Callable[[Path], Awaitable[bool]],
+                 policy: RepetitionPolicy,
+                 interval: float = 0) -> None:
+        """
+        :param launcher: workspace 하나를 한번 실행하는 함수
+        :type launcher: typing.Callable[[pathlib.Path], typing.Awaitable[bool]]
+        :param policy: 반복 설정
+        :type policy: hybrid_iso.repetition.RepetitionPolicy
+        :param interval: 반복 사이마다 쉬는 시간 (초)
+        :type interval: float
+        """
+        self._launcher = launcher
+        self._policy = policy
+        self._interval = interval
+        self._logger = logging.getLogger('benchmon')
+
+    async def __call__(self, workspace: Path) -> bool:
+        policy = self._policy
+        if policy.is_single:
+            return await self._launcher(workspace)
+
+        privilege_cfg = PrivilegeParser(workspace).parse().result
+        repetitions_dir = workspace / 'repetitions'
+        runs: List[Tuple[int, Optional[Mapping[str, float]]]] = list()
+        stats: Dict[str, RuntimeStats] = dict()
+        succeeded = True
+
+        with drop_privilege(privilege_cfg.user, privilege_cfg.group):
+            # results of the previous execution
+            if repetitions_dir.is_dir():
+                shutil.rmtree(repetitions_dir)
+            repetitions_dir.mkdir(parents=True)
+
+        for idx in range(policy.warm_up + policy.max_repetitions):
+            if idx != 0 and self._interval > 0:
+                await asyncio.sleep(self._interval)
+
+            self._logger.info(f'Running the repetition {idx} of {workspace}'
+                              f'{" (warm-up)" if idx < policy.warm_up else ""}...')
+
+            succeeded = await self._launcher(workspace)
+
+            with drop_privilege(privilege_cfg.user, privilege_cfg.group):
+                runs.append((idx, _collect_run(workspace, repetitions_dir / str(idx))))
+
+            if not succeeded:
+                break
+
+            stats = _stats_of(runs[policy.warm_up:], policy.confidence)
+
+            if idx + 1 - policy.warm_up >= policy.repetitions and self._has_converged(stats):
+                break
+
+        converged = self._has_converged(stats)
+        if succeeded and not converged:
+            self._logger.warning(f'The confidence intervals of {workspace} did not converge '
+                                 f'in {policy.max_repetitions} repetitions.')
+
+        with drop_privilege(privilege_cfg.user, privilege_cfg.group):
+            summary = {
+                'policy': {
+                    'repetitions': policy.repetitions,
+                    'warm_up': policy.warm_up,
+                    'max_repetitions': policy.max_repetitions,
+                    'target_width': policy.target_width,
+                    'confidence': policy.confidence
+                },
+                'completed': succeeded,
+                'converged': converged,
+                'runs': [
+                    {'index': idx, 'warm_up': idx < policy.warm_up, 'runtime': runtime}
+                    for idx, runtime in runs
+                ],
+                'stats': {identifier: stat.to_dict() for identifier, stat in stats.items()}
+            }
+            (repetitions_dir / 'summary.json').write_text(json.dumps(summary, indent=4))
+
+        return succeeded
+
+    def _has_converged(self, stats: Mapping[str, RuntimeStats]) -> bool:
+        target_width = self._policy.target_width
+        if target_width is None:
+            return True
+
+        return len(stats) != 0 and all(stat.relative_width <= target_width for stat in stats.values())
+
+
+def _collect_run(workspace: Path, run_dir: Path) -> Optional[Mapping[str, float]]:
+    """
+    한번의 실행 결과를 `run_dir` 로 옮긴다.
+
+    :return: 벤치마크 별 실행 시간. 실행 시간이 저장되지 않았다면 ``None``
+    :rtype: typing.Optional[typing.Mapping[str, float]]
+    """
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    for name in _RESULT_DIRS:
+        if (workspace / name).exists():
+            (workspace / name).rename(run_dir / name)
+
+    runtime_path = run_dir / 'monitored' / 'runtime.json'
+    if not runtime_path.is_file():
+        return None
+
+    with runtime_path.open() as fp:
+        return json.load(fp)
+
+
+def _stats_of(runs: Sequence[Tuple[int, Optional[Mapping[str, float]]]],
+              confidence: float) -> Dict[str, RuntimeStats]:
+    runtimes: Dict[str, List[float]] = dict()
+
+    for _, runtime in runs:
+        if runtime is None:
+            continue
+        for identifier, value in runtime.items():
+            runtimes.setdefault(identifier, list()).append(value)
+
+    return {identifier: RuntimeStats.of(values, confidence) for identifier, values in runtimes.items()}
+
+
+def _t_cdf(t: float, df: int) -> float:
+    """
+    :return: 자유도가 `df` 인 t-분포에서 P(|T| < `t`) (Abramowitz and Stegun 26.7.3, 26.7.4)
+    :rtype: float
+    """
+    theta = math.atan(t / math.sqrt(df))
+    sin, cos2 = math.sin(theta), math.cos(theta) ** 2
+
+    if df % 2 == 1:
+        term = total = math.cos(theta) if df > 1 else 0.0
+        for k in range(3, df, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        return 2 / math.pi * (theta + sin * total)
+    else:
+        term = total = 1.0
+        for k in range(2, df, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        return sin * total
+
+
+def _t_quantile(confidence: float, df: int) -> float:
+    """
+    :return: 자유도가 `df` 인 t-분포에서 P(|T| < t) = `confidence` 인 t
+    :rtype: float
+    """
+    low, high = 0.0, 1.0
+    while _t_cdf(high, df) < confidence:
+        low, high = high, high * 2
+
+    for _ in range(100):
+        mid = (low + high) / 2
+        if _t_cdf(mid, df) < confidence:
+            low = mid
+        else:
+            high = mid
+
+    return (low + high) / 2
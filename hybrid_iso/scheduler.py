@@ -0,0 +1,254 @@
+# coding: UTF-8
+
+"""
+:mod:`scheduler` -- 여러 workspace의 실험을 동시에 실행하는 스케줄러
+===================================================================
+
+각 workspace의 벤치마크 설정들로부터 그 실험이 점유하는 코어, 메모리 노드, 소켓별 LLC way를 계산하여
+(:class:`ResourceClaim`), 서로 겹치지 않는 workspace들을 동시에 실행한다.
+
+* 어떤 workspace가 앞선 workspace를 추월하여 실행되려면, 실행중인 것 뿐만 아니라 아직 대기중인 앞선 workspace들과도
+  겹치지 않아야 한다. 따라서 서로 자원이 겹치는 workspace들은 항상 주어진 순서대로 실행된다.
+* Hyper-Threading 설정은 시스템 전체에 적용되므로, 같은 설정을 가진 workspace들만 동시에 실행된다.
+* 벤치마크의 cgroup 이름은 workspace 안에서만 고유하므로, 같은 이름의 cgroup을 사용하는 workspace들은 동시에 실행되지 않는다.
+* 끝난 workspace의 자원과 실행 슬롯은 `interval` 초 후에 반환되어, 이전 실험의 영향이 다음 실험에 남지 않게 한다.
+  따라서 동시에 하나의 workspace만 실행하면 예전처럼 실험 사이마다 `interval` 초 씩 쉬게 된다.
+
+.. module:: hybrid_iso.scheduler
+    :synopsis: 여러 workspace의 실험을 동시에 실행하는 스케줄러
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from benchmon.benchmark.constraints import AffinityConstraint, CGroupConstraint, ResCtrlConstraint
+from benchmon.configs.parsers import BenchParser
+from benchmon.utils import Ranges, topology
+from benchmon.utils.hyperthreading import hyper_threading_guard
+from benchmon.utils.numa_topology import core_to_socket
+from .configs.parsers import LauncherParser
+
+
+@dataclass(frozen=True)
+class ResourceClaim:
+    """ 한 workspace의 실험이 점유하는 자원 """
+    __slots__ = ('cores', 'mem_nodes', 'llc_ways', 'hyper_threading', 'cgroups')
+
+    cores: FrozenSet[int]
+    """ 벤치마크들이 사용하는 CPU 코어들 """
+    mem_nodes: FrozenSet[int]
+    """ 벤치마크들이 메모리를 할당받는 NUMA 노드들 """
+    llc_ways: Tuple[Tuple[int, int], ...]
+    """ (소켓 번호, CBM) 쌍들. 벤치마크의 코어가 있는 소켓의 LLC way만 포함된다. """
+    hyper_threading: bool
+    """ 실험이 요구하는 Hyper-Threading 설정 """
+    cgroups: FrozenSet[str]
+    """ 벤치마크들이 사용하는 cgroup 이름들 """
+
+    @classmethod
+    def of_workspace(cls, workspace: Path) -> ResourceClaim:
+        """
+        `workspace` 의 `config.json` 을 파싱하여 점유하는 자원을 계산한다.
+
+        :param workspace: `config.json` 이 위치한 폴더의 경로
+        :type workspace: pathlib.Path
+        :return: `workspace` 가 점유하는 자원
+        :rtype: hybrid_iso.scheduler.ResourceClaim
+        """
+        cores = set()
+        mem_nodes = set()
+        llc_ways: Dict[int, int] = dict()
+        cgroups = set()
+
+        for bench_config in BenchParser(workspace).parse():
+            bench_cores = set()
+            masks: Tuple[str, ...] = tuple()
+
+            # noinspection PyProtectedMember
+            for constraint in bench_config._init_constraints:
+                if isinstance(constraint, CGroupConstraint):
+                    cgroups.add(constraint.identifier.strip('/'))
+                    values = constraint.initial_values()
+                    if 'cpuset.cpus' in values:
+                        bench_cores.update(Ranges.from_str(str(values['cpuset.cpus'])))
+                    if 'cpuset.mems' in values:
+                        mem_nodes.update(Ranges.from_str(str(values['cpuset.mems'])))
+
+                elif isinstance(constraint, AffinityConstraint):
+                    if constraint.cpus is not None:
+                        bench_cores.update(constraint.cpus)
+                    mem_nodes.update(constraint.nodes)
+
+                elif isinstance(constraint, ResCtrlConstraint):
+                    masks = constraint.masks
+
+            # the masks of the sockets that the benchmark does not run on are just the placeholders (minimum mask)
+            for socket_id in set(core_to_socket[core_id] for core_id in bench_cores):
+                if socket_id < len(masks):
+                    llc_ways[socket_id] = llc_ways.get(socket_id, 0) | int(masks[socket_id], 16)
+
+            cores.update(bench_cores)
+
+        return cls(frozenset(cores), frozenset(mem_nodes), tuple(sorted(llc_ways.items())),
+                   LauncherParser(workspace).parse().hyper_threading, frozenset(cgroups))
+
+    @property
+    def sockets(self) -> FrozenSet[int]:
+        """
+        :return: 코어나 메모리 노드를 사용하는 소켓들
+        :rtype: typing.FrozenSet[int]
+        """
+        return frozenset(chain((core_to_socket[core_id] for core_id in self.cores), self.mem_nodes))
+
+    def conflicts(self, other: ResourceClaim, socket_exclusive: bool) -> bool:
+        """
+        :param other: 비교할 자원
+        :type other: hybrid_iso.scheduler.ResourceClaim
+        :param socket_exclusive: ``True`` 일 경우, 같은 소켓을 사용하는 것 만으로도 겹친다고 판단한다.
+                                 (메모리 대역폭이나 전력 측정처럼 소켓 단위로 공유되는 자원의 간섭도 피한다)
+        :type socket_exclusive: bool
+        :return: 두 실험이 동시에 실행될 수 없다면 ``True``
+        :rtype: bool
+        """
+        if self.hyper_threading != other.hyper_threading:
+            return True
+
+        if not self.cores.isdisjoint(other.cores):
+            return True
+
+        # a cgroup of the same name would be shared (and reconfigured, moved and deleted) by both experiments
+        if not self.cgroups.isdisjoint(other.cgroups):
+            return True
+
+        other_ways = dict(other.llc_ways)
+        if any(ways & other_ways.get(socket_id, 0) for socket_id, ways in self.llc_ways):
+            return True
+
+        return socket_exclusive and not self.sockets.isdisjoint(other.sockets)
+
+
+class WorkspaceScheduler:
+    """
+    :class:`ResourceClaim` 이 겹치지 않는 workspace들을 최대 `max_concurrent` 개 까지 동시에 실행한다.
+
+    workspace를 실행하는 `launcher` 는 Hyper-Threading 설정을 직접 하지 않아야 하며, 스케줄러가 동시에 실행되는
+    workspace들의 설정을 한번에 적용한다.
+    `launcher` 가 ``False`` 를 반환하면 (e.g. 사용자가 취소) 새로운 workspace를 더 이상 실행하지 않는다.
+    """
+    __slots__ = ('_workspaces', '_launcher', '_max_concurrent', '_socket_exclusive', '_interval', '_logger')
+
+    _workspaces: Tuple[Path, ...]
+    _launcher: Callable[[Path], Awaitable[bool]]
+    _max_concurrent: int
+    _socket_exclusive: bool
+    _interval: float
+    _logger: logging.Logger
+
+    def __init__(self,
+                 workspaces: Sequence[Path],
+                 launcher: Callable[[Path], Awaitable[bool]],
+                 max_concurrent: int = 1,
+                 socket_exclusive: bool = False,
+                 interval: float = 0) -> None:
+        """
+        :param workspaces: 실행할 workspace들. 자원이 겹치는 workspace들은 이 순서대로 실행된다.
+        :type workspaces: typing.Sequence[pathlib.Path]
+        :param launcher: workspace 하나를 실행하는 함수
+        :type launcher: typing.Callable[[pathlib.Path], typing.Awaitable[bool]]
+        :param max_concurrent: 동시에 실행할 수 있는 최대 workspace 수
+        :type max_concurrent: int
+        :param socket_exclusive: ``True`` 일 경우 같은 소켓을 사용하는 workspace들은 동시에 실행하지 않는다
+        :type socket_exclusive: bool
+        :param interval: 끝난 workspace의 자원을 다른 workspace가 사용하기 전 까지 기다리는 시간 (초)
+        :type interval: float
+        """
+        if max_concurrent < 1:
+            raise ValueError(f'max_concurrent should be positive, but {max_concurrent} is given.')
+
+        self._workspaces = tuple(workspaces)
+        self._launcher = launcher
+        self._max_concurrent = max_concurrent
+        self._socket_exclusive = socket_exclusive
+        self._interval = interval
+        self._logger = logging.getLogger('benchmon')
+
+    async def run(self) -> bool:
+        """
+        모든 workspace를 실행한다.
+        실행 중에 예외가 발생한 workspace는 실패한 것으로 취급한다.
+
+        :return: 모든 workspace가 성공적으로 실행되었다면 ``True``
+        :rtype: bool
+        """
+        pending: List[Tuple[Path, ResourceClaim]] = [
+            (workspace, ResourceClaim.of_workspace(workspace)) for workspace in self._workspaces
+        ]
+        running: Dict[asyncio.Task, Tuple[Path, ResourceClaim]] = dict()
+        # the resources of finished workspaces are kept occupied while cooling down
+        cooling: Dict[asyncio.Task, ResourceClaim] = dict()
+        succeeded = True
+        current_ht: Optional[bool] = None
+
+        with contextlib.ExitStack() as ht_stack:
+            try:
+                while len(running) != 0 or (succeeded and len(pending) != 0):
+                    if succeeded:
+                        occupied = tuple(chain((claim for _, claim in running.values()), cooling.values()))
+                        blocked: List[ResourceClaim] = list()
+
+                        for workspace, claim in tuple(pending):
+                            # a cooling down workspace also occupies its slot, as sleeping between experiments did
+                            if len(running) + len(cooling) >= self._max_concurrent:
+                                break
+
+                            if len(occupied) == 0 and current_ht != claim.hyper_threading:
+                                # Hyper-Threading is system-wide, so it is changed only when nothing is running
+                                ht_stack.close()
+                                # the online CPUs change on both entering and leaving the guard
+                                ht_stack.callback(topology.invalidate)
+                                ht_stack.enter_context(hyper_threading_guard(claim.hyper_threading))
+                                topology.invalidate()
+                                current_ht = claim.hyper_threading
+
+                            if any(claim.conflicts(other, self._socket_exclusive)
+                                   for other in chain(occupied, blocked)):
+                                blocked.append(claim)
+                                continue
+
+                            self._logger.info(f'Starting the experiment of {workspace}...')
+                            pending.remove((workspace, claim))
+                            running[asyncio.create_task(self._launcher(workspace))] = (workspace, claim)
+                            occupied += (claim,)
+
+                    done, _ = await asyncio.wait(tuple(chain(running, cooling)),
+                                                 return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done:  # type: asyncio.Task
+                        if task in cooling:
+                            del cooling[task]
+                            continue
+
+                        workspace, claim = running.pop(task)
+                        try:
+                            succeeded &= task.result()
+                        except Exception:
+                            self._logger.exception(f'The experiment of {workspace} has failed.')
+                            succeeded = False
+
+                        if self._interval > 0 and len(pending) != 0:
+                            cooling[asyncio.create_task(asyncio.sleep(self._interval))] = claim
+
+            finally:
+                # Hyper-Threading is restored by leaving `ht_stack`, so every experiment must be finished before that
+                for task in chain(running, cooling):
+                    task.cancel()
+                await asyncio.gather(*running, *cooling, return_exceptions=True)
+
+        return succeeded
@@ -0,0 +1,295 @@
+# coding: UTF-8
+
+"""
+:mod:`sweep` -- 설정 템플릿으로부터 실험 workspace들을 생성
+===================================================================
+
+`config.json` 에 `sweep` 항목을 추가한 템플릿을 읽어, 각 축 (axis) 의 값들을 조합한 workspace들을 만든다.
+
+.. code-block:: json
+
+    {
+        "sweep": {
+            "axes": {
+                "workloads.0.num_of_threads,workloads.0.bound_cores": [[4, "0-3"], [8, "0-7"]],
+                "workloads.0.cpu_freq": [1.2, 2.1],
+                "launcher.hyper-threading": [true, false]
+            },
+            "sample": 10,
+            "seed": 0
+        },
+        "default_wl_parser": "launchable",
+        "workloads": [{"name": "SP"}],
+        "launcher": {}
+    }
+
+* 축의 이름은 값을 바꿀 설정의 `.` 로 구분된 경로이며, `,` 로 여러 경로를 묶으면 그 값들이 함께 바뀐다.
+  값이 `null` 이면 그 설정을 생략하여 파서가 다른 설정으로부터 추론하게 한다.
+* `sample` 이 없다면 모든 조합 (cartesian product) 을, 있다면 그 중 `sample` 개를 `seed` 로 무작위 추출한다.
+* 각 조합의 벤치마크 설정들을 파서의 ``_deduct_config`` 로 정규화하여, 생략된 값 때문에 표현만 다르고 실제 제약 사항이
+  같은 조합들은 하나만 남긴다.
+* 연속된 실험 사이의 재설정 비용이 적도록 Hyper-Threading, DVFS, LLC, 그 외의 순서로 설정이 같은 실험들을 모아서 정렬한다.
+  workspace 폴더 이름은 그 순서의 번호로 시작하므로, ``python -m hybrid_iso <output>/*`` 이 이 순서대로 실행한다.
+
+.. module:: hybrid_iso.sweep
+    :synopsis: 설정 템플릿으로부터 실험 workspace들을 생성
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import logging
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from benchmon.configs.parsers import BenchParser
+from benchmon.configs.parsers.benchmark import BaseBenchParser
+from benchmon.utils import Ranges
+
+_SWEEP_KEY = 'sweep'
+_DESIGN_FILE = 'sweep.json'
+
+_unsafe_chars = re.compile(r'[^\w.,=+-]')
+
+
+class SweepTemplate:
+    """
+    `sweep` 항목을 가진 설정 템플릿.
+    """
+    __slots__ = ('_base', '_axes', '_sample', '_seed')
+
+    _base: Dict[str, Any]
+    _axes: Tuple[Tuple[Tuple[str, ...], Tuple[Tuple[Any, ...], ...]], ...]
+    _sample: Optional[int]
+    _seed: Optional[int]
+
+    def __init__(self, template: Mapping[str, Any]) -> None:
+        """
+        :raises ValueError: `sweep` 항목이 없거나 형식이 잘못되었을 때
+
+        :param template: 템플릿의 내용
+        :type template: typing.Mapping[str, typing.Any]
+        """
+        if _SWEEP_KEY not in template:
+            raise ValueError(f'The template does not have `{_SWEEP_KEY}`.')
+
+        sweep: Mapping[str, Any] = template[_SWEEP_KEY]
+        self._base = {key: value for key, value in template.items() if key != _SWEEP_KEY}
+        self._sample = sweep.get('sample')
+        self._seed = sweep.get('seed')
+
+        axes = list()
+        for name, values in sweep['axes'].items():
+            paths = tuple(name.split(','))
+
+            if len(paths) == 1:
+                rows = tuple((value,) for value in values)
+            else:
+                rows = tuple(map(tuple, values))
+                if any(len(row) != len(paths) for row in rows):
+                    raise ValueError(f'Each value of the axis `{name}` should have {len(paths)} items.')
+
+            if len(rows) == 0:
+                raise ValueError(f'The axis `{name}` has no value.')
+
+            axes.append((paths, rows))
+
+        self._axes = tuple(axes)
+
+    @property
+    def size(self) -> int:
+        """
+        :return: 모든 조합의 수
+        :rtype: int
+        """
+        size = 1
+        for _, rows in self._axes:
+            size *= len(rows)
+        return size
+
+    def points(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        :return: (축의 경로 별 값, 그 값들을 적용한 설정) 쌍들
+        :rtype: typing.Iterator[typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]]]
+        """
+        if self._sample is None or self._sample >= self.size:
+            indices = range(self.size)
+        else:
+            # decode the sampled indices instead of materializing the whole product
+            indices = sorted(random.Random(self._seed).sample(range(self.size), self._sample))
+
+        for index in indices:
+            config = copy.deepcopy(self._base)
+            point: Dict[str, Any] = dict()
+
+            for paths, rows in reversed(self._axes):
+                index, row_idx = divmod(index, len(rows))
+                for path, value in zip(paths, rows[row_idx]):
+                    _set_path(config, path, value)
+                    point[path] = value
+
+            yield {path: point[path] for paths, _ in self._axes for path in paths}, config
+
+
+def _set_path(config: Any, path: str, value: Any) -> None:
+    *parents, last = path.split('.')
+
+    for key in parents:
+        if isinstance(config, list):
+            config = config[int(key)]
+        else:
+            config = config.setdefault(key, dict())
+
+    if isinstance(config, list):
+        config[int(last)] = value
+    elif value is None:
+        # `null` leaves the value to the deduction of the parser
+        config.pop(last, None)
+    else:
+        config[last] = value
+
+
+def _normalize_workloads(config: Mapping[str, Any]) -> Tuple[Dict[str, Any], ...]:
+    """
+    :return: 생략된 값들이 모두 채워진 벤치마크 설정들
+    :rtype: typing.Tuple[typing.Dict[str, typing.Any], ...]
+    """
+    default_type: Optional[str] = config.get('default_wl_parser')
+
+    # noinspection PyProtectedMember
+    return tuple(
+            BaseBenchParser.get_parser(workload.get('parser', default_type))._deduct_config(copy.deepcopy(workload))
+            for workload in config['workloads']
+    )
+
+
+def _canonical_key(config: Mapping[str, Any], workloads: Sequence[Mapping[str, Any]]) -> str:
+    """
+    :return: 벤치마크들의 순서나 생략된 값과 상관없이, 같은 실험이라면 같은 문자열
+    :rtype: str
+    """
+    others = {key: value for key, value in config.items() if key != 'workloads'}
+    return json.dumps({
+        'workloads': sorted(json.dumps(workload, sort_keys=True) for workload in workloads),
+        'others': others
+    }, sort_keys=True)
+
+
+def _reconfiguration_key(config: Mapping[str, Any], workloads: Sequence[Mapping[str, Any]]) -> Tuple[str, ...]:
+    """
+    :return: 바꾸는 비용이 큰 설정부터 나열한 정렬 기준 (Hyper-Threading, 코어별 주파수, LLC mask, 나머지)
+    :rtype: typing.Tuple[str, ...]
+    """
+    hyper_threading = bool(config.get('launcher', dict()).get('hyper-threading', False))
+
+    freqs = sorted(
+            (core_id, workload['cpu_freq'])
+            for workload in workloads if 'cpu_freq' in workload
+            for core_id in Ranges.from_str(workload['bound_cores'])
+    )
+    masks = sorted(tuple(workload['cbm_ranges']) for workload in workloads)
+
+    return (json.dumps(hyper_threading), json.dumps(freqs), json.dumps(masks),
+            _canonical_key(config, workloads))
+
+
+def _dir_name(index: int, point: Mapping[str, Any]) -> str:
+    labels = (f'{path.rsplit(".", 1)[-1]}={value}' for path, value in point.items())
+    return _unsafe_chars.sub('_', '_'.join((f'{index:04d}', *labels)))
+
+
+def generate(template: SweepTemplate, output_dir: Path) -> List[Path]:
+    """
+    `template` 의 조합들로 `output_dir` 안에 workspace들을 만들고, 각 workspace를
+    :class:`~benchmon.configs.parsers.bench.BenchParser` 로 파싱하여 검증한다.
+    `output_dir` 의 `sweep.json` 에는 각 workspace의 축 값들을 기록한다.
+
+    :param template: 설정 템플릿
+    :type template: hybrid_iso.sweep.SweepTemplate
+    :param output_dir: workspace들을 만들 폴더
+    :type output_dir: pathlib.Path
+    :return: 실행할 순서대로 정렬된, 생성된 workspace들
+    :rtype: typing.List[pathlib.Path]
+    """
+    logger = logging.getLogger('benchmon')
+    unique: Dict[str, Tuple[Tuple[str, ...], Dict[str, Any], Dict[str, Any]]] = dict()
+    generated = 0
+
+    for point, config in template.points():
+        generated += 1
+        workloads = _normalize_workloads(config)
+        key = _canonical_key(config, workloads)
+
+        if key in unique:
+            logger.debug(f'Skipping {point}, which is the same experiment as {unique[key][1]}.')
+            continue
+
+        unique[key] = (_reconfiguration_key(config, workloads), point, config)
+
+    if generated != len(unique):
+        logger.info(f'{generated - len(unique)} of {generated} configurations are duplicated.')
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = _previous_workspaces(output_dir)
+    workspaces: List[Path] = list()
+    design: List[Dict[str, Any]] = list()
+
+    for index, (_, point, config) in enumerate(sorted(unique.values(), key=lambda item: item[0])):
+        workspace = output_dir / _dir_name(index, point)
+        workspace.mkdir(exist_ok=True)
+        (workspace / 'config.json').write_text(json.dumps(config, indent=4))
+
+        # validate the generated config
+        tuple(BenchParser(workspace).parse())
+
+        workspaces.append(workspace)
+        design.append({'workspace': workspace.name, 'axes': point})
+
+    (output_dir / _DESIGN_FILE).write_text(json.dumps(design, indent=4))
+
+    stale = previous - set(workspace.name for workspace in workspaces)
+    if len(stale) != 0:
+        logger.warning(f'{len(stale)} workspaces of the previous sweep are left in {output_dir} '
+                       f'(e.g. {sorted(stale)[0]}). Remove them before running `{output_dir}/*`.')
+
+    return workspaces
+
+
+def _previous_workspaces(output_dir: Path) -> Set[str]:
+    try:
+        with (output_dir / _DESIGN_FILE).open() as fp:
+            return set(entry['workspace'] for entry in json.load(fp))
+    except FileNotFoundError:
+        return set()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate workspaces from a config template with sweep axes.')
+    parser.add_argument('template', type=str, help='Path of the config template that has `sweep`')
+    parser.add_argument('output_dir', type=str, help='Directory where the workspaces are generated')
+    parser.add_argument('--sample', type=int, default=None,
+                        help='Number of randomly sampled configurations (overrides `sample` of the template)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed of the sampling')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print more detail log')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    with Path(args.template).open() as fp:
+        content = json.load(fp)
+
+    if args.sample is not None:
+        content.setdefault(_SWEEP_KEY, dict())['sample'] = args.sample
+    if args.seed is not None:
+        content.setdefault(_SWEEP_KEY, dict())['seed'] = args.seed
+
+    workspaces = generate(SweepTemplate(content), Path(args.output_dir))
+    logging.getLogger('benchmon').info(f'{len(workspaces)} workspaces are generated in {args.output_dir}.')
+
+
+if __name__ == '__main__':
+    main()